@@ -5,10 +5,21 @@ Module contenant les classes principales du système de bibliothèque
 from .document import Document, Volume, Livre, BD, Dictionnaire, Journal
 from .adherent import Adherent
 from .emprunt import Emprunt
+from .reservation import Reservation
+from .evenements import (Evenement, AdherentAjoute, AdherentEnleve, DocumentAjoute,
+                         DocumentEnleve, DocumentModifie, EmpruntCree, EmpruntRetourne,
+                         ReservationCreee, ReservationPrete, ReservationTerminee,
+                         BusEvenements)
+from .horloge import Horloge, HorlogeFixe
+from .instantane import Instantane
 from .bibliotheque import Bibliotheque
 
 __all__ = [
     'Document', 'Volume', 'Livre', 'BD', 'Dictionnaire', 'Journal',
-    'Adherent', 'Emprunt', 'Bibliotheque'
+    'Adherent', 'Emprunt', 'Reservation', 'Horloge', 'HorlogeFixe', 'Instantane',
+    'Evenement', 'AdherentAjoute', 'AdherentEnleve', 'DocumentAjoute',
+    'DocumentEnleve', 'DocumentModifie', 'EmpruntCree', 'EmpruntRetourne',
+    'ReservationCreee', 'ReservationPrete', 'ReservationTerminee',
+    'BusEvenements', 'Bibliotheque'
 ]
 
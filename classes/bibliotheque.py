@@ -2,17 +2,271 @@
 Module contenant la classe Bibliotheque
 """
 
-from datetime import date
+import bisect
+import threading
+import weakref
+from collections import deque
+from contextlib import ExitStack, nullcontext
+
+from classes.evenements import (BusEvenements, AdherentAjoute, AdherentEnleve,
+                                DocumentAjoute, DocumentEnleve, DocumentModifie,
+                                EmpruntCree, EmpruntRetourne, ReservationCreee,
+                                ReservationPrete, ReservationTerminee)
+from classes.circulation import Circulation
+from classes.horloge import Horloge
+from classes.index import IndexPrefixe
+from classes.instantane import Instantane
+from classes.recommandations import IndexRecommandations
+from classes.series import SeriesEmprunts
 
 
 class Bibliotheque:
     """Classe représentant la bibliothèque et sa gestion"""
 
-    def __init__(self):
-        """Initialise une nouvelle bibliothèque"""
+    # Filtres de statut et critères de tri de rechercher_emprunts
+    STATUT_ACTIF = "actif"
+    STATUT_RETARD = "retard"
+    STATUT_RETOURNE = "retourne"
+    TRI_DATE = "date"
+    TRI_STATUT = "statut"
+
+    def __init__(self, horloge=None, concurrent=False):
+        """
+        Initialise une nouvelle bibliothèque
+        Args:
+            horloge: source de la date du jour (horloge système par défaut)
+            concurrent: True si plusieurs threads (postes de prêt) partagent
+                        la bibliothèque (voir _verrouiller)
+        """
+        self._horloge = horloge if horloge else Horloge()
+
+        # Copie sur écriture : listes encore partagées avec des instantanés
+        self._listes_partagees = set()
+        self._instantanes = weakref.WeakSet()
+
+        self._bus = BusEvenements()
+        self._initialiser_contenu()
+
+        # Versions des fichiers de données lus ou écrits (voir FileManager)
+        self._etat_fichiers = {}
+
+        # Mode concurrent : un verrou par adhérent et par livre, plus un verrou
+        # de structure tenu brièvement pour les listes et les index
+        self._concurrent = concurrent
+        self._verrous = {}
+        self._verrou_verrous = threading.Lock()
+        self._structure = threading.RLock() if concurrent else nullcontext()
+
+    def _initialiser_contenu(self):
+        """
+        Vide les listes, les index et les réservations
+        """
         self._documents = []
         self._adherents = []
         self._emprunts = []
+        self._listes_partagees -= {'_documents', '_adherents', '_emprunts', '_series'}
+
+        # Index tenus à jour à chaque modification
+        self._adherents_par_id = {}
+        self._index_adherents = IndexPrefixe()
+        self._index_livres_disponibles = IndexPrefixe()
+        self._index_emprunts_actifs = IndexPrefixe()
+        self._index_documents = IndexPrefixe()
+        self._documents_par_titre = {}  # titre en minuscules -> document
+        self._positions_documents = {}  # document -> position dans _documents
+        self._emprunts_par_adherent = {}
+        self._emprunts_par_livre = {}
+        self._emprunts_actifs = {}      # emprunts actifs, dans l'ordre de création
+        self._emprunts_tries = True     # _emprunts est-il trié par date d'emprunt ?
+        self._circulation = Circulation()   # palmarès sur 30 et 365 jours
+        self._recommandations = IndexRecommandations()   # None : à construire (voir definir_recommandations)
+        self._series = SeriesEmprunts()    # None : à reconstruire (voir definir_series)
+
+        # Réservations : file d'attente par livre, et livres rendus mis de côté
+        self._files_reservations = {}   # livre -> deque de Reservation
+        self._reservations_pretes = {}  # (identifiant, id du livre) -> Reservation, dans l'ordre
+        self._mis_de_cote = {}          # livre -> nombre d'exemplaires mis de côté
+        self._reserves = set()          # (identifiant de l'adhérent, id du livre)
+
+    @property
+    def etat_fichiers(self):
+        """
+        Retourne l'état des fichiers de données tel que cette bibliothèque
+        les a lus ou écrits (tenu par FileManager pour fusionner les
+        sauvegardes concurrentes)
+        """
+        return self._etat_fichiers
+
+    # ========== Concurrence ==========
+
+    @property
+    def concurrent(self):
+        """Indique si la bibliothèque est protégée pour un accès multi-thread"""
+        return self._concurrent
+
+    def _verrou(self, cle):
+        """
+        Retourne le verrou d'un adhérent (identifiant) ou d'un livre (objet)
+        """
+        verrou = self._verrous.get(cle)
+        if verrou is None:
+            with self._verrou_verrous:
+                verrou = self._verrous.setdefault(cle, threading.Lock())
+        return verrou
+
+    def _verrouiller(self, adherents=(), livres=()):
+        """
+        Verrouille des adhérents puis des livres (sans effet hors mode concurrent).
+        Les verrous sont toujours pris dans le même ordre pour éviter les
+        interblocages : adhérents par identifiant, livres par id croissant,
+        puis structure ; le verrou de structure n'est jamais tenu en prenant
+        les autres.
+        """
+        if not self._concurrent:
+            return nullcontext()
+        pile = ExitStack()
+        for identifiant in sorted({a.get_identifiant() for a in adherents}):
+            pile.enter_context(self._verrou(identifiant))
+        for livre in sorted(set(livres), key=id):
+            pile.enter_context(self._verrou(livre))
+        return pile
+
+    # ========== Horloge ==========
+
+    @property
+    def horloge(self):
+        """Retourne l'horloge utilisée pour dater et évaluer les emprunts"""
+        return self._horloge
+
+    @horloge.setter
+    def horloge(self, value):
+        """Modifie l'horloge (ex: HorlogeFixe pour un rapport à une date donnée)"""
+        self._horloge = value
+
+    def aujourd_hui(self):
+        """
+        Retourne la date de référence de la bibliothèque
+        """
+        return self._horloge.aujourd_hui()
+
+    # ========== Instantanés ==========
+
+    def instantane(self):
+        """
+        Retourne une vue figée et cohérente de la bibliothèque
+        (sauvegarde, export ou statistiques pendant que les emprunts continuent)
+        Seules les réservations en cours sont copiées ; les listes et les
+        agrégats ne le sont qu'à leur prochaine modification.
+        """
+        with self._structure:
+            instantane = Instantane(self, self._documents, self._adherents,
+                                    self._emprunts, self.aujourd_hui(),
+                                    self.get_reservations(), self._series)
+            self._listes_partagees = {'_documents', '_adherents', '_emprunts', '_series'}
+            self._instantanes.add(instantane)
+        return instantane
+
+    def _liberer_instantane(self, instantane):
+        """
+        Oublie un instantané fermé
+        """
+        with self._structure:
+            self._instantanes.discard(instantane)
+            if not self._instantanes:
+                self._listes_partagees.clear()
+
+    def _liste_modifiable(self, nom):
+        """
+        Retourne la liste interne `nom`, copiée d'abord si un instantané la partage
+        """
+        if nom in self._listes_partagees:
+            setattr(self, nom, list(getattr(self, nom)))
+            self._listes_partagees.discard(nom)
+        return getattr(self, nom)
+
+    def _series_modifiables(self):
+        """
+        Retourne les agrégats chronologiques, copiés d'abord si un instantané
+        les partage (None s'ils sont à reconstruire)
+        """
+        if '_series' in self._listes_partagees:
+            if self._series is not None:
+                self._series = self._series.copie()
+            self._listes_partagees.discard('_series')
+        return self._series
+
+    def _avant_modification(self, objet):
+        """
+        Préserve l'état d'un objet dans les instantanés ouverts avant de le modifier
+        """
+        for instantane in self._instantanes:
+            instantane._preserver(objet)
+
+    def revenir_a(self, instantane):
+        """
+        Annule toutes les modifications faites depuis la prise d'un instantané
+        encore ouvert (lot dont la sauvegarde a échoué) : les objets modifiés
+        reprennent leur état figé et les index sont reconstruits, comme au
+        chargement. Coûteux sur un gros historique, et sans notification :
+        les abonnés doivent relire la bibliothèque.
+        """
+        with self._structure:
+            for original, copie in list(instantane._copies.values()):
+                self._avant_modification(original)
+                vars(original).update(vars(copie))
+            recommandations = self._recommandations is not None
+            self._initialiser_contenu()
+            for adherent in instantane._adherents:
+                self._inscrire(adherent)
+            for document in instantane._documents:
+                self._cataloguer(document)
+            for emprunt in instantane._emprunts:
+                self.restaurer_emprunt(emprunt)
+            for reservation in instantane._reservations:
+                self.restaurer_reservation(reservation)
+            if instantane._series is not None:
+                self._series = instantane._series
+                self._listes_partagees.add('_series')
+            if recommandations:
+                self._recommandations = IndexRecommandations.depuis_emprunts(self._emprunts)
+
+    # ========== Notifications ==========
+
+    @property
+    def evenements(self):
+        """Retourne le bus des événements de modification"""
+        return self._bus
+
+    def abonner(self, rappel, types=None, par_lot=False):
+        """
+        Abonne une fonction aux modifications de la bibliothèque
+        Args:
+            rappel: appelée après chaque modification avec l'événement
+                    (voir classes.evenements), ou avec la liste des
+                    événements d'un lot si par_lot est vrai
+            types: classes d'événements à recevoir (toutes par défaut)
+            par_lot: recevoir les événements d'un lot en un seul appel
+        """
+        self._bus.abonner(rappel, types, par_lot)
+
+    def desabonner(self, rappel):
+        """
+        Désabonne une fonction des modifications de la bibliothèque
+        """
+        self._bus.desabonner(rappel)
+
+    def lot(self):
+        """
+        Regroupe les notifications des modifications faites dans un bloc
+        `with bibliotheque.lot():` (distribuées à la sortie du bloc)
+        """
+        return self._bus.lot()
+
+    def _notifier(self, classe, objet, ligne):
+        """
+        Publie l'événement d'une modification
+        """
+        self._bus.publier(classe(objet, ligne))
 
     # ========== Gestion des Adhérents ==========
 
@@ -20,35 +274,65 @@ class Bibliotheque:
         """
         Ajoute un adhérent à la bibliothèque
         """
-        if adherent not in self._adherents:
-            self._adherents.append(adherent)
-            return True
-        return False
+        identifiant = adherent.get_identifiant()
+        with self._structure:
+            if identifiant in self._adherents_par_id:
+                return False
+            self._inscrire(adherent)
+            ligne = len(self._adherents) - 1
+        self._notifier(AdherentAjoute, adherent, ligne)
+        return True
+
+    def _inscrire(self, adherent):
+        """
+        Ajoute un adhérent à la liste et aux index (verrou de structure tenu)
+        """
+        self._liste_modifiable('_adherents').append(adherent)
+        self._adherents_par_id[adherent.get_identifiant()] = adherent
+        self._index_adherents.ajouter(adherent, f"{adherent.prenom} {adherent.nom}",
+                                      f"{adherent.nom} {adherent.prenom}")
 
     def enlever_adherent(self, adherent):
         """
         Enlève un adhérent de la bibliothèque
         """
-        # Vérifier si l'adhérent a des emprunts actifs
-        emprunts_actifs = [e for e in self._emprunts
-                           if e.adherent == adherent and e.est_actif()]
+        with self._verrouiller([adherent]):
+            # Vérifier si l'adhérent a des emprunts actifs
+            emprunts_actifs = [e for e in self._emprunts_par_adherent.get(adherent.get_identifiant(), [])
+                               if e.est_actif()]
 
-        if emprunts_actifs:
-            return False  # Ne peut pas supprimer un adhérent avec des emprunts actifs
+            if emprunts_actifs:
+                return False  # Ne peut pas supprimer un adhérent avec des emprunts actifs
 
-        if adherent in self._adherents:
-            self._adherents.remove(adherent)
+            with self._structure:
+                if adherent.get_identifiant() not in self._adherents_par_id:
+                    return False
+                ligne = self._adherents.index(adherent)
+                del self._liste_modifiable('_adherents')[ligne]
+                inscrit = self._adherents_par_id.pop(adherent.get_identifiant())
+                self._index_adherents.retirer(inscrit)
+                annulees, pretes = self._retirer_reservations(
+                    lambda r: r.adherent.get_identifiant() == adherent.get_identifiant())
+            self._notifier(AdherentEnleve, adherent, ligne)
+            for reservation in annulees:
+                self._notifier(ReservationTerminee, reservation, None)
+            for reservation in pretes:
+                self._notifier(ReservationPrete, reservation, None)
             return True
-        return False
 
     def rechercher_adherent(self, nom, prenom):
         """
         Recherche un adhérent par nom et prénom
         """
-        for adherent in self._adherents:
-            if adherent.nom == nom and adherent.prenom == prenom:
-                return adherent
-        return None
+        return self._adherents_par_id.get(f"{nom}_{prenom}")
+
+    def rechercher_adherents(self, prefixe, limite=20):
+        """
+        Recherche les adhérents dont le « prénom nom » ou le « nom prénom »
+        commence par le préfixe (casse et accents ignorés)
+        """
+        with self._structure:
+            return self._index_adherents.rechercher(prefixe, limite)
 
     def get_adherents(self):
         """
@@ -56,32 +340,132 @@ class Bibliotheque:
         """
         return self._adherents.copy()
 
+    def compter_adherents(self):
+        """
+        Retourne le nombre d'adhérents
+        """
+        return len(self._adherents)
+
     # ========== Gestion des Documents ==========
 
     def ajouter_document(self, document):
         """
-        Ajoute un document à la bibliothèque
+        Ajoute un document à la bibliothèque (un livre déjà présent, même
+        titre et même auteur, ajoute ses exemplaires à ce livre)
+        """
+        from classes.document import Livre
+
+        existant = self._documents_par_titre.get(document.titre.lower())
+        if (isinstance(document, Livre) and isinstance(existant, Livre)
+                and existant.auteur == document.auteur):
+            return self.ajouter_exemplaires(existant, document.exemplaires, document.disponibles)
+
+        with self._structure:
+            self._cataloguer(document)
+            ligne = len(self._documents) - 1
+        self._notifier(DocumentAjoute, document, ligne)
+        return True
+
+    def _cataloguer(self, document):
+        """
+        Ajoute un document à la liste et aux index (verrou de structure tenu)
+        """
+        self._positions_documents[document] = len(self._documents)
+        self._liste_modifiable('_documents').append(document)
+        self._indexer_disponibilite(document)
+        self._index_documents.ajouter(document, document.titre)
+        self._documents_par_titre.setdefault(document.titre.lower(), document)
+
+    def ajouter_exemplaires(self, livre, nombre, disponibles=None):
+        """
+        Ajoute des exemplaires à un livre ; les exemplaires en rayon servent
+        d'abord sa file de réservations
+        Args:
+            nombre: exemplaires ajoutés (au moins 1)
+            disponibles: combien d'entre eux sont en rayon (tous par défaut)
+        Returns:
+            bool: False si le livre est inconnu ou les nombres invalides
+        """
+        if nombre < 1 or (disponibles is not None and not 0 <= disponibles <= nombre):
+            return False
+        with self._verrouiller(livres=[livre]):
+            if livre not in self._index_documents:
+                return False
+            aujourd_hui = self.aujourd_hui()
+            with self._structure:
+                self._avant_modification(livre)
+                livre.ajouter_exemplaires(nombre, disponibles)
+                mises_de_cote = []
+                reservation = self._mettre_de_cote(livre, aujourd_hui)
+                while reservation is not None:
+                    mises_de_cote.append(reservation)
+                    reservation = self._mettre_de_cote(livre, aujourd_hui)
+                self._indexer_disponibilite(livre)
+
+            with self.lot():
+                self._notifier_document_modifie(livre)
+                for reservation in mises_de_cote:
+                    self._notifier(ReservationPrete, reservation, None)
+        return True
+
+    def retirer_exemplaires(self, livre, nombre):
+        """
+        Retire des exemplaires en rayon d'un livre (ni prêtés, ni mis de
+        côté) ; le dernier exemplaire se retire avec enlever_document
         """
-        self._documents.append(document)
+        with self._verrouiller(livres=[livre]):
+            if livre not in self._index_documents or nombre > self._exemplaires_libres(livre):
+                return False
+            with self._structure:
+                self._avant_modification(livre)
+                if not livre.retirer_exemplaires(nombre):
+                    return False
+                self._indexer_disponibilite(livre)
+            self._notifier_document_modifie(livre)
         return True
 
     def enlever_document(self, document):
         """
         Enlève un document de la bibliothèque
         """
-        if document in self._documents:
-            self._documents.remove(document)
-            return True
-        return False
+        with self._verrouiller(livres=[document]), self._structure:
+            if document not in self._index_documents:
+                return False
+            annulees, _ = self._retirer_reservations(lambda r: r.livre is document, [document])
+            ligne = self._positions_documents.pop(document)
+            documents = self._liste_modifiable('_documents')
+            del documents[ligne]
+            # Les documents suivants remontent d'une ligne (comme la suppression)
+            for position in range(ligne, len(documents)):
+                self._positions_documents[documents[position]] = position
+            self._index_livres_disponibles.retirer(document)
+            self._index_documents.retirer(document)
+            cle = document.titre.lower()
+            if self._documents_par_titre.get(cle) is document:
+                del self._documents_par_titre[cle]
+                # Un autre document du même titre prend la place (rare)
+                for autre in self._documents:
+                    if autre.titre.lower() == cle:
+                        self._documents_par_titre[cle] = autre
+                        break
+        self._notifier(DocumentEnleve, document, ligne)
+        for reservation in annulees:
+            self._notifier(ReservationTerminee, reservation, None)
+        return True
 
     def rechercher_document(self, titre):
         """
         Recherche un document par titre
         """
-        for document in self._documents:
-            if document.titre.lower() == titre.lower():
-                return document
-        return None
+        return self._documents_par_titre.get(titre.lower())
+
+    def rechercher_documents(self, prefixe, limite=20):
+        """
+        Recherche les documents dont le titre commence par le préfixe
+        (casse et accents ignorés)
+        """
+        with self._structure:
+            return self._index_documents.rechercher(prefixe, limite)
 
     def get_documents(self):
         """
@@ -89,6 +473,12 @@ class Bibliotheque:
         """
         return self._documents.copy()
 
+    def compter_documents(self):
+        """
+        Retourne le nombre de documents
+        """
+        return len(self._documents)
+
     def get_livres(self):
         """
         Retourne uniquement les livres de la bibliothèque
@@ -104,6 +494,28 @@ class Bibliotheque:
         return [doc for doc in self._documents
                 if isinstance(doc, Livre) and doc.disponible]
 
+    def rechercher_livres_disponibles(self, prefixe, limite=20):
+        """
+        Recherche les livres disponibles dont le titre ou l'auteur commence
+        par le préfixe (casse et accents ignorés)
+        """
+        with self._structure:
+            return self._index_livres_disponibles.rechercher(prefixe, limite)
+
+    def _indexer_disponibilite(self, document):
+        """
+        Met à jour l'index des livres disponibles pour un document
+        """
+        from classes.document import Livre
+        if not isinstance(document, Livre):
+            return
+        # Les exemplaires mis de côté pour une réservation ne sont pas proposés
+        disponible = self._exemplaires_libres(document) > 0
+        if disponible and document not in self._index_livres_disponibles:
+            self._index_livres_disponibles.ajouter(document, document.titre, document.auteur)
+        elif not disponible:
+            self._index_livres_disponibles.retirer(document)
+
     # ========== Gestion des Emprunts ==========
 
     def ajouter_emprunt(self, adherent, livre):
@@ -112,20 +524,33 @@ class Bibliotheque:
         """
         from classes.emprunt import Emprunt
 
-        # Vérifications
-        if adherent not in self._adherents:
-            return False, "Adhérent non inscrit à la bibliothèque"
+        # Vérification et emprunt sous les verrous de l'adhérent et du livre :
+        # deux postes ne peuvent pas prêter le même livre
+        with self._verrouiller([adherent], [livre]):
+            if adherent.get_identifiant() not in self._adherents_par_id:
+                return False, "Adhérent non inscrit à la bibliothèque"
+
+            if livre not in self._index_documents:
+                return False, "Livre non disponible dans la bibliothèque"
 
-        if livre not in self._documents:
-            return False, "Livre non disponible dans la bibliothèque"
+            if not livre.empruntable():
+                return False, "Aucun exemplaire disponible"
 
-        if not livre.empruntable():
-            return False, "Livre déjà emprunté"
+            if self._reserve_pour_autrui(livre, adherent):
+                return False, "Exemplaires restants mis de côté pour des réservations"
 
-        # Créer l'emprunt
-        emprunt = Emprunt(adherent, livre)
-        livre.emprunter()
-        self._emprunts.append(emprunt)
+            if self._emprunt_actif(livre, adherent) is not None:
+                return False, "Cet adhérent a déjà un exemplaire de ce livre"
+
+            # Créer l'emprunt
+            emprunt = Emprunt(adherent, livre, self.aujourd_hui())
+            with self._structure:
+                ligne, honoree = self._appliquer_emprunt(emprunt)
+
+            self._notifier(EmpruntCree, emprunt, ligne)
+            self._notifier_document_modifie(livre)
+            if honoree is not None:
+                self._notifier(ReservationTerminee, honoree, None)
 
         return True, f"Emprunt créé avec succès. Date de retour prévue: {emprunt.calculer_date_retour_prevue().strftime('%d/%m/%Y')}"
 
@@ -133,70 +558,725 @@ class Bibliotheque:
         """
         Enregistre le retour d'un livre
         """
-        # Trouver l'emprunt actif correspondant
-        for emprunt in self._emprunts:
-            if (emprunt.adherent == adherent and
-                    emprunt.livre == livre and
-                    emprunt.est_actif()):
+        with self._verrouiller([adherent], [livre]):
+            # Trouver l'emprunt actif correspondant
+            for emprunt in self._emprunts_par_adherent.get(adherent.get_identifiant(), []):
+                if emprunt.livre == livre and emprunt.est_actif():
 
-                emprunt.date_retour = date.today()
-                livre.rendre()
+                    aujourd_hui = self.aujourd_hui()
+                    jours = emprunt.jours_retard(aujourd_hui)
+                    with self._structure:
+                        self._appliquer_retour(emprunt, aujourd_hui)
+                        mise_de_cote = self._mettre_de_cote(livre, aujourd_hui)
 
-                if emprunt.est_en_retard():
-                    jours = emprunt.jours_retard()
-                    return True, f"Livre retourné avec {jours} jour(s) de retard"
-                else:
-                    return True, "Livre retourné avec succès"
+                    self._notifier(EmpruntRetourne, emprunt, None)
+                    self._notifier_document_modifie(livre)
+                    if mise_de_cote is not None:
+                        self._notifier(ReservationPrete, mise_de_cote, None)
+                        return True, (f"Livre retourné, à mettre de côté pour "
+                                      f"{mise_de_cote.adherent.prenom} {mise_de_cote.adherent.nom}")
+
+                    if jours > 0:
+                        return True, f"Livre retourné avec {jours} jour(s) de retard"
+                    else:
+                        return True, "Livre retourné avec succès"
 
         return False, "Aucun emprunt actif trouvé pour ce livre et cet adhérent"
 
+    def _appliquer_emprunt(self, emprunt):
+        """
+        Enregistre un emprunt déjà vérifié (verrou de structure tenu)
+        Returns:
+            tuple: (position de l'emprunt dans la liste, réservation honorée ou None)
+        """
+        self._avant_modification(emprunt.livre)
+        emprunt.livre.emprunter()
+        cle = (emprunt.adherent.get_identifiant(), id(emprunt.livre))
+        honoree = self._reservations_pretes.pop(cle, None)
+        if honoree is not None:
+            self._reserves.discard(cle)
+            self._compter_mis_de_cote(emprunt.livre, -1)
+        self._liste_modifiable('_emprunts').append(emprunt)
+        self._indexer_disponibilite(emprunt.livre)
+        self._indexer_emprunt(emprunt)
+        self._circulation.enregistrer_emprunt(emprunt)
+        if self._recommandations is not None:
+            self._recommandations.ajouter_emprunt(emprunt)
+        series = self._series_modifiables()
+        if series is not None:
+            series.enregistrer_emprunt(emprunt)
+        return len(self._emprunts) - 1, honoree
+
+    def _appliquer_retour(self, emprunt, date_retour):
+        """
+        Enregistre le retour d'un emprunt actif (verrou de structure tenu)
+        """
+        self._avant_modification(emprunt)
+        self._avant_modification(emprunt.livre)
+        emprunt.date_retour = date_retour
+        emprunt.livre.rendre()
+        self._indexer_disponibilite(emprunt.livre)
+        self._circulation.enregistrer_retour(date_retour)
+        series = self._series_modifiables()
+        if series is not None:
+            series.enregistrer_retour(emprunt)
+        del self._emprunts_actifs[emprunt]
+        self._index_emprunts_actifs.retirer(emprunt)
+
+    def _emprunt_actif(self, livre, adherent):
+        """
+        Retourne l'emprunt en cours d'un exemplaire du livre par l'adhérent, ou None
+        """
+        for emprunt in self._emprunts_par_adherent.get(adherent.get_identifiant(), []):
+            if emprunt.livre is livre and emprunt.est_actif():
+                return emprunt
+        return None
+
+    def _exemplaires_libres(self, livre):
+        """
+        Retourne le nombre d'exemplaires en rayon qui ne sont pas mis de côté
+        """
+        return livre.disponibles - self._mis_de_cote.get(livre, 0)
+
+    # ========== Emprunts et retours groupés ==========
+
+    def emprunter_lot(self, adherent, livres):
+        """
+        Prête plusieurs livres à un adhérent en une seule opération : tout le
+        lot est vérifié d'abord, et aucun emprunt n'est créé si un seul livre
+        ne peut pas l'être
+        Returns:
+            tuple: (succès, reçu récapitulatif ou liste des refus)
+        """
+        from classes.document import Livre
+        from classes.emprunt import Emprunt
+
+        livres = list(livres)
+        if not livres:
+            return False, "Aucun livre à emprunter"
+
+        with self._verrouiller([adherent], livres):
+            if adherent.get_identifiant() not in self._adherents_par_id:
+                return False, "Adhérent non inscrit à la bibliothèque"
+
+            refus = []
+            vus = set()
+            for livre in livres:
+                if id(livre) in vus:
+                    refus.append(f"{livre.titre}: présent deux fois dans le lot")
+                elif not isinstance(livre, Livre):
+                    refus.append(f"{livre.titre}: seuls les livres peuvent être empruntés")
+                elif livre not in self._index_documents:
+                    refus.append(f"{livre.titre}: livre non disponible dans la bibliothèque")
+                elif not livre.empruntable():
+                    refus.append(f"{livre.titre}: aucun exemplaire disponible")
+                elif self._reserve_pour_autrui(livre, adherent):
+                    refus.append(f"{livre.titre}: exemplaires restants mis de côté")
+                elif self._emprunt_actif(livre, adherent) is not None:
+                    refus.append(f"{livre.titre}: un exemplaire est déjà emprunté par cet adhérent")
+                vus.add(id(livre))
+            if refus:
+                return False, "Aucun emprunt créé :\n" + "\n".join(refus)
+
+            aujourd_hui = self.aujourd_hui()
+            emprunts = [Emprunt(adherent, livre, aujourd_hui) for livre in livres]
+            with self._structure:
+                resultats = [self._appliquer_emprunt(emprunt) for emprunt in emprunts]
+
+            # Une seule livraison des événements pour tout le lot
+            with self.lot():
+                for emprunt, (ligne, honoree) in zip(emprunts, resultats):
+                    self._notifier(EmpruntCree, emprunt, ligne)
+                    self._notifier_document_modifie(emprunt.livre)
+                    if honoree is not None:
+                        self._notifier(ReservationTerminee, honoree, None)
+
+        recu = [f"Reçu d'emprunt - {adherent.prenom} {adherent.nom} - "
+                f"{aujourd_hui.strftime('%d/%m/%Y')}",
+                f"{len(emprunts)} livre(s) emprunté(s) :"]
+        for emprunt in emprunts:
+            recu.append(f"  • {emprunt.livre.titre} - retour prévu le "
+                        f"{emprunt.calculer_date_retour_prevue().strftime('%d/%m/%Y')}")
+        return True, "\n".join(recu)
+
+    def retourner_lot(self, emprunts):
+        """
+        Enregistre le retour de plusieurs emprunts en une seule opération : si
+        l'un d'eux n'est plus en cours, aucun retour n'est enregistré
+        Returns:
+            tuple: (succès, reçu récapitulatif ou liste des refus)
+        """
+        emprunts = list(emprunts)
+        if not emprunts:
+            return False, "Aucun livre à retourner"
+
+        with self._verrouiller([e.adherent for e in emprunts], [e.livre for e in emprunts]):
+            refus = []
+            vus = set()
+            for emprunt in emprunts:
+                if id(emprunt) in vus:
+                    refus.append(f"{emprunt.livre.titre}: présent deux fois dans le lot")
+                elif emprunt not in self._emprunts_actifs:
+                    refus.append(f"{emprunt.livre.titre}: aucun emprunt actif")
+                vus.add(id(emprunt))
+            if refus:
+                return False, "Aucun retour enregistré :\n" + "\n".join(refus)
+
+            aujourd_hui = self.aujourd_hui()
+            retards = [emprunt.jours_retard(aujourd_hui) for emprunt in emprunts]
+            with self._structure:
+                for emprunt in emprunts:
+                    self._appliquer_retour(emprunt, aujourd_hui)
+                mises_de_cote = [self._mettre_de_cote(emprunt.livre, aujourd_hui)
+                                 for emprunt in emprunts]
+
+            with self.lot():
+                for emprunt, mise_de_cote in zip(emprunts, mises_de_cote):
+                    self._notifier(EmpruntRetourne, emprunt, None)
+                    self._notifier_document_modifie(emprunt.livre)
+                    if mise_de_cote is not None:
+                        self._notifier(ReservationPrete, mise_de_cote, None)
+
+        recu = [f"Reçu de retour - {aujourd_hui.strftime('%d/%m/%Y')}",
+                f"{len(emprunts)} livre(s) retourné(s) :"]
+        for emprunt, jours, mise_de_cote in zip(emprunts, retards, mises_de_cote):
+            ligne = f"  • {emprunt.livre.titre} - {emprunt.adherent.prenom} {emprunt.adherent.nom}"
+            if jours > 0:
+                ligne += f" ({jours} jour(s) de retard)"
+            if mise_de_cote is not None:
+                ligne += (f" - à mettre de côté pour {mise_de_cote.adherent.prenom} "
+                          f"{mise_de_cote.adherent.nom}")
+            recu.append(ligne)
+        en_retard = sum(1 for jours in retards if jours > 0)
+        if en_retard:
+            recu.append(f"{en_retard} livre(s) rendu(s) en retard, {sum(retards)} jour(s) au total")
+        return True, "\n".join(recu)
+
+    # ========== Réservations ==========
+
+    def reserver(self, adherent, livre):
+        """
+        Inscrit un adhérent dans la file d'attente d'un livre emprunté
+        (le livre lui sera mis de côté à son tour, au retour)
+        Returns:
+            tuple: (succès, message)
+        """
+        from classes.document import Livre
+        from classes.reservation import Reservation
+
+        with self._verrouiller([adherent], [livre]):
+            identifiant = adherent.get_identifiant()
+            if identifiant not in self._adherents_par_id:
+                return False, "Adhérent non inscrit à la bibliothèque"
+
+            if not isinstance(livre, Livre) or livre not in self._index_documents:
+                return False, "Livre non disponible dans la bibliothèque"
+
+            if self._exemplaires_libres(livre) > 0:
+                return False, "Livre disponible : il peut être emprunté directement"
+
+            if (identifiant, id(livre)) in self._reserves:
+                return False, "Ce livre est déjà réservé par cet adhérent"
+
+            if self._emprunt_actif(livre, adherent) is not None:
+                return False, "Ce livre est déjà emprunté par cet adhérent"
+
+            reservation = Reservation(adherent, livre, self.aujourd_hui())
+            with self._structure:
+                file = self._files_reservations.setdefault(livre, deque())
+                file.append(reservation)
+                self._reserves.add((identifiant, id(livre)))
+                position = len(file)
+
+            self._notifier(ReservationCreee, reservation, None)
+        return True, f"Réservation enregistrée (position {position} dans la file d'attente)"
+
+    def annuler_reservation(self, adherent, livre):
+        """
+        Annule la réservation d'un adhérent ; si le livre lui était mis de
+        côté, il passe au suivant de la file
+        Returns:
+            tuple: (succès, message)
+        """
+        identifiant = adherent.get_identifiant()
+        with self._verrouiller([adherent], [livre]):
+            if (identifiant, id(livre)) not in self._reserves:
+                return False, "Aucune réservation de cet adhérent pour ce livre"
+
+            with self._structure:
+                annulees, pretes = self._retirer_reservations(
+                    lambda r: r.adherent.get_identifiant() == identifiant, [livre])
+
+            for reservation in annulees:
+                self._notifier(ReservationTerminee, reservation, None)
+            for reservation in pretes:
+                self._notifier(ReservationPrete, reservation, None)
+        return True, "Réservation annulée"
+
+    def restaurer_reservation(self, reservation):
+        """
+        Ajoute une réservation existante (chargement depuis les fichiers),
+        sans contrôle ni notification ; à appeler dans l'ordre des files
+        """
+        livre = reservation.livre
+        with self._structure:
+            cle = (reservation.adherent.get_identifiant(), id(livre))
+            if reservation.est_prete():
+                self._reservations_pretes[cle] = reservation
+                self._compter_mis_de_cote(livre, 1)
+                self._indexer_disponibilite(livre)
+            else:
+                self._files_reservations.setdefault(livre, deque()).append(reservation)
+            self._reserves.add(cle)
+
+    def _reserve_pour_autrui(self, livre, adherent):
+        """
+        Vérifie si les seuls exemplaires en rayon sont mis de côté pour
+        d'autres adhérents
+        """
+        if (adherent.get_identifiant(), id(livre)) in self._reservations_pretes:
+            return False
+        return self._exemplaires_libres(livre) <= 0
+
+    def _compter_mis_de_cote(self, livre, variation):
+        """
+        Met à jour le nombre d'exemplaires mis de côté d'un livre
+        """
+        nombre = self._mis_de_cote.get(livre, 0) + variation
+        if nombre:
+            self._mis_de_cote[livre] = nombre
+        else:
+            self._mis_de_cote.pop(livre, None)
+
+    def _mettre_de_cote(self, livre, date_mise_de_cote):
+        """
+        Attribue un exemplaire libre au premier de la file d'attente du livre
+        (verrou de structure tenu)
+        Returns:
+            Reservation: la réservation servie, ou None si personne n'attend
+        """
+        file = self._files_reservations.get(livre)
+        if not file or self._exemplaires_libres(livre) <= 0:
+            return None
+        reservation = file.popleft()
+        if not file:
+            del self._files_reservations[livre]
+        self._avant_modification(reservation)
+        reservation.date_mise_de_cote = date_mise_de_cote
+        self._reservations_pretes[(reservation.adherent.get_identifiant(), id(livre))] = reservation
+        self._compter_mis_de_cote(livre, 1)
+        self._indexer_disponibilite(livre)
+        return reservation
+
+    def _retirer_reservations(self, condition, livres=None):
+        """
+        Retire les réservations qui remplissent une condition (verrou de
+        structure tenu), parmi celles des livres donnés ou de tous les livres ;
+        un exemplaire libéré est mis de côté pour le suivant de la file
+        Returns:
+            tuple: (réservations retirées, nouvelles réservations prêtes)
+        """
+        if livres is not None:
+            livres = set(livres)
+        retirees, liberes = [], []
+        for livre, file in list(self._files_reservations.items()):
+            if livres is not None and livre not in livres:
+                continue
+            gardees = deque(r for r in file if not condition(r))
+            retirees.extend(r for r in file if condition(r))
+            if gardees:
+                self._files_reservations[livre] = gardees
+            else:
+                del self._files_reservations[livre]
+        for cle, reservation in list(self._reservations_pretes.items()):
+            livre = reservation.livre
+            if (livres is None or livre in livres) and condition(reservation):
+                del self._reservations_pretes[cle]
+                self._compter_mis_de_cote(livre, -1)
+                retirees.append(reservation)
+                liberes.append(livre)
+        for reservation in retirees:
+            self._reserves.discard((reservation.adherent.get_identifiant(), id(reservation.livre)))
+
+        pretes = []
+        aujourd_hui = self.aujourd_hui()
+        for livre in liberes:
+            suivante = self._mettre_de_cote(livre, aujourd_hui)
+            if suivante is not None:
+                pretes.append(suivante)
+            self._indexer_disponibilite(livre)
+        return retirees, pretes
+
+    def get_reservations_pretes(self):
+        """
+        Retourne les livres mis de côté qui attendent leur adhérent
+        (dans l'ordre de mise de côté)
+        """
+        with self._structure:
+            return list(self._reservations_pretes.values())
+
+    def get_file_reservations(self, livre):
+        """
+        Retourne la file d'attente d'un livre (la première à servir en tête)
+        """
+        with self._structure:
+            return list(self._files_reservations.get(livre, ()))
+
+    def get_reservations(self):
+        """
+        Retourne toutes les réservations : celles prêtes, puis les files
+        d'attente dans leur ordre
+        """
+        with self._structure:
+            reservations = list(self._reservations_pretes.values())
+            for file in self._files_reservations.values():
+                reservations.extend(file)
+            return reservations
+
+    def compter_reservations(self):
+        """
+        Retourne le nombre de réservations (en attente et prêtes)
+        """
+        return len(self._reserves)
+
+    # ========== Index et consultation des emprunts ==========
+
+    def restaurer_emprunt(self, emprunt):
+        """
+        Ajoute un emprunt existant (chargement depuis les fichiers), sans
+        contrôle ni notification
+        """
+        with self._structure:
+            self._liste_modifiable('_emprunts').append(emprunt)
+            self._indexer_emprunt(emprunt)
+            self._circulation.enregistrer_emprunt(emprunt)
+            # Index et agrégats reconstruits en un passage, après le chargement
+            self._recommandations = None
+            self._series = None
+            self._listes_partagees.discard('_series')
+            if emprunt.date_retour:
+                self._circulation.enregistrer_retour(emprunt.date_retour)
+
+    def _indexer_emprunt(self, emprunt):
+        """
+        Enregistre dans les index un emprunt qui vient d'être ajouté à la liste
+        """
+        if (self._emprunts_tries and len(self._emprunts) > 1 and
+                emprunt.date_emprunt < self._emprunts[-2].date_emprunt):
+            self._emprunts_tries = False
+
+        adherent = emprunt.adherent
+        self._emprunts_par_adherent.setdefault(adherent.get_identifiant(), []).append(emprunt)
+        self._emprunts_par_livre.setdefault(emprunt.livre, []).append(emprunt)
+
+        if emprunt.est_actif():
+            self._emprunts_actifs[emprunt] = None
+            self._index_emprunts_actifs.ajouter(emprunt, emprunt.livre.titre,
+                                                f"{adherent.prenom} {adherent.nom}",
+                                                f"{adherent.nom} {adherent.prenom}")
+
+    def rechercher_emprunts_actifs(self, prefixe, limite=20):
+        """
+        Recherche les emprunts actifs par début du titre du livre ou du nom
+        de l'adhérent (casse et accents ignorés)
+        """
+        with self._structure:
+            return self._index_emprunts_actifs.rechercher(prefixe, limite)
+
+    def _notifier_document_modifie(self, document):
+        """
+        Prévient les abonnés du changement d'état d'un document
+        """
+        if self._bus.a_des_abonnes():
+            with self._structure:
+                ligne = self._positions_documents[document]
+            self._notifier(DocumentModifie, document, ligne)
+
     def get_emprunts(self):
         """
         Retourne la liste de tous les emprunts
         """
         return self._emprunts.copy()
 
+    def compter_emprunts(self):
+        """
+        Retourne le nombre total d'emprunts (historique compris)
+        """
+        return len(self._emprunts)
+
+    def get_emprunt(self, index):
+        """
+        Retourne l'emprunt à la position donnée (sans copier la liste)
+        """
+        return self._emprunts[index]
+
     def get_emprunts_actifs(self):
         """
         Retourne la liste des emprunts actifs (non encore retournés par leurs emprunteur respectifs )
         """
-        return [e for e in self._emprunts if e.est_actif()]
+        with self._structure:
+            return list(self._emprunts_actifs)
 
     def get_emprunts_adherent(self, adherent):
         """
         Retourne les emprunts d'un adhérent
         """
-        return [e for e in self._emprunts if e.adherent == adherent]
+        return list(self._emprunts_par_adherent.get(adherent.get_identifiant(), []))
+
+    def get_emprunts_livre(self, livre):
+        """
+        Retourne les emprunts d'un livre
+        """
+        return list(self._emprunts_par_livre.get(livre, []))
 
-    def get_emprunts_en_retard(self):
+    def get_emprunts_en_retard(self, date_reference=None):
         """
         Retourne les emprunts en retard
+        Args:
+            date_reference: date d'évaluation (date de l'horloge par défaut)
+        """
+        if date_reference is None:
+            date_reference = self.aujourd_hui()
+        with self._structure:
+            return [e for e in self._emprunts_actifs if e.est_en_retard(date_reference)]
+
+    def rechercher_emprunts(self, adherent=None, livre=None, statut=None,
+                            date_debut=None, date_fin=None, tri=TRI_DATE,
+                            decroissant=True, page=0, taille_page=50,
+                            date_reference=None):
         """
-        return [e for e in self._emprunts if e.est_en_retard()]
+        Recherche paginée dans l'historique des emprunts
+        Args:
+            adherent, livre: ne garder que les emprunts de cet adhérent / ce livre
+            statut: STATUT_ACTIF, STATUT_RETARD, STATUT_RETOURNE ou None (tous)
+            date_debut, date_fin: bornes incluses sur la date d'emprunt
+            tri: TRI_DATE (date d'emprunt) ou TRI_STATUT (retards, en cours, retournés)
+            decroissant: les plus récents d'abord
+            page, taille_page: page demandée (à partir de 0) et nombre de lignes
+            date_reference: date d'évaluation des retards (date de l'horloge par défaut)
+        Returns:
+            tuple: (emprunts de la page, nombre total d'emprunts correspondants)
+        """
+        with self._structure:
+            if date_reference is None:
+                date_reference = self.aujourd_hui()
+
+            # Partir de l'index le plus sélectif
+            if adherent is not None:
+                candidats = self._emprunts_par_adherent.get(adherent.get_identifiant(), [])
+            elif livre is not None:
+                candidats = self._emprunts_par_livre.get(livre, [])
+            elif statut in (self.STATUT_ACTIF, self.STATUT_RETARD):
+                candidats = list(self._emprunts_actifs)
+            else:
+                candidats = self._emprunts
+
+            tries = candidats is self._emprunts and self._emprunts_tries
+            debut, fin = 0, len(candidats)
+            if tries and (date_debut or date_fin):
+                # Historique trié : la période se découpe par dichotomie
+                if date_debut:
+                    debut = bisect.bisect_left(candidats, date_debut, key=self._date_emprunt)
+                if date_fin:
+                    fin = bisect.bisect_right(candidats, date_fin, key=self._date_emprunt)
+                date_debut = date_fin = None
+
+            filtres = []
+            if livre is not None and adherent is not None:
+                filtres.append(lambda e: e.livre == livre)
+            if statut == self.STATUT_ACTIF:
+                filtres.append(lambda e: e.est_actif())
+            elif statut == self.STATUT_RETARD:
+                filtres.append(lambda e: e.est_en_retard(date_reference))
+            elif statut == self.STATUT_RETOURNE:
+                filtres.append(lambda e: not e.est_actif())
+            if date_debut:
+                filtres.append(lambda e: e.date_emprunt >= date_debut)
+            if date_fin:
+                filtres.append(lambda e: e.date_emprunt <= date_fin)
+
+            premier = page * taille_page
+            if tries and not filtres and tri == self.TRI_DATE:
+                # Cas courant (historique par date) : seule la page demandée est lue
+                total = fin - debut
+                dernier = min(premier + taille_page, total)
+                if premier >= dernier:
+                    return [], total
+                if decroissant:
+                    return [candidats[fin - 1 - i] for i in range(premier, dernier)], total
+                return candidats[debut + premier:debut + dernier], total
+
+            resultats = candidats[debut:fin]
+            for filtre in filtres:
+                resultats = [e for e in resultats if filtre(e)]
+
+            if tri == self.TRI_STATUT:
+                def rang(e):
+                    if e.est_en_retard(date_reference):
+                        return 0
+                    return 1 if e.est_actif() else 2
+                # Tri stable : par date puis par statut
+                resultats.sort(key=self._date_emprunt, reverse=decroissant)
+                resultats.sort(key=rang)
+            elif not tries:
+                resultats.sort(key=self._date_emprunt, reverse=decroissant)
+            elif decroissant:
+                resultats.reverse()
+
+            return resultats[premier:premier + taille_page], len(resultats)
+
+    @staticmethod
+    def _date_emprunt(emprunt):
+        """Clé de tri des emprunts par date d'emprunt"""
+        return emprunt.date_emprunt
 
     # ========== Statistiques ==========
 
-    def get_statistiques(self):
+    def get_livres_populaires(self, nombre=10, jours=30):
+        """
+        Retourne les livres les plus empruntés sur les derniers jours
+        (les livres retirés depuis sont omis)
+        Args:
+            jours: durée de la fenêtre (30 ou 365)
+        Returns:
+            list: couples (livre, nombre d'emprunts)
+        """
+        with self._structure:
+            # Quelques éléments de plus, au cas où des livres auraient été retirés
+            classement = self._circulation.classement('livres', jours, nombre + 10,
+                                                      self.aujourd_hui())
+            presents = [(livre, nombre_emprunts) for livre, nombre_emprunts in classement
+                        if livre in self._index_documents]
+            return presents[:nombre]
+
+    def get_adherents_actifs(self, nombre=10, jours=30):
+        """
+        Retourne les adhérents qui ont le plus emprunté sur les derniers jours
+        (les adhérents désinscrits depuis sont omis)
+        Returns:
+            list: couples (adhérent, nombre d'emprunts)
+        """
+        with self._structure:
+            # Quelques éléments de plus, au cas où des adhérents seraient partis
+            classement = self._circulation.classement('adherents', jours, nombre + 10,
+                                                      self.aujourd_hui())
+            actifs = [(self._adherents_par_id[identifiant], nombre_emprunts)
+                      for identifiant, nombre_emprunts in classement
+                      if identifiant in self._adherents_par_id]
+            return actifs[:nombre]
+
+    def get_circulation_auteurs(self, nombre=10, jours=30):
+        """
+        Retourne les auteurs les plus empruntés sur les derniers jours
+        Returns:
+            list: couples (auteur, nombre d'emprunts)
+        """
+        with self._structure:
+            return self._circulation.classement('auteurs', jours, nombre, self.aujourd_hui())
+
+    def get_circulation(self, jours=30):
+        """
+        Retourne le nombre d'emprunts et de retours sur les derniers jours
+        """
+        with self._structure:
+            return self._circulation.mouvements(jours, self.aujourd_hui())
+
+    def get_recommandations(self, livre, nombre=5, adherent=None):
+        """
+        Retourne les livres le plus souvent empruntés par les adhérents qui
+        ont emprunté ce livre (les livres retirés depuis sont omis)
+        Args:
+            adherent: si donné, écarte les livres qu'il a déjà empruntés
+        Returns:
+            list: couples (livre, nombre d'adhérents)
+
+        L'index est construit au premier appel s'il n'a pas été chargé avec
+        la bibliothèque (voir FileManager.charger_bibliotheque).
+        """
+        with self._structure:
+            if self._recommandations is None:
+                self._recommandations = IndexRecommandations.depuis_emprunts(self._emprunts)
+            exclure = ()
+            if adherent is not None:
+                exclure = self._recommandations.livres_adherent(adherent.get_identifiant())
+            # Quelques éléments de plus, au cas où des livres auraient été retirés
+            classement = self._recommandations.recommander(livre.titre, nombre + 10, exclure)
+            recommandes = []
+            for titre, nombre_adherents in classement:
+                document = self._documents_par_titre.get(titre.lower())
+                if document is not None and document is not livre:
+                    recommandes.append((document, nombre_adherents))
+            return recommandes[:nombre]
+
+    def definir_recommandations(self, index):
+        """
+        Remplace l'index des recommandations (construit par le chargement,
+        hors du thread de l'interface)
+        """
+        with self._structure:
+            self._recommandations = index
+
+    def _series_a_jour(self):
+        """
+        Retourne les agrégats chronologiques, reconstruits au besoin depuis
+        l'historique (après un chargement sans fichier d'agrégats à jour)
+        """
+        with self._structure:
+            if self._series is None:
+                self._series = SeriesEmprunts.depuis_emprunts(self._emprunts)
+                self._listes_partagees.discard('_series')
+            return self._series
+
+    def definir_series(self, series):
+        """
+        Remplace les agrégats chronologiques (chargés depuis leur fichier,
+        ou reconstruits par le chargement)
+        """
+        with self._structure:
+            self._series = series
+            self._listes_partagees.discard('_series')
+
+    def get_series(self, debut, fin, pas=SeriesEmprunts.PAS_JOUR):
+        """
+        Retourne les emprunts, retours et passages en retard d'une période
+        Args:
+            pas: SeriesEmprunts.PAS_JOUR ou SeriesEmprunts.PAS_MOIS
+        Returns:
+            list: tuples (début du seau, emprunts, retours, passages en retard)
+        """
+        with self._structure:
+            return self._series_a_jour().periode(debut, fin, pas, self.aujourd_hui())
+
+    def lignes_csv_agregats(self):
+        """Retourne les lignes CSV des agrégats chronologiques"""
+        with self._structure:
+            return list(self._series_a_jour().lignes_csv())
+
+    def get_statistiques(self, date_reference=None):
         """
         Retourne des statistiques sur la bibliothèque
+        Args:
+            date_reference: date d'évaluation des retards (date de l'horloge par défaut)
         """
-        from classes.document import Livre
+        with self._structure:
+            livres = self.get_livres()
+            livres_disponibles = self.get_livres_disponibles()
+            emprunts_retard = self.get_emprunts_en_retard(date_reference)
+            exemplaires = sum(livre.exemplaires for livre in livres)
+            exemplaires_disponibles = sum(livre.disponibles for livre in livres)
 
-        livres = self.get_livres()
-        livres_disponibles = self.get_livres_disponibles()
-        emprunts_actifs = self.get_emprunts_actifs()
-        emprunts_retard = self.get_emprunts_en_retard()
-
-        return {
-            'total_documents': len(self._documents),
-            'total_livres': len(livres),
-            'livres_disponibles': len(livres_disponibles),
-            'livres_empruntes': len(livres) - len(livres_disponibles),
-            'total_adherents': len(self._adherents),
-            'emprunts_actifs': len(emprunts_actifs),
-            'emprunts_retard': len(emprunts_retard),
-            'total_emprunts': len(self._emprunts)
-        }
+            return {
+                'total_documents': len(self._documents),
+                'total_livres': len(livres),
+                'livres_disponibles': len(livres_disponibles),
+                'livres_empruntes': len(livres) - len(livres_disponibles),
+                'total_exemplaires': exemplaires,
+                'exemplaires_disponibles': exemplaires_disponibles,
+                'total_adherents': len(self._adherents),
+                'emprunts_actifs': len(self._emprunts_actifs),
+                'emprunts_retard': len(emprunts_retard),
+                'total_emprunts': len(self._emprunts)
+            }
 
     def __str__(self):
         stats = self.get_statistiques()
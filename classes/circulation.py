@@ -0,0 +1,194 @@
+"""
+Module des statistiques de circulation sur fenêtres glissantes (livres les
+plus empruntés, adhérents les plus actifs, circulation par auteur), tenues
+à jour à chaque emprunt et à chaque retour
+"""
+
+import heapq
+from collections import Counter
+from operator import itemgetter
+
+
+class SpaceSaving:
+    """
+    Compteur à mémoire bornée des éléments les plus fréquents (algorithme
+    Space-Saving) : au-delà de la capacité, l'élément le moins compté cède sa
+    place au nouveau, qui hérite de son compte. Exact tant que le nombre
+    d'éléments distincts ne dépasse pas la capacité.
+    """
+
+    def __init__(self, capacite):
+        """
+        Initialise un compteur vide
+        """
+        self._capacite = capacite
+        self._comptes = {}
+
+    def ajouter(self, cle, nombre=1):
+        """
+        Compte une occurrence
+        Returns:
+            tuple: (élément évincé, son compte), ou None
+        """
+        comptes = self._comptes
+        if cle in comptes or len(comptes) < self._capacite:
+            comptes[cle] = comptes.get(cle, 0) + nombre
+            return None
+        evince = min(comptes, key=comptes.__getitem__)
+        compte = comptes.pop(evince)
+        comptes[cle] = compte + nombre
+        return evince, compte
+
+    def items(self):
+        """Retourne les couples (élément, compte)"""
+        return self._comptes.items()
+
+
+class FenetreGlissante:
+    """
+    Comptes par élément sur les N derniers jours : un compteur Space-Saving
+    par jour, et leur somme tenue à jour (ajout du jour, retrait des jours
+    sortis de la fenêtre)
+    """
+
+    def __init__(self, jours, capacite):
+        """
+        Initialise une fenêtre
+        Args:
+            jours: durée de la fenêtre
+            capacite: éléments gardés par jour
+        """
+        self._jours = jours
+        self._capacite = capacite
+        self._seaux = {}            # jour ordinal -> SpaceSaving
+        self._totaux = Counter()    # somme des seaux de la fenêtre courante
+        self._jour = None           # dernier jour de la fenêtre courante
+
+    def ajouter(self, jour, cle, nombre=1):
+        """
+        Compte une occurrence à une date (jour ordinal)
+        """
+        if self._jour is None or jour > self._jour:
+            self._avancer(jour)
+        if jour <= self._jour - self._jours:
+            return  # déjà sorti de la fenêtre
+        seau = self._seaux.get(jour)
+        if seau is None:
+            seau = self._seaux[jour] = SpaceSaving(self._capacite)
+        evince = seau.ajouter(cle, nombre)
+        if evince is not None:
+            ancien, compte = evince
+            self._retirer(ancien, compte)
+            nombre += compte
+        self._totaux[cle] += nombre
+
+    def _retirer(self, cle, compte):
+        """Retire un compte de la somme"""
+        reste = self._totaux[cle] - compte
+        if reste > 0:
+            self._totaux[cle] = reste
+        else:
+            del self._totaux[cle]
+
+    def _avancer(self, jour):
+        """Fait glisser la fenêtre jusqu'au jour donné"""
+        self._jour = jour
+        limite = jour - self._jours
+        for ancien in [j for j in self._seaux if j <= limite]:
+            for cle, compte in self._seaux.pop(ancien).items():
+                self._retirer(cle, compte)
+
+    def comptes(self, jour):
+        """
+        Retourne les comptes de la fenêtre finissant au jour donné, sans
+        faire glisser la fenêtre (une date de référence future, comme celle
+        d'une HorlogeFixe, ne doit pas effacer les jours suivis)
+        """
+        if self._jour is None or jour == self._jour:
+            return self._totaux
+        if jour > self._jour:
+            # Date postérieure : les seaux qui sortiraient de la fenêtre sont
+            # retirés d'une copie de la somme
+            sortis = [seau for j, seau in self._seaux.items() if j <= jour - self._jours]
+            if not sortis:
+                return self._totaux
+            comptes = Counter(self._totaux)
+            for seau in sortis:
+                comptes.subtract(dict(seau.items()))
+            return +comptes
+        # Date antérieure au dernier jour vu : somme des seaux concernés
+        comptes = Counter()
+        for j, seau in self._seaux.items():
+            if jour - self._jours < j <= jour:
+                comptes.update(dict(seau.items()))
+        return comptes
+
+    def plus_frequents(self, nombre, jour):
+        """
+        Retourne les `nombre` éléments les plus comptés de la fenêtre
+        Returns:
+            list: couples (élément, compte), du plus au moins compté
+        """
+        return heapq.nlargest(nombre, self.comptes(jour).items(), key=itemgetter(1))
+
+
+class Circulation:
+    """Statistiques de circulation sur 30 et 365 jours"""
+
+    FENETRES = (30, 365)
+
+    # Dimensions suivies : livres, adhérents (par identifiant), auteurs,
+    # et mouvements ('emprunts' et 'retours')
+    DIMENSIONS = ('livres', 'adherents', 'auteurs', 'mouvements')
+
+    def __init__(self, capacite=256):
+        """
+        Initialise des statistiques vides
+        Args:
+            capacite: éléments gardés par jour et par dimension (mémoire bornée)
+        """
+        self._fenetres = {jours: {dimension: FenetreGlissante(jours, capacite)
+                                  for dimension in self.DIMENSIONS}
+                          for jours in self.FENETRES}
+
+    def enregistrer_emprunt(self, emprunt):
+        """
+        Compte un emprunt à sa date d'emprunt
+        """
+        jour = emprunt.date_emprunt.toordinal()
+        livre = emprunt.livre
+        identifiant = emprunt.adherent.get_identifiant()
+        for fenetre in self._fenetres.values():
+            fenetre['livres'].ajouter(jour, livre)
+            fenetre['adherents'].ajouter(jour, identifiant)
+            fenetre['auteurs'].ajouter(jour, livre.auteur)
+            fenetre['mouvements'].ajouter(jour, 'emprunts')
+
+    def enregistrer_retour(self, date_retour):
+        """
+        Compte un retour à sa date
+        """
+        jour = date_retour.toordinal()
+        for fenetre in self._fenetres.values():
+            fenetre['mouvements'].ajouter(jour, 'retours')
+
+    def _fenetre(self, jours, dimension):
+        """Retourne la fenêtre d'une durée et d'une dimension"""
+        if jours not in self._fenetres:
+            raise ValueError(f"Fenêtre de {jours} jours non suivie (choix: {self.FENETRES})")
+        return self._fenetres[jours][dimension]
+
+    def classement(self, dimension, jours, nombre, date_reference):
+        """
+        Retourne les éléments les plus fréquents d'une dimension
+        Returns:
+            list: couples (élément, nombre d'emprunts)
+        """
+        return self._fenetre(jours, dimension).plus_frequents(nombre, date_reference.toordinal())
+
+    def mouvements(self, jours, date_reference):
+        """
+        Retourne le nombre d'emprunts et de retours de la fenêtre
+        """
+        comptes = self._fenetre(jours, 'mouvements').comptes(date_reference.toordinal())
+        return {'emprunts': comptes.get('emprunts', 0), 'retours': comptes.get('retours', 0)}
@@ -67,63 +67,127 @@ class Volume(Document):
 
 
 class Livre(Volume):
-    """Classe représentant un livre (peut être emprunté)"""
+    """
+    Classe représentant un livre (peut être emprunté).
 
-    def __init__(self, titre, auteur, disponible=True):
+    Un livre est une œuvre possédée en un ou plusieurs exemplaires
+    interchangeables : un emprunt prend n'importe quel exemplaire libre.
+    """
+
+    def __init__(self, titre, auteur, disponible=True, exemplaires=1, disponibles=None):
         """
         Initialise un livre
+        Args:
+            exemplaires: nombre d'exemplaires possédés
+            disponibles: nombre d'exemplaires en rayon (tous si disponible,
+                         aucun sinon, par défaut)
         """
         super().__init__(titre, auteur)
-        self._disponible = disponible
+        self._exemplaires = exemplaires
+        if disponibles is None:
+            disponibles = exemplaires if disponible else 0
+        self._disponibles = disponibles
 
     @property
     def disponible(self):
-        """Retourne si le livre est disponible"""
-        return self._disponible
+        """Retourne si au moins un exemplaire est disponible"""
+        return self._disponibles > 0
 
     @disponible.setter
     def disponible(self, value):
-        """Modifie la disponibilité du livre"""
-        self._disponible = value
+        """Rend tous les exemplaires disponibles, ou aucun"""
+        self._disponibles = self._exemplaires if value else 0
+
+    @property
+    def exemplaires(self):
+        """Retourne le nombre d'exemplaires possédés"""
+        return self._exemplaires
+
+    @property
+    def disponibles(self):
+        """Retourne le nombre d'exemplaires disponibles"""
+        return self._disponibles
+
+    def ajouter_exemplaires(self, nombre, disponibles=None):
+        """
+        Ajoute des exemplaires au livre
+        Args:
+            nombre: exemplaires ajoutés (au moins 1)
+            disponibles: combien d'entre eux sont en rayon (tous par défaut)
+        Returns:
+            bool: False si les nombres sont invalides
+        """
+        if disponibles is None:
+            disponibles = nombre
+        if nombre < 1 or not 0 <= disponibles <= nombre:
+            return False
+        self._exemplaires += nombre
+        self._disponibles += disponibles
+        return True
+
+    def recompter_disponibles(self, en_cours):
+        """
+        Recalcule les exemplaires en rayon à partir du nombre d'emprunts en cours
+        """
+        self._disponibles = max(self._exemplaires - en_cours, 0)
+
+    def retirer_exemplaires(self, nombre):
+        """
+        Retire des exemplaires disponibles (les exemplaires prêtés restent)
+        """
+        if nombre <= 0 or nombre > self._disponibles or nombre >= self._exemplaires:
+            return False
+        self._exemplaires -= nombre
+        self._disponibles -= nombre
+        return True
 
     def emprunter(self):
         """
-        Marque le livre comme emprunté
+        Prête un exemplaire disponible
         """
-        if self._disponible:
-            self._disponible = False
+        if self._disponibles > 0:
+            self._disponibles -= 1
             return True
         return False
 
     def rendre(self):
-        """Marque le livre comme rendu"""
-        self._disponible = True
+        """Remet un exemplaire en rayon"""
+        if self._disponibles < self._exemplaires:
+            self._disponibles += 1
 
     def empruntable(self):
         """
-        Vérifie si le livre peut être emprunté
+        Vérifie si un exemplaire peut être emprunté
         """
-        return self._disponible
+        return self._disponibles > 0
 
     def to_csv(self):
         """
         Convertit le livre en format CSV
         """
-        return f"Livre,{self._titre},{self._auteur},{self._disponible}"
+        return (f"Livre,{self._titre},{self._auteur},{self.disponible},"
+                f"{self._exemplaires},{self._disponibles}")
 
     @staticmethod
     def from_csv(csv_line):
         """
-        Crée un livre à partir d'une ligne CSV
+        Crée un livre à partir d'une ligne CSV (un seul exemplaire dans
+        l'ancien format, sans les compteurs)
         """
         parts = csv_line.strip().split(',')
+        if len(parts) >= 6:
+            return Livre(parts[1], parts[2], exemplaires=int(parts[4]),
+                         disponibles=int(parts[5]))
         if len(parts) >= 4:
             disponible = parts[3].lower() == 'true'
             return Livre(parts[1], parts[2], disponible)
         return None
 
     def __str__(self):
-        statut = "Disponible" if self._disponible else "Emprunté"
+        if self._exemplaires > 1:
+            statut = f"{self._disponibles}/{self._exemplaires} exemplaires disponibles"
+        else:
+            statut = "Disponible" if self.disponible else "Emprunté"
         return f"Livre: {self._titre} par {self._auteur} ({statut})"
 
 
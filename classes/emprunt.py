@@ -66,26 +66,35 @@ class Emprunt:
         """
         return self._date_emprunt + timedelta(days=self.DUREE_EMPRUNT_JOURS)
 
-    def est_en_retard(self):
+    def est_en_retard(self, date_reference=None):
         """
         Vérifie si l'emprunt est en retard
+        Args:
+            date_reference: date d'évaluation (aujourd'hui par défaut)
         """
         if self._date_retour:
             return False  # Déjà retourné
 
+        if date_reference is None:
+            date_reference = date.today()
+
         date_limite = self.calculer_date_retour_prevue()
-        return date.today() > date_limite
+        return date_reference > date_limite
 
-    def jours_retard(self):
+    def jours_retard(self, date_reference=None):
         """
         Calcule le nombre de jours de retard
+        Args:
+            date_reference: date d'évaluation (aujourd'hui par défaut)
         """
-        if not self.est_en_retard():
-            return 0
+        if self._date_retour:
+            return 0  # Déjà retourné
 
-        date_limite = self.calculer_date_retour_prevue()
-        delta = date.today() - date_limite
-        return delta.days
+        if date_reference is None:
+            date_reference = date.today()
+
+        delta = date_reference - self.calculer_date_retour_prevue()
+        return max(delta.days, 0)
 
     def est_actif(self):
         """
@@ -0,0 +1,173 @@
+"""
+Module contenant les événements publiés par la bibliothèque et leur bus
+de diffusion
+"""
+
+import threading
+from contextlib import contextmanager
+
+
+class Evenement:
+    """Classe de base des modifications de la bibliothèque"""
+
+    def __init__(self, objet, ligne):
+        """
+        Initialise un événement
+        Args:
+            objet: adhérent, document ou emprunt concerné
+            ligne: position de l'objet dans la liste concernée
+                   (avant suppression pour un retrait)
+        """
+        self._objet = objet
+        self._ligne = ligne
+
+    @property
+    def objet(self):
+        """Retourne l'objet concerné"""
+        return self._objet
+
+    @property
+    def ligne(self):
+        """Retourne la position de l'objet dans sa liste"""
+        return self._ligne
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self._objet}, ligne={self._ligne})"
+
+
+class EvenementAdherent(Evenement):
+    """Modification de la liste des adhérents"""
+
+
+class AdherentAjoute(EvenementAdherent):
+    """Un adhérent a été inscrit"""
+
+
+class AdherentEnleve(EvenementAdherent):
+    """Un adhérent a été désinscrit"""
+
+
+class EvenementDocument(Evenement):
+    """Modification du catalogue"""
+
+
+class DocumentAjoute(EvenementDocument):
+    """Un document a été ajouté"""
+
+
+class DocumentEnleve(EvenementDocument):
+    """Un document a été retiré"""
+
+
+class DocumentModifie(EvenementDocument):
+    """L'état d'un document a changé (livre emprunté ou rendu)"""
+
+
+class EvenementEmprunt(Evenement):
+    """Modification des emprunts"""
+
+
+class EmpruntCree(EvenementEmprunt):
+    """Un emprunt a été créé"""
+
+
+class EmpruntRetourne(EvenementEmprunt):
+    """Un livre a été retourné (ligne : None, pour ne pas chercher l'emprunt dans l'historique)"""
+
+
+class EvenementReservation(Evenement):
+    """Modification des réservations (ligne : None)"""
+
+
+class ReservationCreee(EvenementReservation):
+    """Un adhérent a réservé un livre"""
+
+
+class ReservationPrete(EvenementReservation):
+    """Un livre rendu a été mis de côté pour le premier adhérent de la file"""
+
+
+class ReservationTerminee(EvenementReservation):
+    """Une réservation a été annulée ou honorée par un emprunt"""
+
+
+class BusEvenements:
+    """
+    Diffuse les événements aux abonnés, un par un ou par lots.
+
+    Dans un bloc `with bus.lot():` les événements publiés par le thread
+    courant sont retenus et distribués ensemble à la sortie du bloc : un
+    abonné « par lot » les reçoit en une seule liste.
+    """
+
+    def __init__(self):
+        """Initialise un bus sans abonné"""
+        self._abonnements = []          # [(rappel, types, par_lot)]
+        self._local = threading.local()
+
+    def abonner(self, rappel, types=None, par_lot=False):
+        """
+        Abonne une fonction aux événements
+        Args:
+            rappel: appelée avec chaque événement, ou avec une liste
+                    d'événements si par_lot est vrai
+            types: classe ou tuple de classes d'événements à recevoir (tous par défaut)
+            par_lot: recevoir les événements d'un lot en un seul appel
+        """
+        self.desabonner(rappel)
+        self._abonnements = self._abonnements + [(rappel, types or Evenement, par_lot)]
+
+    def desabonner(self, rappel):
+        """
+        Désabonne une fonction
+        """
+        self._abonnements = [a for a in self._abonnements if a[0] != rappel]
+
+    def a_des_abonnes(self):
+        """
+        Indique si au moins une fonction est abonnée
+        """
+        return bool(self._abonnements)
+
+    def publier(self, evenement):
+        """
+        Publie un événement (retenu jusqu'à la fin du lot en cours, s'il y en a un)
+        """
+        if not self._abonnements:
+            return
+        tampon = getattr(self._local, 'tampon', None)
+        if tampon is not None:
+            tampon.append(evenement)
+        else:
+            self._distribuer([evenement])
+
+    @contextmanager
+    def lot(self):
+        """
+        Regroupe les événements publiés dans le bloc (les lots imbriqués
+        sont fusionnés dans le lot le plus externe)
+        """
+        if getattr(self._local, 'tampon', None) is not None:
+            yield
+            return
+        self._local.tampon = []
+        try:
+            yield
+        finally:
+            evenements, self._local.tampon = self._local.tampon, None
+            if evenements:
+                self._distribuer(evenements)
+
+    def _distribuer(self, evenements):
+        """
+        Remet des événements aux abonnés intéressés
+        """
+        for rappel, types, par_lot in self._abonnements:
+            choisis = [e for e in evenements if isinstance(e, types)]
+            if not choisis:
+                continue
+            if par_lot:
+                rappel(choisis)
+            else:
+                for evenement in choisis:
+                    rappel(evenement)
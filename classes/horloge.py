@@ -0,0 +1,47 @@
+"""
+Module contenant les horloges utilisées pour évaluer les emprunts
+"""
+
+from datetime import date
+
+
+class Horloge:
+    """Horloge système : fournit la date du jour"""
+
+    def aujourd_hui(self):
+        """
+        Retourne la date de référence courante
+        """
+        return date.today()
+
+    def __str__(self):
+        return "Horloge système"
+
+
+class HorlogeFixe(Horloge):
+    """Horloge figée sur une date donnée (rapports « à la date du », tests)"""
+
+    def __init__(self, date_reference):
+        """
+        Initialise une horloge figée
+        """
+        self._date_reference = date_reference
+
+    @property
+    def date_reference(self):
+        """Retourne la date de référence"""
+        return self._date_reference
+
+    @date_reference.setter
+    def date_reference(self, value):
+        """Modifie la date de référence"""
+        self._date_reference = value
+
+    def aujourd_hui(self):
+        """
+        Retourne la date de référence figée
+        """
+        return self._date_reference
+
+    def __str__(self):
+        return f"Horloge figée au {self._date_reference.strftime('%d/%m/%Y')}"
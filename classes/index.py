@@ -0,0 +1,112 @@
+"""
+Module contenant les index de recherche de la bibliothèque
+"""
+
+import bisect
+import unicodedata
+
+
+class IndexPrefixe:
+    """
+    Index trié de clés textuelles pour la recherche par préfixe.
+
+    Un objet peut être indexé sous plusieurs clés (ex: « prénom nom » et
+    « nom prénom »). Les ajouts sont mis en attente et triés à la recherche
+    suivante, ce qui rend le chargement initial linéaire ; les retraits sont
+    paresseux et l'index est compacté quand les entrées mortes dominent.
+    """
+
+    # Au-delà, les ajouts en attente sont fusionnés par un tri plutôt qu'insérés un à un
+    SEUIL_TRI = 64
+
+    def __init__(self):
+        """Initialise un index vide"""
+        self._entrees = []      # [(clé normalisée, numéro)] trié
+        self._en_attente = []   # entrées pas encore triées
+        self._objets = {}       # numéro -> objet (absent si retiré)
+        self._numeros = {}      # id(objet) -> [numéros]
+        self._compteur = 0
+        self._morts = 0
+
+    @staticmethod
+    def normaliser(texte):
+        """
+        Normalise un texte pour la comparaison (casse et accents ignorés)
+        """
+        texte = texte.strip().casefold()
+        if texte.isascii():
+            return texte
+        decompose = unicodedata.normalize('NFKD', texte)
+        return ''.join(c for c in decompose if not unicodedata.combining(c))
+
+    def ajouter(self, objet, *textes):
+        """
+        Indexe un objet sous un ou plusieurs textes
+        """
+        numeros = self._numeros.setdefault(id(objet), [])
+        for texte in textes:
+            self._compteur += 1
+            self._objets[self._compteur] = objet
+            numeros.append(self._compteur)
+            self._en_attente.append((self.normaliser(texte), self._compteur))
+
+    def retirer(self, objet):
+        """
+        Retire un objet de l'index
+        Returns:
+            bool: True si l'objet était indexé
+        """
+        numeros = self._numeros.pop(id(objet), None)
+        if numeros is None:
+            return False
+        for numero in numeros:
+            del self._objets[numero]
+        self._morts += len(numeros)
+        return True
+
+    def __contains__(self, objet):
+        return id(objet) in self._numeros
+
+    def __len__(self):
+        return len(self._numeros)
+
+    def _preparer(self):
+        """
+        Intègre les ajouts en attente et compacte les entrées retirées
+        """
+        if self._morts and self._morts * 2 > len(self._entrees) + len(self._en_attente):
+            objets = self._objets
+            self._entrees = [e for e in self._entrees if e[1] in objets]
+            self._en_attente = [e for e in self._en_attente if e[1] in objets]
+            self._morts = 0
+
+        if not self._en_attente:
+            return
+        if len(self._en_attente) < self.SEUIL_TRI:
+            for entree in self._en_attente:
+                bisect.insort(self._entrees, entree)
+        else:
+            self._entrees.extend(self._en_attente)
+            self._entrees.sort()
+        self._en_attente = []
+
+    def rechercher(self, prefixe, limite=20):
+        """
+        Retourne les objets dont une clé commence par le préfixe, dans l'ordre
+        alphabétique des clés (sans doublon)
+        """
+        self._preparer()
+        prefixe = self.normaliser(prefixe)
+        resultats = []
+        vus = set()
+        position = bisect.bisect_left(self._entrees, (prefixe,))
+        while position < len(self._entrees) and len(resultats) < limite:
+            cle, numero = self._entrees[position]
+            if not cle.startswith(prefixe):
+                break
+            objet = self._objets.get(numero)
+            if objet is not None and id(objet) not in vus:
+                vus.add(id(objet))
+                resultats.append(objet)
+            position += 1
+        return resultats
@@ -0,0 +1,217 @@
+"""
+Module contenant la classe Instantane (vue figée d'une bibliothèque)
+"""
+
+import copy
+import threading
+
+from classes.series import SeriesEmprunts
+
+
+class Instantane:
+    """
+    Vue en lecture seule de la bibliothèque à un instant donné.
+
+    Les listes sont partagées avec la bibliothèque, qui les copie avant sa
+    prochaine modification (copie sur écriture). Les objets modifiés par la
+    bibliothèque après la prise de l'instantané (livre emprunté, emprunt
+    retourné...) sont copiés juste avant leur modification ; tous les autres
+    restent partagés.
+    """
+
+    def __init__(self, bibliotheque, documents, adherents, emprunts, date_reference,
+                 reservations=(), series=None):
+        """
+        Initialise un instantané (utiliser Bibliotheque.instantane())
+        Args:
+            reservations: liste des réservations, copiée à la prise de l'instantané
+            series: agrégats chronologiques (partagés, copiés par la bibliothèque
+                    avant sa prochaine modification), None s'ils sont à reconstruire
+        """
+        self._bibliotheque = bibliotheque
+        self._documents = documents
+        self._adherents = adherents
+        self._emprunts = emprunts
+        self._reservations = list(reservations)
+        self._series = series
+        self._date_reference = date_reference
+        self._etat_fichiers = bibliotheque.etat_fichiers
+        self._copies = {}
+        self._verrou = threading.Lock()
+
+    @property
+    def date_reference(self):
+        """Retourne la date de la prise de l'instantané"""
+        return self._date_reference
+
+    @property
+    def etat_fichiers(self):
+        """Retourne l'état des fichiers de la bibliothèque d'origine"""
+        return self._etat_fichiers
+
+    def aujourd_hui(self):
+        """
+        Retourne la date de référence de l'instantané
+        """
+        return self._date_reference
+
+    def _preserver(self, objet):
+        """
+        Conserve l'état courant d'un objet avant sa modification
+        """
+        with self._verrou:
+            if id(objet) not in self._copies:
+                # L'original est gardé pour que son id ne soit pas réutilisé
+                self._copies[id(objet)] = (objet, copy.copy(objet))
+
+    def _figer(self, objets):
+        """
+        Remplace les objets modifiés depuis l'instantané par leur copie
+        """
+        if not self._copies:
+            return list(objets)
+        copies = self._copies
+        return [copies[id(o)][1] if id(o) in copies else o for o in objets]
+
+    def _lignes_csv(self, objets):
+        """
+        Génère les lignes CSV des objets dans leur état figé.
+        Sûr depuis un autre thread : chaque ligne est produite sous verrou,
+        donc avant ou après la préservation de l'objet, jamais pendant.
+        """
+        copies = self._copies
+        for objet in objets:
+            with self._verrou:
+                yield copies.get(id(objet), (None, objet))[1].to_csv()
+
+    def lignes_csv_adherents(self):
+        """Génère les lignes CSV des adhérents"""
+        return self._lignes_csv(self._adherents)
+
+    def lignes_csv_documents(self):
+        """Génère les lignes CSV des documents"""
+        return self._lignes_csv(self._documents)
+
+    def lignes_csv_emprunts(self):
+        """Génère les lignes CSV des emprunts"""
+        return self._lignes_csv(self._emprunts)
+
+    def lignes_csv_reservations(self):
+        """Génère les lignes CSV des réservations"""
+        return self._lignes_csv(self._reservations)
+
+    def lignes_csv_agregats(self):
+        """
+        Retourne les lignes CSV des agrégats chronologiques, reconstruits
+        depuis les emprunts figés s'il le faut (dans le thread appelant,
+        celui de la sauvegarde)
+        """
+        series = self._series
+        if series is None:
+            series = SeriesEmprunts.depuis_emprunts(self.get_emprunts())
+        return list(series.lignes_csv())
+
+    def fermer(self):
+        """
+        Libère l'instantané (la bibliothèque cesse de le tenir à jour)
+        À appeler depuis le thread qui modifie la bibliothèque.
+        """
+        if self._bibliotheque is not None:
+            self._bibliotheque._liberer_instantane(self)
+            self._bibliotheque = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.fermer()
+        return False
+
+    # ========== Lecture ==========
+
+    def get_adherents(self):
+        """
+        Retourne la liste des adhérents
+        """
+        return self._figer(self._adherents)
+
+    def get_documents(self):
+        """
+        Retourne la liste des documents
+        """
+        return self._figer(self._documents)
+
+    def get_emprunts(self):
+        """
+        Retourne la liste de tous les emprunts
+        """
+        return self._figer(self._emprunts)
+
+    def compter_emprunts(self):
+        """
+        Retourne le nombre d'emprunts
+        """
+        return len(self._emprunts)
+
+    def get_reservations(self):
+        """
+        Retourne les réservations (prêtes, puis files d'attente)
+        """
+        return self._figer(self._reservations)
+
+    def get_livres(self):
+        """
+        Retourne uniquement les livres
+        """
+        from classes.document import Livre
+        return [doc for doc in self.get_documents() if isinstance(doc, Livre)]
+
+    def get_livres_disponibles(self):
+        """
+        Retourne les livres disponibles pour l'emprunt
+        """
+        return [livre for livre in self.get_livres() if livre.disponible]
+
+    def get_emprunts_actifs(self):
+        """
+        Retourne la liste des emprunts actifs
+        """
+        return [e for e in self.get_emprunts() if e.est_actif()]
+
+    def get_emprunts_en_retard(self, date_reference=None):
+        """
+        Retourne les emprunts en retard
+        Args:
+            date_reference: date d'évaluation (date de l'instantané par défaut)
+        """
+        if date_reference is None:
+            date_reference = self._date_reference
+        return [e for e in self.get_emprunts() if e.est_en_retard(date_reference)]
+
+    def get_statistiques(self, date_reference=None):
+        """
+        Retourne des statistiques sur la bibliothèque à la date de l'instantané
+        """
+        livres = self.get_livres()
+        nb_disponibles = sum(1 for livre in livres if livre.disponible)
+        exemplaires = sum(livre.exemplaires for livre in livres)
+        exemplaires_disponibles = sum(livre.disponibles for livre in livres)
+        emprunts_actifs = self.get_emprunts_actifs()
+
+        return {
+            'total_documents': len(self._documents),
+            'total_livres': len(livres),
+            'livres_disponibles': nb_disponibles,
+            'livres_empruntes': len(livres) - nb_disponibles,
+            'total_exemplaires': exemplaires,
+            'exemplaires_disponibles': exemplaires_disponibles,
+            'total_adherents': len(self._adherents),
+            'emprunts_actifs': len(emprunts_actifs),
+            'emprunts_retard': len(self.get_emprunts_en_retard(date_reference)),
+            'total_emprunts': len(self._emprunts)
+        }
+
+    def __str__(self):
+        return (f"Instantané du {self._date_reference.strftime('%d/%m/%Y')} - "
+                f"{len(self._documents)} documents, {len(self._adherents)} adhérents, "
+                f"{len(self._emprunts)} emprunts")
@@ -0,0 +1,121 @@
+"""
+Module des recommandations « les adhérents qui ont emprunté ce livre ont
+aussi emprunté » : un index creux de co-emprunts, construit en un seul
+passage sur l'historique et tenu à jour à chaque nouvel emprunt
+"""
+
+import heapq
+from collections import Counter
+from operator import itemgetter
+
+
+class IndexRecommandations:
+    """
+    Pour chaque couple de livres, nombre d'adhérents ayant emprunté les deux.
+
+    Seuls les couples effectivement empruntés ensemble sont stockés. Un
+    adhérent compte une fois par couple, quel que soit le nombre de ses
+    emprunts du même livre. Les livres sont désignés par leur titre, ce qui
+    permet de construire l'index directement depuis Emprunts.txt.
+    """
+
+    def __init__(self, historique_max=50):
+        """
+        Initialise un index vide
+        Args:
+            historique_max: livres distincts retenus par adhérent (les plus
+                            récents) ; borne le coût d'un emprunt pour les
+                            très gros lecteurs
+        """
+        self._historique_max = historique_max
+        self._livres_par_adherent = {}  # identifiant -> {titre: None}, du plus ancien au plus récent
+        self._co_emprunts = {}          # titre -> {autre titre: nombre d'adhérents}
+
+    def ajouter(self, identifiant, titre):
+        """
+        Compte l'emprunt d'un livre par un adhérent
+        """
+        livres = self._livres_par_adherent.get(identifiant)
+        if livres is None:
+            livres = self._livres_par_adherent[identifiant] = {}
+        elif titre in livres:
+            return
+        co_emprunts = self._co_emprunts
+        voisins = co_emprunts.get(titre)
+        if voisins is None:
+            voisins = co_emprunts[titre] = {}
+        for autre in livres:
+            voisins[autre] = voisins.get(autre, 0) + 1
+            autres = co_emprunts[autre]
+            autres[titre] = autres.get(titre, 0) + 1
+        livres[titre] = None
+        if len(livres) > self._historique_max:
+            # Le plus ancien sort de l'historique (un nouvel emprunt de ce
+            # livre recompterait ses couples : approximation assumée)
+            del livres[next(iter(livres))]
+
+    def ajouter_emprunt(self, emprunt):
+        """
+        Compte un objet Emprunt
+        """
+        self.ajouter(emprunt.adherent.get_identifiant(), emprunt.livre.titre)
+
+    def recommander(self, titre, nombre=5, exclure=()):
+        """
+        Retourne les livres le plus souvent empruntés avec un livre
+        Args:
+            exclure: titres à écarter (par exemple, ceux déjà lus)
+        Returns:
+            list: couples (titre, nombre d'adhérents), du plus au moins fréquent
+        """
+        voisins = self._co_emprunts.get(titre)
+        if not voisins:
+            return []
+        if exclure:
+            candidats = ((autre, n) for autre, n in voisins.items() if autre not in exclure)
+        else:
+            candidats = voisins.items()
+        return heapq.nlargest(nombre, candidats, key=itemgetter(1))
+
+    def livres_adherent(self, identifiant):
+        """Retourne les titres retenus pour un adhérent"""
+        return self._livres_par_adherent.get(identifiant, {}).keys()
+
+    def compter_couples(self):
+        """Retourne le nombre de couples de livres stockés"""
+        return sum(len(voisins) for voisins in self._co_emprunts.values()) // 2
+
+    @staticmethod
+    def depuis_emprunts(emprunts, historique_max=50):
+        """
+        Construit l'index à partir d'objets Emprunt, dans l'ordre chronologique,
+        en un seul passage (même résultat qu'un ajouter_emprunt par emprunt)
+        """
+        index = IndexRecommandations(historique_max)
+        livres_par_adherent = index._livres_par_adherent
+        # Pour chaque livre, les livres empruntés avant lui par ses lecteurs ;
+        # la symétrie n'est rétablie qu'à la fin, une fois par couple
+        anterieurs = {}
+        for emprunt in emprunts:
+            identifiant, titre = emprunt.adherent.get_identifiant(), emprunt.livre.titre
+            livres = livres_par_adherent.get(identifiant)
+            if livres is None:
+                livres = livres_par_adherent[identifiant] = {}
+            elif titre in livres:
+                continue
+            compteur = anterieurs.get(titre)
+            if compteur is None:
+                compteur = anterieurs[titre] = Counter()
+            compteur.update(livres.keys())
+            livres[titre] = None
+            if len(livres) > historique_max:
+                del livres[next(iter(livres))]
+
+        co_emprunts = index._co_emprunts
+        for titre, compteur in anterieurs.items():
+            co_emprunts[titre] = dict(compteur)
+        for titre, compteur in anterieurs.items():
+            for autre, nombre in compteur.items():
+                voisins = co_emprunts[autre]
+                voisins[titre] = voisins.get(titre, 0) + nombre
+        return index
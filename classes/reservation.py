@@ -0,0 +1,85 @@
+"""
+Module contenant la classe Reservation
+"""
+
+from datetime import date
+
+
+class Reservation:
+    """Classe représentant la réservation d'un livre emprunté par un adhérent"""
+
+    def __init__(self, adherent, livre, date_reservation=None, date_mise_de_cote=None):
+        """
+        Initialise une réservation
+        Args:
+            date_mise_de_cote: date à laquelle le livre rendu a été mis de côté
+                               pour l'adhérent (None tant qu'il est en file d'attente)
+        """
+        self._adherent = adherent
+        self._livre = livre
+        self._date_reservation = date_reservation if date_reservation else date.today()
+        self._date_mise_de_cote = date_mise_de_cote
+
+    @property
+    def adherent(self):
+        """Retourne l'adhérent de la réservation"""
+        return self._adherent
+
+    @property
+    def livre(self):
+        """Retourne le livre réservé"""
+        return self._livre
+
+    @property
+    def date_reservation(self):
+        """Retourne la date de réservation"""
+        return self._date_reservation
+
+    @property
+    def date_mise_de_cote(self):
+        """Retourne la date de mise de côté du livre (None si en attente)"""
+        return self._date_mise_de_cote
+
+    @date_mise_de_cote.setter
+    def date_mise_de_cote(self, value):
+        """Modifie la date de mise de côté"""
+        self._date_mise_de_cote = value
+
+    def est_prete(self):
+        """
+        Vérifie si le livre attend l'adhérent (mis de côté à son retour)
+        """
+        return self._date_mise_de_cote is not None
+
+    def to_csv(self):
+        """
+        Convertit la réservation en format CSV
+        """
+        adherent_id = self._adherent.get_identifiant()
+        date_res_str = self._date_reservation.strftime('%Y-%m-%d')
+        date_cote_str = self._date_mise_de_cote.strftime('%Y-%m-%d') if self._date_mise_de_cote else "None"
+        return f"{adherent_id},{self._livre.titre},{date_res_str},{date_cote_str}"
+
+    @staticmethod
+    def from_csv(csv_line, adherents_dict, livres_dict):
+        """
+        Crée une réservation à partir d'une ligne CSV
+        """
+        parts = csv_line.strip().split(',')
+        if len(parts) >= 4:
+            adherent = adherents_dict.get(parts[0])
+            livre = livres_dict.get(parts[1])
+
+            if adherent and livre:
+                date_reservation = date.fromisoformat(parts[2])
+                date_mise_de_cote = None if parts[3] == "None" else date.fromisoformat(parts[3])
+                return Reservation(adherent, livre, date_reservation, date_mise_de_cote)
+
+        return None
+
+    def __str__(self):
+        if self.est_prete():
+            etat = f"à retirer depuis le {self._date_mise_de_cote.strftime('%d/%m/%Y')}"
+        else:
+            etat = f"en attente depuis le {self._date_reservation.strftime('%d/%m/%Y')}"
+        return f"Réservation: {self._livre.titre} pour {self._adherent.prenom} {self._adherent.nom} ({etat})"
@@ -0,0 +1,203 @@
+"""
+Module des séries chronologiques d'emprunts : nombre d'emprunts, de retours
+et de passages en retard par jour et par mois, tenus à jour à chaque
+emprunt et à chaque retour (table d'agrégats matérialisée)
+"""
+
+from datetime import date, timedelta
+
+from classes.emprunt import Emprunt
+
+
+# Colonnes d'un seau
+EMPRUNTS, RETOURS, RETARDS = range(3)
+
+
+class SeriesEmprunts:
+    """
+    Agrégats journaliers et mensuels de l'historique des emprunts.
+
+    Un emprunt passe en retard le lendemain de sa date de retour prévue s'il
+    n'a pas été rendu avant. Ce passage est compté dès l'emprunt, à sa date
+    future, puis décompté si le livre revient à temps : les seaux postérieurs
+    à la date du jour contiennent donc des retards prévus, que les requêtes
+    ignorent.
+    """
+
+    PAS_JOUR = "jour"
+    PAS_MOIS = "mois"
+
+    def __init__(self):
+        """Initialise des agrégats vides"""
+        self._jours = {}    # jour ordinal -> [emprunts, retours, retards]
+        self._mois = {}     # (année, mois) -> [emprunts, retours, retards]
+
+    def _compter(self, jour, colonne, nombre=1):
+        """Ajoute un nombre à une colonne du seau d'un jour et de son mois"""
+        seau = self._jours.get(jour)
+        if seau is None:
+            seau = self._jours[jour] = [0, 0, 0]
+        seau[colonne] += nombre
+        if not any(seau):
+            del self._jours[jour]
+        d = date.fromordinal(jour)
+        cle = (d.year, d.month)
+        seau = self._mois.get(cle)
+        if seau is None:
+            seau = self._mois[cle] = [0, 0, 0]
+        seau[colonne] += nombre
+        if not any(seau):
+            del self._mois[cle]
+
+    @staticmethod
+    def _jour_retard(date_emprunt):
+        """Retourne le jour (ordinal) où un emprunt non rendu passe en retard"""
+        return date_emprunt.toordinal() + Emprunt.DUREE_EMPRUNT_JOURS + 1
+
+    def ajouter(self, date_emprunt, date_retour=None):
+        """
+        Compte un emprunt (et son retour s'il est déjà rendu)
+        """
+        self._compter(date_emprunt.toordinal(), EMPRUNTS)
+        jour_retard = self._jour_retard(date_emprunt)
+        if date_retour is None or date_retour.toordinal() >= jour_retard:
+            self._compter(jour_retard, RETARDS)
+        if date_retour is not None:
+            self._compter(date_retour.toordinal(), RETOURS)
+
+    def enregistrer_emprunt(self, emprunt):
+        """
+        Compte un objet Emprunt
+        """
+        self.ajouter(emprunt.date_emprunt, emprunt.date_retour)
+
+    def enregistrer_retour(self, emprunt):
+        """
+        Compte le retour d'un emprunt compté lorsqu'il était actif
+        """
+        jour_retour = emprunt.date_retour.toordinal()
+        self._compter(jour_retour, RETOURS)
+        jour_retard = self._jour_retard(emprunt.date_emprunt)
+        if jour_retour < jour_retard:
+            self._compter(jour_retard, RETARDS, -1)     # rendu à temps
+
+    # ========== Consultation ==========
+
+    def _seau_jours(self, debut, fin, date_reference):
+        """Somme les seaux journaliers de debut à fin (ordinaux inclus)"""
+        total = [0, 0, 0]
+        jours = self._jours
+        if fin - debut + 1 > len(jours):
+            cles = (j for j in jours if debut <= j <= fin)
+        else:
+            cles = (j for j in range(debut, fin + 1) if j in jours)
+        for jour in cles:
+            seau = jours[jour]
+            total[EMPRUNTS] += seau[EMPRUNTS]
+            total[RETOURS] += seau[RETOURS]
+            if jour <= date_reference:
+                total[RETARDS] += seau[RETARDS]
+        return total
+
+    def periode(self, debut, fin, pas=PAS_JOUR, date_reference=None):
+        """
+        Retourne les agrégats d'une période, seau par seau (seaux vides compris)
+        Args:
+            debut, fin: dates de la période (incluses)
+            pas: PAS_JOUR ou PAS_MOIS
+            date_reference: les retards prévus après cette date sont ignorés
+                            (aujourd'hui par défaut)
+        Returns:
+            list: tuples (début du seau, emprunts, retours, passages en retard)
+        """
+        if date_reference is None:
+            date_reference = date.today()
+        reference = date_reference.toordinal()
+        resultats = []
+        if pas == self.PAS_JOUR:
+            jour = debut
+            while jour <= fin:
+                seau = self._seau_jours(jour.toordinal(), jour.toordinal(), reference)
+                resultats.append((jour, *seau))
+                jour += timedelta(days=1)
+            return resultats
+        if pas != self.PAS_MOIS:
+            raise ValueError(f"Pas inconnu: {pas}")
+
+        annee, mois = debut.year, debut.month
+        while (annee, mois) <= (fin.year, fin.month):
+            premier = date(annee, mois, 1)
+            suivant = date(annee + mois // 12, mois % 12 + 1, 1)
+            dernier = suivant - timedelta(days=1)
+            if premier >= debut and dernier <= fin and dernier.toordinal() <= reference:
+                # Mois entier et révolu : seau mensuel pré-calculé
+                seau = self._mois.get((annee, mois), (0, 0, 0))
+            else:
+                seau = self._seau_jours(max(premier, debut).toordinal(),
+                                        min(dernier, fin).toordinal(), reference)
+            resultats.append((premier, *seau))
+            annee, mois = suivant.year, suivant.month
+        return resultats
+
+    def totaux(self, debut, fin, date_reference=None):
+        """
+        Retourne les totaux d'une période
+        Returns:
+            dict: 'emprunts', 'retours' et 'retards'
+        """
+        seaux = self.periode(debut, fin, self.PAS_MOIS, date_reference)
+        return {'emprunts': sum(s[1] for s in seaux),
+                'retours': sum(s[2] for s in seaux),
+                'retards': sum(s[3] for s in seaux)}
+
+    # ========== Persistance ==========
+
+    def lignes_csv(self):
+        """
+        Génère les lignes CSV des seaux : « jour,AAAA-MM-JJ,e,r,t » puis
+        « mois,AAAA-MM,e,r,t »
+        """
+        for jour in sorted(self._jours):
+            e, r, t = self._jours[jour]
+            yield f"{self.PAS_JOUR},{date.fromordinal(jour).isoformat()},{e},{r},{t}"
+        for (annee, mois) in sorted(self._mois):
+            e, r, t = self._mois[(annee, mois)]
+            yield f"{self.PAS_MOIS},{annee:04d}-{mois:02d},{e},{r},{t}"
+
+    @staticmethod
+    def depuis_lignes(lignes):
+        """
+        Recrée les agrégats à partir de leurs lignes CSV
+        """
+        series = SeriesEmprunts()
+        for ligne in lignes:
+            parts = ligne.strip().split(',')
+            if len(parts) < 5:
+                continue
+            seau = [int(parts[2]), int(parts[3]), int(parts[4])]
+            if parts[0] == SeriesEmprunts.PAS_JOUR:
+                series._jours[date.fromisoformat(parts[1]).toordinal()] = seau
+            elif parts[0] == SeriesEmprunts.PAS_MOIS:
+                annee, mois = parts[1].split('-')
+                series._mois[(int(annee), int(mois))] = seau
+        return series
+
+    @staticmethod
+    def depuis_emprunts(emprunts):
+        """
+        Reconstruit les agrégats à partir d'objets Emprunt (un seul passage)
+        """
+        series = SeriesEmprunts()
+        for emprunt in emprunts:
+            series.enregistrer_emprunt(emprunt)
+        return series
+
+    def copie(self):
+        """
+        Retourne une copie indépendante (proportionnelle au nombre de seaux,
+        pas à celui des emprunts)
+        """
+        series = SeriesEmprunts()
+        series._jours = {jour: list(seau) for jour, seau in self._jours.items()}
+        series._mois = {mois: list(seau) for mois, seau in self._mois.items()}
+        return series
@@ -0,0 +1,7 @@
+"""
+Package de la ligne de commande (mode sans interface graphique)
+"""
+
+from .commandes import executer
+
+__all__ = ['executer']
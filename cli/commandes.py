@@ -0,0 +1,495 @@
+"""
+Mode ligne de commande (sans interface graphique) pour les tâches planifiées
+et les scripts : emprunts, retours, rapports et maintenance des données.
+
+N'importe que les paquets classes et utils : PyQt6 n'est jamais chargé.
+"""
+
+import argparse
+import os
+import sys
+from datetime import date
+
+from classes.adherent import Adherent
+from classes.bibliotheque import Bibliotheque
+from classes.document import Livre, BD, Dictionnaire, Journal
+from classes.horloge import HorlogeFixe
+from classes.series import SeriesEmprunts
+from utils.file_manager import FileManager
+
+
+def _date(texte):
+    """Convertit une date AAAA-MM-JJ pour argparse"""
+    try:
+        return date.fromisoformat(texte)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"date invalide '{texte}' (format AAAA-MM-JJ)")
+
+
+def _erreur(message):
+    """Affiche un message d'erreur et retourne le code de sortie d'échec"""
+    print(f"Erreur: {message}", file=sys.stderr)
+    return 1
+
+
+def _trouver_adherent(bibliotheque, nom, prenom):
+    """Retourne l'adhérent ou None après avoir signalé l'erreur"""
+    adherent = bibliotheque.rechercher_adherent(nom, prenom)
+    if adherent is None:
+        _erreur(f"adhérent {prenom} {nom} introuvable")
+    return adherent
+
+
+def _trouver_livre(bibliotheque, titre):
+    """Retourne le livre ou None après avoir signalé l'erreur"""
+    livre = bibliotheque.rechercher_document(titre)
+    if not isinstance(livre, Livre):
+        _erreur(f"livre '{titre}' introuvable")
+        return None
+    return livre
+
+
+# ========== Commandes ==========
+
+def commande_statistiques(bibliotheque, args):
+    """Affiche les statistiques de la bibliothèque"""
+    stats = bibliotheque.get_statistiques()
+    print(f"Statistiques au {bibliotheque.aujourd_hui().strftime('%d/%m/%Y')}")
+    for cle, valeur in stats.items():
+        print(f"  {cle}: {valeur}")
+    return 0
+
+
+def commande_retards(bibliotheque, args):
+    """Liste les emprunts en retard"""
+    aujourd_hui = bibliotheque.aujourd_hui()
+    retards = bibliotheque.get_emprunts_en_retard(aujourd_hui)
+    for emp in retards:
+        print(f"{emp.livre.titre} - {emp.adherent.prenom} {emp.adherent.nom} "
+              f"({emp.jours_retard(aujourd_hui)} jours de retard)")
+    print(f"{len(retards)} emprunt(s) en retard")
+    return 0
+
+
+def commande_historique(bibliotheque, args):
+    """Affiche une page de l'historique des emprunts"""
+    adherent = livre = None
+    if args.adherent:
+        adherent = _trouver_adherent(bibliotheque, *args.adherent)
+        if adherent is None:
+            return 1
+    if args.livre:
+        livre = _trouver_livre(bibliotheque, args.livre)
+        if livre is None:
+            return 1
+
+    emprunts, total = bibliotheque.rechercher_emprunts(
+        adherent=adherent, livre=livre, statut=args.statut,
+        date_debut=args.du, date_fin=args.au, page=args.page - 1,
+        taille_page=args.taille_page)
+    for emp in emprunts:
+        print(emp)
+    print(f"Page {args.page} - {len(emprunts)} sur {total} emprunt(s)")
+    return 0
+
+
+def commande_emprunter(bibliotheque, args):
+    """Crée un emprunt, ou un lot d'emprunts (tout ou rien) pour plusieurs titres"""
+    adherent = _trouver_adherent(bibliotheque, args.nom, args.prenom)
+    livres = [_trouver_livre(bibliotheque, titre) for titre in args.titres]
+    if adherent is None or None in livres:
+        return 1
+    if len(livres) == 1:
+        success, message = bibliotheque.ajouter_emprunt(adherent, livres[0])
+    else:
+        success, message = bibliotheque.emprunter_lot(adherent, livres)
+    if not success:
+        return _erreur(message)
+    print(message)
+    return 0
+
+
+def commande_retourner(bibliotheque, args):
+    """Enregistre un retour, ou un lot de retours (tout ou rien) pour plusieurs titres"""
+    adherent = _trouver_adherent(bibliotheque, args.nom, args.prenom)
+    livres = [_trouver_livre(bibliotheque, titre) for titre in args.titres]
+    if adherent is None or None in livres:
+        return 1
+    if len(livres) == 1:
+        success, message = bibliotheque.retourner_emprunt(adherent, livres[0])
+    else:
+        actifs = {id(e.livre): e for e in bibliotheque.get_emprunts_adherent(adherent)
+                  if e.est_actif()}
+        autres = [l.titre for l in livres if id(l) not in actifs]
+        if autres:
+            return _erreur(f"pas d'emprunt en cours de {args.prenom} {args.nom} pour: "
+                           f"{', '.join(autres)}")
+        success, message = bibliotheque.retourner_lot([actifs[id(l)] for l in livres])
+    if not success:
+        return _erreur(message)
+    print(message)
+    return 0
+
+
+def commande_reserver(bibliotheque, args):
+    """Réserve un livre emprunté, ou annule la réservation"""
+    adherent = _trouver_adherent(bibliotheque, args.nom, args.prenom)
+    livre = _trouver_livre(bibliotheque, args.titre)
+    if adherent is None or livre is None:
+        return 1
+    if args.annuler:
+        success, message = bibliotheque.annuler_reservation(adherent, livre)
+    else:
+        success, message = bibliotheque.reserver(adherent, livre)
+    if not success:
+        return _erreur(message)
+    print(message)
+    return 0
+
+
+def commande_reservations(bibliotheque, args):
+    """Liste les livres mis de côté à retirer, puis les files d'attente"""
+    pretes = bibliotheque.get_reservations_pretes()
+    print(f"Livres à retirer: {len(pretes)}")
+    for reservation in pretes:
+        print(f"  {reservation}")
+    if args.attente:
+        attente = [r for r in bibliotheque.get_reservations() if not r.est_prete()]
+        print(f"Réservations en attente: {len(attente)}")
+        for reservation in attente:
+            print(f"  {reservation}")
+    return 0
+
+
+def commande_relances(bibliotheque, args):
+    """Envoie un avis à chaque adhérent en retard (reprend après une interruption)"""
+    # Import différé : smtplib et email ne servent qu'à cette commande
+    import smtplib
+    from utils.relances import BoiteEnvoi, EnvoiSMTP, JournalRelances, envoyer_relances
+
+    if args.boite:
+        envoi = BoiteEnvoi(args.boite)
+    else:
+        hote, _, port = args.smtp.partition(":")
+        envoi = EnvoiSMTP(hote or "localhost", int(port or 25))
+
+    date_reference = bibliotheque.aujourd_hui()
+    chemin_journal = args.journal or os.path.join(
+        FileManager.DATA_DIR, f"Relances-{date_reference.isoformat()}.journal")
+    journal = JournalRelances(chemin_journal)
+    try:
+        bilan = envoyer_relances(bibliotheque, envoi, journal, date_reference,
+                                 debit=args.debit, expediteur=args.expediteur)
+    except (OSError, smtplib.SMTPException) as e:
+        return _erreur(f"envoi interrompu ({e}) : relancez la commande pour reprendre")
+    finally:
+        envoi.fermer()
+        journal.fermer()
+
+    print(f"Relances du {date_reference.strftime('%d/%m/%Y')} : "
+          f"{bilan['emprunts_retard']} emprunt(s) en retard, {bilan['adherents']} adhérent(s)")
+    print(f"  {bilan['envoyes']} avis envoyé(s), {bilan['deja_envoyes']} déjà envoyé(s), "
+          f"{bilan['sans_email']} adhérent(s) sans email")
+    return 0
+
+
+def commande_penalites(bibliotheque, args):
+    """Affiche les pénalités de retard par adhérent, à la date de référence"""
+    from utils.penalites import calculer_penalites, formater_montant
+
+    date_reference = bibliotheque.aujourd_hui()
+    totaux = calculer_penalites(bibliotheque, date_reference)
+    print(f"Pénalités au {date_reference.strftime('%d/%m/%Y')} : "
+          f"{len(totaux)} adhérent(s), {formater_montant(sum(totaux.values()))} au total")
+    classement = sorted(totaux.items(), key=lambda item: (-item[1], item[0]))
+    for identifiant, montant in classement[:args.limite]:
+        print(f"  {identifiant.replace('_', ' ')}: {formater_montant(montant)}")
+    return 0
+
+
+def commande_activite(bibliotheque, args):
+    """Affiche les emprunts, retours et passages en retard par jour ou par mois"""
+    fin = args.au or bibliotheque.aujourd_hui()
+    debut = args.du or fin.replace(day=1)
+    if debut > fin:
+        return _erreur("la période commence après sa fin")
+    pas = SeriesEmprunts.PAS_MOIS if args.mois else SeriesEmprunts.PAS_JOUR
+    format_date = '%m/%Y' if args.mois else '%d/%m/%Y'
+    print("période      emprunts  retours  retards")
+    for seau, emprunts, retours, retards in bibliotheque.get_series(debut, fin, pas):
+        print(f"{seau.strftime(format_date):<12} {emprunts:>8} {retours:>8} {retards:>8}")
+    return 0
+
+
+def commande_recommandations(bibliotheque, args):
+    """Affiche les livres souvent empruntés avec un livre"""
+    livre = _trouver_livre(bibliotheque, args.titre)
+    if livre is None:
+        return 1
+    adherent = None
+    if args.pour:
+        adherent = _trouver_adherent(bibliotheque, *args.pour)
+        if adherent is None:
+            return 1
+    recommandations = bibliotheque.get_recommandations(livre, args.nombre, adherent)
+    for autre, nombre in recommandations:
+        print(f"{autre.titre} - {autre.auteur} ({nombre} adhérent(s))")
+    print(f"{len(recommandations)} recommandation(s) pour '{livre.titre}'")
+    return 0
+
+
+def commande_ajouter_adherent(bibliotheque, args):
+    """Inscrit un adhérent"""
+    if not bibliotheque.ajouter_adherent(Adherent(args.nom, args.prenom, args.email)):
+        return _erreur("cet adhérent existe déjà")
+    print(f"Adhérent {args.prenom} {args.nom} ajouté")
+    return 0
+
+
+def commande_supprimer_adherent(bibliotheque, args):
+    """Supprime un adhérent"""
+    adherent = _trouver_adherent(bibliotheque, args.nom, args.prenom)
+    if adherent is None:
+        return 1
+    if not bibliotheque.enlever_adherent(adherent):
+        return _erreur("impossible de supprimer cet adhérent (emprunts actifs)")
+    print(f"Adhérent {args.prenom} {args.nom} supprimé")
+    return 0
+
+
+def commande_ajouter_document(bibliotheque, args):
+    """Ajoute un document au catalogue (ou des exemplaires à un livre existant)"""
+    if args.exemplaires < 1:
+        return _erreur("--exemplaires doit être au moins 1")
+    existant = bibliotheque.rechercher_document(args.titre)
+    if (isinstance(existant, Livre) and args.type == "Livre"
+            and args.auteur in (None, existant.auteur)):
+        if not bibliotheque.ajouter_exemplaires(existant, args.exemplaires):
+            return _erreur(f"impossible d'ajouter des exemplaires à '{existant.titre}'")
+        print(f"{args.exemplaires} exemplaire(s) ajouté(s) à '{existant.titre}' "
+              f"({existant.exemplaires} au total)")
+        return 0
+    if existant:
+        return _erreur("ce document existe déjà")
+
+    if args.type == "Journal":
+        if args.parution is None:
+            return _erreur("--parution est obligatoire pour un journal")
+        document = Journal(args.titre, args.parution)
+    elif not args.auteur:
+        return _erreur("--auteur est obligatoire pour ce type de document")
+    elif args.type == "Livre":
+        document = Livre(args.titre, args.auteur, exemplaires=args.exemplaires)
+    elif args.type == "Dictionnaire":
+        document = Dictionnaire(args.titre, args.auteur)
+    elif not args.dessinateur:
+        return _erreur("--dessinateur est obligatoire pour une BD")
+    else:
+        document = BD(args.titre, args.auteur, args.dessinateur)
+
+    bibliotheque.ajouter_document(document)
+    print(f"Document '{args.titre}' ajouté")
+    return 0
+
+
+def commande_supprimer_document(bibliotheque, args):
+    """Retire un document du catalogue"""
+    document = bibliotheque.rechercher_document(args.titre)
+    if document is None:
+        return _erreur(f"document '{args.titre}' introuvable")
+    bibliotheque.enlever_document(document)
+    print(f"Document '{args.titre}' supprimé")
+    return 0
+
+
+def commande_donnees_test(bibliotheque, args):
+    """Crée les données de test (remplace les fichiers existants)"""
+    if args.adherents is None and args.documents is None and args.emprunts is None:
+        FileManager.creer_donnees_test()
+        print("Données de test créées")
+        return 0
+
+    from utils.generateur import generer_donnees
+
+    def progression(faits, total):
+        print(f"\r  {faits}/{total} emprunts", end="", file=sys.stderr, flush=True)
+
+    try:
+        bilan = generer_donnees(args.adherents or 0, args.documents or 0, args.emprunts or 0,
+                                graine=args.graine, annees=args.annees, date_fin=args.date,
+                                taux_retard=args.taux_retard, progression=progression)
+    except ValueError as e:
+        return _erreur(str(e))
+    if args.emprunts:
+        print(file=sys.stderr)
+    print(f"Données générées dans {FileManager.DATA_DIR} (graine {args.graine})")
+    for cle, valeur in bilan.items():
+        print(f"  {cle}: {valeur}")
+    return 0
+
+
+# ========== Analyse des arguments ==========
+
+def creer_parseur():
+    """Crée l'analyseur des arguments de la ligne de commande"""
+    parseur = argparse.ArgumentParser(
+        prog="main.py",
+        description="Gestion de bibliothèque en ligne de commande "
+                    "(sans argument : interface graphique)")
+    parseur.add_argument("--data", metavar="DOSSIER",
+                         help="dossier des fichiers de données (défaut: data)")
+    parseur.add_argument("--date", type=_date, metavar="AAAA-MM-JJ",
+                         help="date de référence (rapport « à la date du »)")
+    parseur.add_argument("--metriques", metavar="FICHIER",
+                         help="chronomètre les opérations et écrit les métriques "
+                              "(format texte Prometheus, ou JSON si FICHIER finit par .json)")
+    sous = parseur.add_subparsers(dest="commande", required=True, metavar="COMMANDE")
+
+    def ajouter(nom, fonction, modifie, aide):
+        p = sous.add_parser(nom, help=aide, description=aide)
+        p.set_defaults(fonction=fonction, modifie=modifie)
+        return p
+
+    ajouter("statistiques", commande_statistiques, False, "affiche les statistiques")
+    ajouter("retards", commande_retards, False, "liste les emprunts en retard")
+
+    p = ajouter("historique", commande_historique, False, "affiche l'historique des emprunts")
+    p.add_argument("--adherent", nargs=2, metavar=("NOM", "PRENOM"))
+    p.add_argument("--livre", metavar="TITRE")
+    p.add_argument("--statut", choices=[Bibliotheque.STATUT_ACTIF, Bibliotheque.STATUT_RETARD,
+                                        Bibliotheque.STATUT_RETOURNE])
+    p.add_argument("--du", type=_date, metavar="AAAA-MM-JJ")
+    p.add_argument("--au", type=_date, metavar="AAAA-MM-JJ")
+    p.add_argument("--page", type=int, default=1)
+    p.add_argument("--taille-page", type=int, default=50)
+
+    for nom, fonction, aide in [("emprunter", commande_emprunter,
+                                 "crée un ou plusieurs emprunts (tout ou rien)"),
+                                ("retourner", commande_retourner,
+                                 "enregistre un ou plusieurs retours (tout ou rien)")]:
+        p = ajouter(nom, fonction, True, aide)
+        p.add_argument("nom")
+        p.add_argument("prenom")
+        p.add_argument("titres", nargs="+", metavar="TITRE")
+
+    p = ajouter("reserver", commande_reserver, True, "réserve un livre emprunté")
+    p.add_argument("nom")
+    p.add_argument("prenom")
+    p.add_argument("titre")
+    p.add_argument("--annuler", action="store_true", help="annule la réservation")
+
+    p = ajouter("reservations", commande_reservations, False, "liste les livres à retirer")
+    p.add_argument("--attente", action="store_true", help="affiche aussi les files d'attente")
+
+    p = ajouter("activite", commande_activite, False,
+                "emprunts, retours et passages en retard par jour ou par mois")
+    p.add_argument("--du", type=_date, metavar="AAAA-MM-JJ",
+                   help="début de la période (défaut: début du mois)")
+    p.add_argument("--au", type=_date, metavar="AAAA-MM-JJ",
+                   help="fin de la période (défaut: date de référence)")
+    p.add_argument("--mois", action="store_true", help="un total par mois")
+
+    p = ajouter("recommandations", commande_recommandations, False,
+                "livres souvent empruntés par les lecteurs d'un livre")
+    p.add_argument("titre")
+    p.add_argument("--pour", nargs=2, metavar=("NOM", "PRENOM"),
+                   help="écarte les livres déjà empruntés par cet adhérent")
+    p.add_argument("--nombre", type=int, default=10)
+
+    p = ajouter("ajouter-adherent", commande_ajouter_adherent, True, "inscrit un adhérent")
+    p.add_argument("nom")
+    p.add_argument("prenom")
+    p.add_argument("--email", default="")
+
+    p = ajouter("supprimer-adherent", commande_supprimer_adherent, True, "supprime un adhérent")
+    p.add_argument("nom")
+    p.add_argument("prenom")
+
+    p = ajouter("ajouter-document", commande_ajouter_document, True, "ajoute un document")
+    p.add_argument("type", choices=["Livre", "BD", "Dictionnaire", "Journal"])
+    p.add_argument("titre")
+    p.add_argument("--auteur")
+    p.add_argument("--dessinateur")
+    p.add_argument("--parution", type=_date, metavar="AAAA-MM-JJ",
+                   help="date de parution (journal)")
+    p.add_argument("--exemplaires", type=int, default=1,
+                   help="nombre d'exemplaires (livre)")
+
+    p = ajouter("supprimer-document", commande_supprimer_document, True, "supprime un document")
+    p.add_argument("titre")
+
+    p = ajouter("relances", commande_relances, False,
+                "envoie les avis de retard, un par adhérent")
+    destination = p.add_mutually_exclusive_group(required=True)
+    destination.add_argument("--boite", metavar="DOSSIER",
+                             help="dépose les avis dans un dossier (un fichier .eml par avis)")
+    destination.add_argument("--smtp", metavar="HOTE:PORT", help="remet les avis à un serveur SMTP")
+    p.add_argument("--debit", type=float, default=0, help="avis par seconde au plus")
+    p.add_argument("--journal", metavar="FICHIER",
+                   help="journal de reprise (défaut: DATA/Relances-AAAA-MM-JJ.journal)")
+    p.add_argument("--expediteur", default="bibliotheque@localhost")
+
+    p = ajouter("penalites", commande_penalites, False,
+                "affiche les pénalités de retard par adhérent (date : --date)")
+    p.add_argument("--limite", type=int, default=20, help="nombre d'adhérents affichés")
+
+    p = ajouter("donnees-test", commande_donnees_test, False,
+                "crée les données de test (écrase les fichiers) ; avec --adherents, "
+                "--documents ou --emprunts, génère un jeu synthétique de cette taille")
+    p.add_argument("--adherents", type=int)
+    p.add_argument("--documents", type=int)
+    p.add_argument("--emprunts", type=int)
+    p.add_argument("--graine", type=int, default=0, help="même graine, mêmes fichiers")
+    p.add_argument("--annees", type=float, default=3,
+                   help="durée de l'historique, jusqu'à --date (défaut: 3)")
+    p.add_argument("--taux-retard", type=float, default=0.08,
+                   help="part des emprunts rendus en retard (défaut: 0.08)")
+
+    return parseur
+
+
+def executer(arguments=None):
+    """
+    Exécute une commande et retourne le code de sortie (0 si succès)
+    Les données ne sont écrites qu'une fois, et seulement si la commande réussit.
+    """
+    args = creer_parseur().parse_args(arguments)
+
+    if not args.metriques:
+        return _executer_commande(args)
+
+    # Import différé : sans --metriques, rien n'est chronométré
+    from utils import metriques
+    metriques.instrumenter()
+    try:
+        return _executer_commande(args)
+    finally:
+        try:
+            if args.metriques.endswith(".json"):
+                metriques.REGISTRE.ecrire_json(args.metriques)
+            else:
+                metriques.REGISTRE.ecrire_prometheus(args.metriques)
+        except OSError as e:
+            _erreur(f"écriture des métriques impossible: {e}")
+
+
+def _executer_commande(args):
+    """Charge les données, exécute la commande et sauvegarde au besoin"""
+    if args.data:
+        FileManager.definir_dossier_data(args.data)
+    FileManager.initialiser_fichiers()
+
+    if args.fonction is commande_donnees_test:
+        return commande_donnees_test(None, args)
+
+    bibliotheque = FileManager.charger_bibliotheque(
+        recommandations=args.fonction is commande_recommandations)
+    if args.date is not None:
+        bibliotheque.horloge = HorlogeFixe(args.date)
+
+    code = args.fonction(bibliotheque, args)
+
+    if code == 0 and args.modifie:
+        if not FileManager.sauvegarder_bibliotheque(bibliotheque):
+            return _erreur("échec de la sauvegarde")
+    return code
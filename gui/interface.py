@@ -5,25 +5,50 @@ Interface graphique PyQt6 pour le système de gestion de bibliothèque
 from PyQt6.QtWidgets import (QApplication, QWidget, QLabel, QPushButton,
                              QGridLayout, QVBoxLayout, QHBoxLayout, QLineEdit,
                              QTextEdit, QComboBox, QMessageBox, QTabWidget,
-                             QTableWidget, QTableWidgetItem, QGroupBox, QDateEdit)
-from PyQt6.QtCore import Qt, QDate
+                             QTableView, QAbstractItemView, QGroupBox, QDateEdit,
+                             QProgressBar, QCheckBox, QListWidget, QSpinBox)
+from PyQt6.QtCore import Qt, QDate, QTimer
 from PyQt6.QtGui import QFont
 from datetime import date, datetime
 
 from classes.bibliotheque import Bibliotheque
+from classes.evenements import (EvenementAdherent, EvenementDocument, EvenementEmprunt,
+                                AdherentAjoute, AdherentEnleve, DocumentAjoute,
+                                DocumentEnleve, DocumentModifie, EvenementReservation)
 from classes.document import Livre, BD, Dictionnaire, Journal
 from classes.adherent import Adherent
-from utils.file_manager import FileManager
+from classes.series import SeriesEmprunts
+from gui.modeles import ModeleAdherents, ModeleDocuments, ModeleEmprunts
+from gui.taches import TacheChargement, TacheSauvegarde
+from gui.selecteurs import SelecteurRecherche
 
 
 class BibliothequeGUI(QWidget):
     """Interface graphique principale pour la bibliothèque"""
 
+    # Délai sans modification avant la sauvegarde automatique (ms)
+    DELAI_SAUVEGARDE_AUTO_MS = 3000
+
     def __init__(self):
         super().__init__()
-        self.bibliotheque = FileManager.charger_bibliotheque()
+        # Bibliothèque vide le temps du chargement en arrière-plan
+        self.bibliotheque = Bibliotheque()
+        self.tache_chargement = None
+        self.tache_sauvegarde = None
+        self.sauvegarde_en_attente = None  # None, ou True si une sauvegarde manuelle attend
+        self.fermeture_demandee = False
+        self.fermeture_autorisee = False
+
         self.init_ui()
 
+        self.minuteur_sauvegarde = QTimer(self)
+        self.minuteur_sauvegarde.setSingleShot(True)
+        self.minuteur_sauvegarde.setInterval(self.DELAI_SAUVEGARDE_AUTO_MS)
+        self.minuteur_sauvegarde.timeout.connect(self.sauvegarde_automatique)
+
+        self.bibliotheque.abonner(self.bibliotheque_modifiee, par_lot=True)
+        self.charger_donnees()
+
     def init_ui(self):
         """Initialise l'interface utilisateur"""
         self.setWindowTitle("Système de Gestion de Bibliothèque")
@@ -71,13 +96,22 @@ class BibliothequeGUI(QWidget):
         main_layout.addWidget(titre)
 
         # Onglets
-        tabs = QTabWidget()
-        tabs.addTab(self.create_adherents_tab(), "Adhérents")
-        tabs.addTab(self.create_documents_tab(), "Documents")
-        tabs.addTab(self.create_emprunts_tab(), "Emprunts")
-        tabs.addTab(self.create_stats_tab(), "Statistiques")
-
-        main_layout.addWidget(tabs)
+        self.tabs = QTabWidget()
+        self.tabs.addTab(self.create_adherents_tab(), "Adhérents")
+        self.tabs.addTab(self.create_documents_tab(), "Documents")
+        self.tabs.addTab(self.create_emprunts_tab(), "Emprunts")
+        self.tabs.addTab(self.create_stats_tab(), "Statistiques")
+
+        main_layout.addWidget(self.tabs)
+
+        # Progression des tâches de fond (chargement, sauvegarde)
+        self.etat_label = QLabel("")
+        self.barre_progression = QProgressBar()
+        self.barre_progression.hide()
+        progression_layout = QHBoxLayout()
+        progression_layout.addWidget(self.etat_label)
+        progression_layout.addWidget(self.barre_progression)
+        main_layout.addLayout(progression_layout)
 
         # Boutons d'action globaux
         btn_layout = QHBoxLayout()
@@ -99,6 +133,25 @@ class BibliothequeGUI(QWidget):
 
         self.setLayout(main_layout)
 
+    # ========== Tables ==========
+
+    def creer_vue_table(self, modele):
+        """Crée une vue de table (seules les lignes visibles sont dessinées)"""
+        vue = QTableView()
+        vue.setModel(modele)
+        vue.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        vue.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        vue.horizontalHeader().setStretchLastSection(True)
+        vue.verticalHeader().setDefaultSectionSize(24)
+        return vue
+
+    def element_selectionne(self, vue, modele):
+        """Retourne l'objet de la ligne sélectionnée dans une vue, ou None"""
+        lignes = vue.selectionModel().selectedRows()
+        if not lignes:
+            return None
+        return modele.element(lignes[0])
+
     # ========== Onglet Adhérents ==========
 
     def create_adherents_tab(self):
@@ -133,12 +186,15 @@ class BibliothequeGUI(QWidget):
         liste_group = QGroupBox("Liste des adhérents")
         liste_layout = QVBoxLayout()
 
-        self.adherents_table = QTableWidget()
-        self.adherents_table.setColumnCount(4)
-        self.adherents_table.setHorizontalHeaderLabels(["Nom", "Prénom", "Email", "Actions"])
-        self.adherents_table.horizontalHeader().setStretchLastSection(True)
+        self.adherents_modele = ModeleAdherents(self.bibliotheque, self)
+        self.adherents_table = self.creer_vue_table(self.adherents_modele)
         liste_layout.addWidget(self.adherents_table)
 
+        btn_suppr_adh = QPushButton("Supprimer l'adhérent sélectionné")
+        btn_suppr_adh.setStyleSheet("background-color: #f44336;")
+        btn_suppr_adh.clicked.connect(self.supprimer_adherent_selectionne)
+        liste_layout.addWidget(btn_suppr_adh)
+
         liste_group.setLayout(liste_layout)
         layout.addWidget(liste_group)
 
@@ -171,7 +227,6 @@ class BibliothequeGUI(QWidget):
         self.adh_prenom_input.clear()
         self.adh_email_input.clear()
 
-        self.actualiser_table_adherents()
         QMessageBox.information(self, "Succès", f"Adhérent {prenom} {nom} ajouté avec succès!")
 
     def supprimer_adherent(self, adherent):
@@ -182,26 +237,22 @@ class BibliothequeGUI(QWidget):
 
         if reply == QMessageBox.StandardButton.Yes:
             if self.bibliotheque.enlever_adherent(adherent):
-                self.actualiser_table_adherents()
                 QMessageBox.information(self, "Succès", "Adhérent supprimé!")
             else:
                 QMessageBox.warning(self, "Erreur",
                                     "Impossible de supprimer cet adhérent (emprunts actifs)")
 
+    def supprimer_adherent_selectionne(self):
+        """Supprime l'adhérent sélectionné dans la table"""
+        adherent = self.element_selectionne(self.adherents_table, self.adherents_modele)
+        if adherent is None:
+            QMessageBox.warning(self, "Erreur", "Aucun adhérent sélectionné!")
+            return
+        self.supprimer_adherent(adherent)
+
     def actualiser_table_adherents(self):
         """Actualise l'affichage de la table des adhérents"""
-        adherents = self.bibliotheque.get_adherents()
-        self.adherents_table.setRowCount(len(adherents))
-
-        for i, adh in enumerate(adherents):
-            self.adherents_table.setItem(i, 0, QTableWidgetItem(adh.nom))
-            self.adherents_table.setItem(i, 1, QTableWidgetItem(adh.prenom))
-            self.adherents_table.setItem(i, 2, QTableWidgetItem(adh.email))
-
-            btn_suppr = QPushButton("Supprimer")
-            btn_suppr.setStyleSheet("background-color: #f44336;")
-            btn_suppr.clicked.connect(lambda checked, a=adh: self.supprimer_adherent(a))
-            self.adherents_table.setCellWidget(i, 3, btn_suppr)
+        self.adherents_modele.actualiser()
 
     # ========== Onglet Documents ==========
 
@@ -235,6 +286,12 @@ class BibliothequeGUI(QWidget):
         self.doc_dessinateur_input = QLineEdit()
         form_layout.addWidget(self.doc_dessinateur_input, 3, 1)
 
+        self.doc_exemplaires_label = QLabel("Exemplaires:")
+        form_layout.addWidget(self.doc_exemplaires_label, 5, 0)
+        self.doc_exemplaires_input = QSpinBox()
+        self.doc_exemplaires_input.setRange(1, 999)
+        form_layout.addWidget(self.doc_exemplaires_input, 5, 1)
+
         self.doc_date_label = QLabel("Date de parution:")
         form_layout.addWidget(self.doc_date_label, 4, 0)
         self.doc_date_input = QDateEdit()
@@ -244,7 +301,7 @@ class BibliothequeGUI(QWidget):
 
         btn_ajouter_doc = QPushButton("Ajouter Document")
         btn_ajouter_doc.clicked.connect(self.ajouter_document)
-        form_layout.addWidget(btn_ajouter_doc, 5, 0, 1, 2)
+        form_layout.addWidget(btn_ajouter_doc, 6, 0, 1, 2)
 
         form_group.setLayout(form_layout)
         layout.addWidget(form_group)
@@ -253,12 +310,19 @@ class BibliothequeGUI(QWidget):
         liste_group = QGroupBox("Liste des documents")
         liste_layout = QVBoxLayout()
 
-        self.documents_table = QTableWidget()
-        self.documents_table.setColumnCount(5)
-        self.documents_table.setHorizontalHeaderLabels(["Type", "Titre", "Info", "Statut", "Actions"])
-        self.documents_table.horizontalHeader().setStretchLastSection(True)
+        self.documents_modele = ModeleDocuments(self.bibliotheque, self)
+        self.documents_table = self.creer_vue_table(self.documents_modele)
         liste_layout.addWidget(self.documents_table)
 
+        btn_suppr_doc = QPushButton("Supprimer le document sélectionné")
+        btn_suppr_doc.setStyleSheet("background-color: #f44336;")
+        btn_suppr_doc.clicked.connect(self.supprimer_document_selectionne)
+        liste_layout.addWidget(btn_suppr_doc)
+
+        btn_recommandations = QPushButton("Souvent empruntés avec le livre sélectionné")
+        btn_recommandations.clicked.connect(self.afficher_recommandations)
+        liste_layout.addWidget(btn_recommandations)
+
         liste_group.setLayout(liste_layout)
         layout.addWidget(liste_group)
 
@@ -278,11 +342,16 @@ class BibliothequeGUI(QWidget):
         self.doc_dessinateur_input.hide()
         self.doc_date_label.hide()
         self.doc_date_input.hide()
+        self.doc_exemplaires_label.hide()
+        self.doc_exemplaires_input.hide()
 
         # Afficher selon le type
         if doc_type in ["Livre", "Dictionnaire"]:
             self.doc_auteur_label.show()
             self.doc_auteur_input.show()
+            if doc_type == "Livre":
+                self.doc_exemplaires_label.show()
+                self.doc_exemplaires_input.show()
         elif doc_type == "BD":
             self.doc_auteur_label.show()
             self.doc_auteur_input.show()
@@ -301,8 +370,21 @@ class BibliothequeGUI(QWidget):
             QMessageBox.warning(self, "Erreur", "Le titre est obligatoire!")
             return
 
-        # Vérifier si le document existe déjà
-        if self.bibliotheque.rechercher_document(titre):
+        # Vérifier si le document existe déjà (un livre du même auteur reçoit
+        # de nouveaux exemplaires)
+        existant = self.bibliotheque.rechercher_document(titre)
+        exemplaires = self.doc_exemplaires_input.value()
+        if (isinstance(existant, Livre) and doc_type == "Livre"
+                and self.doc_auteur_input.text().strip() in ("", existant.auteur)):
+            reponse = QMessageBox.question(
+                self, "Confirmation",
+                f"'{existant.titre}' existe déjà : lui ajouter {exemplaires} exemplaire(s) ?")
+            if reponse == QMessageBox.StandardButton.Yes:
+                self.bibliotheque.ajouter_exemplaires(existant, exemplaires)
+                self.doc_titre_input.clear()
+                self.doc_exemplaires_input.setValue(1)
+            return
+        if existant:
             QMessageBox.warning(self, "Erreur", "Ce document existe déjà!")
             return
 
@@ -313,7 +395,7 @@ class BibliothequeGUI(QWidget):
             if not auteur:
                 QMessageBox.warning(self, "Erreur", "L'auteur est obligatoire!")
                 return
-            document = Livre(titre, auteur)
+            document = Livre(titre, auteur, exemplaires=exemplaires)
 
         elif doc_type == "BD":
             auteur = self.doc_auteur_input.text().strip()
@@ -340,7 +422,7 @@ class BibliothequeGUI(QWidget):
             self.doc_titre_input.clear()
             self.doc_auteur_input.clear()
             self.doc_dessinateur_input.clear()
-            self.actualiser_table_documents()
+            self.doc_exemplaires_input.setValue(1)
             QMessageBox.information(self, "Succès", f"Document '{titre}' ajouté!")
 
     def supprimer_document(self, document):
@@ -351,45 +433,36 @@ class BibliothequeGUI(QWidget):
 
         if reply == QMessageBox.StandardButton.Yes:
             self.bibliotheque.enlever_document(document)
-            self.actualiser_table_documents()
             QMessageBox.information(self, "Succès", "Document supprimé!")
 
+    def supprimer_document_selectionne(self):
+        """Supprime le document sélectionné dans la table"""
+        document = self.element_selectionne(self.documents_table, self.documents_modele)
+        if document is None:
+            QMessageBox.warning(self, "Erreur", "Aucun document sélectionné!")
+            return
+        self.supprimer_document(document)
+
+    def afficher_recommandations(self):
+        """Affiche les livres souvent empruntés avec le livre sélectionné"""
+        livre = self.element_selectionne(self.documents_table, self.documents_modele)
+        if not isinstance(livre, Livre):
+            QMessageBox.warning(self, "Erreur", "Aucun livre sélectionné!")
+            return
+        recommandations = self.bibliotheque.get_recommandations(livre, 10)
+        if not recommandations:
+            QMessageBox.information(self, "Recommandations",
+                                    f"Pas encore d'emprunts communs avec '{livre.titre}'.")
+            return
+        lignes = [f"• {autre.titre} - {autre.auteur} ({nombre} adhérent(s))"
+                  for autre, nombre in recommandations]
+        QMessageBox.information(self, "Recommandations",
+                                f"Les lecteurs de '{livre.titre}' ont aussi emprunté :\n\n"
+                                + "\n".join(lignes))
+
     def actualiser_table_documents(self):
         """Actualise l'affichage de la table des documents"""
-        documents = self.bibliotheque.get_documents()
-        self.documents_table.setRowCount(len(documents))
-
-        for i, doc in enumerate(documents):
-            # Type
-            doc_type = doc.__class__.__name__
-            self.documents_table.setItem(i, 0, QTableWidgetItem(doc_type))
-
-            # Titre
-            self.documents_table.setItem(i, 1, QTableWidgetItem(doc.titre))
-
-            # Info
-            info = ""
-            if hasattr(doc, 'auteur'):
-                info = f"Auteur: {doc.auteur}"
-            if hasattr(doc, 'dessinateur'):
-                info += f" | Dessin: {doc.dessinateur}"
-            if hasattr(doc, 'date_parution'):
-                info = f"Date: {doc.date_parution.strftime('%d/%m/%Y')}"
-            self.documents_table.setItem(i, 2, QTableWidgetItem(info))
-
-            # Statut
-            statut = ""
-            if isinstance(doc, Livre):
-                statut = "Disponible" if doc.disponible else "Emprunté"
-            else:
-                statut = "Consultation sur place"
-            self.documents_table.setItem(i, 3, QTableWidgetItem(statut))
-
-            # Actions
-            btn_suppr = QPushButton("️Supprimer")
-            btn_suppr.setStyleSheet("background-color: #f44336;")
-            btn_suppr.clicked.connect(lambda checked, d=doc: self.supprimer_document(d))
-            self.documents_table.setCellWidget(i, 4, btn_suppr)
+        self.documents_modele.actualiser()
 
     # ========== Onglet Emprunts ==========
 
@@ -403,17 +476,38 @@ class BibliothequeGUI(QWidget):
         form_layout = QGridLayout()
 
         form_layout.addWidget(QLabel("Adhérent:"), 0, 0)
-        self.emp_adherent_combo = QComboBox()
-        form_layout.addWidget(self.emp_adherent_combo, 0, 1)
+        self.emp_adherent_input = SelecteurRecherche(
+            lambda texte, limite: self.bibliotheque.rechercher_adherents(texte, limite),
+            self.libelle_adherent, "Tapez le début du nom ou du prénom...")
+        form_layout.addWidget(self.emp_adherent_input, 0, 1)
 
         form_layout.addWidget(QLabel("Livre:"), 1, 0)
-        self.emp_livre_combo = QComboBox()
-        form_layout.addWidget(self.emp_livre_combo, 1, 1)
+        self.emp_livre_input = SelecteurRecherche(
+            lambda texte, limite: self.bibliotheque.rechercher_livres_disponibles(texte, limite),
+            self.libelle_livre, "Tapez le début du titre ou de l'auteur...")
+        form_layout.addWidget(self.emp_livre_input, 1, 1)
 
         btn_emprunter = QPushButton("Emprunter Livre")
         btn_emprunter.clicked.connect(self.creer_emprunt)
         form_layout.addWidget(btn_emprunter, 2, 0, 1, 2)
 
+        # Panier : plusieurs livres empruntés en une seule opération
+        self.panier_emprunts = []
+        self.panier_emprunts_liste = QListWidget()
+        self.panier_emprunts_liste.setMaximumHeight(90)
+        form_layout.addWidget(self.panier_emprunts_liste, 3, 0, 1, 2)
+        panier_layout = QHBoxLayout()
+        btn_ajouter_panier = QPushButton("Ajouter au panier")
+        btn_ajouter_panier.clicked.connect(self.ajouter_au_panier_emprunts)
+        panier_layout.addWidget(btn_ajouter_panier)
+        btn_emprunter_panier = QPushButton("Emprunter le panier")
+        btn_emprunter_panier.clicked.connect(self.emprunter_panier)
+        panier_layout.addWidget(btn_emprunter_panier)
+        btn_vider_panier = QPushButton("Vider")
+        btn_vider_panier.clicked.connect(self.vider_panier_emprunts)
+        panier_layout.addWidget(btn_vider_panier)
+        form_layout.addLayout(panier_layout, 4, 0, 1, 2)
+
         form_group.setLayout(form_layout)
         layout.addWidget(form_group)
 
@@ -422,123 +516,335 @@ class BibliothequeGUI(QWidget):
         retour_layout = QGridLayout()
 
         retour_layout.addWidget(QLabel("Sélectionner un emprunt actif:"), 0, 0)
-        self.ret_emprunt_combo = QComboBox()
-        retour_layout.addWidget(self.ret_emprunt_combo, 0, 1)
+        self.ret_emprunt_input = SelecteurRecherche(
+            lambda texte, limite: self.bibliotheque.rechercher_emprunts_actifs(texte, limite),
+            self.libelle_emprunt, "Tapez le début du titre ou du nom de l'adhérent...")
+        retour_layout.addWidget(self.ret_emprunt_input, 0, 1)
 
         btn_retourner = QPushButton("Retourner Livre")
         btn_retourner.clicked.connect(self.retourner_livre)
         retour_layout.addWidget(btn_retourner, 1, 0, 1, 2)
 
+        # Pile de retours enregistrée en une seule opération
+        self.panier_retours = []
+        self.panier_retours_liste = QListWidget()
+        self.panier_retours_liste.setMaximumHeight(90)
+        retour_layout.addWidget(self.panier_retours_liste, 2, 0, 1, 2)
+        retours_layout = QHBoxLayout()
+        btn_ajouter_retour = QPushButton("Ajouter à la pile")
+        btn_ajouter_retour.clicked.connect(self.ajouter_au_panier_retours)
+        retours_layout.addWidget(btn_ajouter_retour)
+        btn_retourner_pile = QPushButton("Retourner la pile")
+        btn_retourner_pile.clicked.connect(self.retourner_panier)
+        retours_layout.addWidget(btn_retourner_pile)
+        btn_vider_retours = QPushButton("Vider")
+        btn_vider_retours.clicked.connect(self.vider_panier_retours)
+        retours_layout.addWidget(btn_vider_retours)
+        retour_layout.addLayout(retours_layout, 3, 0, 1, 2)
+
         retour_group.setLayout(retour_layout)
         layout.addWidget(retour_group)
 
+        # Réservations des livres empruntés (adhérent choisi dans « Nouvel emprunt »)
+        reservation_group = QGroupBox("Réservations")
+        reservation_layout = QGridLayout()
+
+        reservation_layout.addWidget(QLabel("Livre emprunté:"), 0, 0)
+        self.res_emprunt_input = SelecteurRecherche(
+            lambda texte, limite: self.bibliotheque.rechercher_emprunts_actifs(texte, limite),
+            self.libelle_emprunt, "Tapez le début du titre du livre à réserver...")
+        reservation_layout.addWidget(self.res_emprunt_input, 0, 1)
+
+        btn_reserver = QPushButton("Réserver pour l'adhérent choisi")
+        btn_reserver.clicked.connect(self.reserver_livre)
+        reservation_layout.addWidget(btn_reserver, 1, 0, 1, 2)
+
+        reservation_layout.addWidget(QLabel("Livres à retirer:"), 2, 0, 1, 2)
+        self.reservations_pretes = []
+        self.reservations_pretes_liste = QListWidget()
+        self.reservations_pretes_liste.setMaximumHeight(90)
+        reservation_layout.addWidget(self.reservations_pretes_liste, 3, 0, 1, 2)
+
+        btn_annuler_reservation = QPushButton("Annuler la réservation sélectionnée")
+        btn_annuler_reservation.clicked.connect(self.annuler_reservation_selectionnee)
+        reservation_layout.addWidget(btn_annuler_reservation, 4, 0, 1, 2)
+
+        reservation_group.setLayout(reservation_layout)
+        layout.addWidget(reservation_group)
+
         # Liste des emprunts
-        liste_group = QGroupBox("Liste des emprunts")
+        liste_group = QGroupBox("Historique des emprunts")
         liste_layout = QVBoxLayout()
 
-        self.emprunts_table = QTableWidget()
-        self.emprunts_table.setColumnCount(5)
-        self.emprunts_table.setHorizontalHeaderLabels(["Adhérent", "Livre", "Date Emprunt",
-                                                       "Date Retour", "Statut"])
-        self.emprunts_table.horizontalHeader().setStretchLastSection(True)
+        # Filtres
+        filtres_layout = QGridLayout()
+        self.filtre_adherent_input = SelecteurRecherche(
+            lambda texte, limite: self.bibliotheque.rechercher_adherents(texte, limite),
+            self.libelle_adherent, "Adhérent (tous)")
+        filtres_layout.addWidget(self.filtre_adherent_input, 0, 0)
+
+        self.filtre_livre_input = SelecteurRecherche(
+            lambda texte, limite: self.bibliotheque.rechercher_documents(texte, limite),
+            lambda document: document.titre, "Livre (tous)")
+        filtres_layout.addWidget(self.filtre_livre_input, 0, 1)
+
+        self.filtre_statut_combo = QComboBox()
+        self.filtre_statut_combo.addItem("Tous les statuts", None)
+        self.filtre_statut_combo.addItem("En cours", Bibliotheque.STATUT_ACTIF)
+        self.filtre_statut_combo.addItem("En retard", Bibliotheque.STATUT_RETARD)
+        self.filtre_statut_combo.addItem("Retournés", Bibliotheque.STATUT_RETOURNE)
+        filtres_layout.addWidget(self.filtre_statut_combo, 0, 2)
+
+        self.filtre_periode_check = QCheckBox("Empruntés du")
+        filtres_layout.addWidget(self.filtre_periode_check, 1, 0)
+        self.filtre_debut_input = QDateEdit()
+        self.filtre_debut_input.setCalendarPopup(True)
+        self.filtre_debut_input.setDate(QDate.currentDate().addMonths(-1))
+        filtres_layout.addWidget(self.filtre_debut_input, 1, 1)
+        self.filtre_fin_input = QDateEdit()
+        self.filtre_fin_input.setCalendarPopup(True)
+        self.filtre_fin_input.setDate(QDate.currentDate())
+        filtres_layout.addWidget(self.filtre_fin_input, 1, 2)
+
+        btn_filtrer = QPushButton("Filtrer")
+        btn_filtrer.clicked.connect(self.filtrer_emprunts)
+        filtres_layout.addWidget(btn_filtrer, 0, 3)
+        btn_reinitialiser = QPushButton("Réinitialiser")
+        btn_reinitialiser.clicked.connect(self.reinitialiser_filtres_emprunts)
+        filtres_layout.addWidget(btn_reinitialiser, 1, 3)
+        liste_layout.addLayout(filtres_layout)
+
+        self.emprunts_modele = ModeleEmprunts(self.bibliotheque, self)
+        self.emprunts_table = self.creer_vue_table(self.emprunts_modele)
+        # Tri par date ou par statut via un clic sur l'en-tête
+        self.emprunts_table.setSortingEnabled(True)
+        self.emprunts_table.horizontalHeader().setSortIndicator(
+            ModeleEmprunts.COLONNE_DATE, Qt.SortOrder.DescendingOrder)
         liste_layout.addWidget(self.emprunts_table)
 
+        # Pagination
+        pages_layout = QHBoxLayout()
+        btn_precedente = QPushButton("◀ Précédente")
+        btn_precedente.clicked.connect(
+            lambda: self.emprunts_modele.aller_a_page(self.emprunts_modele.page - 1))
+        pages_layout.addWidget(btn_precedente)
+        self.emprunts_page_label = QLabel("")
+        self.emprunts_page_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        pages_layout.addWidget(self.emprunts_page_label)
+        btn_suivante = QPushButton("Suivante ▶")
+        btn_suivante.clicked.connect(
+            lambda: self.emprunts_modele.aller_a_page(self.emprunts_modele.page + 1))
+        pages_layout.addWidget(btn_suivante)
+        liste_layout.addLayout(pages_layout)
+        self.emprunts_modele.modelReset.connect(self.actualiser_pagination_emprunts)
+
         liste_group.setLayout(liste_layout)
         layout.addWidget(liste_group)
 
         tab.setLayout(layout)
-        self.actualiser_combos_emprunts()
         self.actualiser_table_emprunts()
         return tab
 
-    def actualiser_combos_emprunts(self):
-        """Actualise les listes déroulantes pour les emprunts"""
-        # Adhérents
-        self.emp_adherent_combo.clear()
-        for adh in self.bibliotheque.get_adherents():
-            self.emp_adherent_combo.addItem(f"{adh.prenom} {adh.nom}", adh)
+    def libelle_adherent(self, adherent):
+        """Texte affiché pour un adhérent dans les sélecteurs"""
+        return f"{adherent.prenom} {adherent.nom}"
 
-        # Livres disponibles
-        self.emp_livre_combo.clear()
-        for livre in self.bibliotheque.get_livres_disponibles():
-            self.emp_livre_combo.addItem(f"{livre.titre} ({livre.auteur})", livre)
+    def libelle_livre(self, livre):
+        """Texte affiché pour un livre dans les sélecteurs"""
+        return f"{livre.titre} ({livre.auteur})"
 
-        # Emprunts actifs pour retour
-        self.ret_emprunt_combo.clear()
-        for emp in self.bibliotheque.get_emprunts_actifs():
-            text = f"{emp.livre.titre} - {emp.adherent.prenom} {emp.adherent.nom}"
-            self.ret_emprunt_combo.addItem(text, emp)
+    def libelle_emprunt(self, emprunt):
+        """Texte affiché pour un emprunt dans les sélecteurs"""
+        return f"{emprunt.livre.titre} - {emprunt.adherent.prenom} {emprunt.adherent.nom}"
 
     def creer_emprunt(self):
         """Crée un nouvel emprunt"""
-        if self.emp_adherent_combo.count() == 0:
-            QMessageBox.warning(self, "Erreur", "Aucun adhérent disponible!")
+        adherent = self.emp_adherent_input.objet_selectionne()
+        if adherent is None:
+            QMessageBox.warning(self, "Erreur", "Choisissez un adhérent dans les suggestions!")
             return
 
-        if self.emp_livre_combo.count() == 0:
-            QMessageBox.warning(self, "Erreur", "Aucun livre disponible!")
+        livre = self.emp_livre_input.objet_selectionne()
+        if livre is None:
+            QMessageBox.warning(self, "Erreur", "Choisissez un livre disponible dans les suggestions!")
             return
 
-        adherent = self.emp_adherent_combo.currentData()
-        livre = self.emp_livre_combo.currentData()
-
         success, message = self.bibliotheque.ajouter_emprunt(adherent, livre)
 
         if success:
+            self.emp_livre_input.effacer()
             QMessageBox.information(self, "Succès", message)
-            self.actualiser_combos_emprunts()
-            self.actualiser_table_emprunts()
-            self.actualiser_table_documents()
         else:
             QMessageBox.warning(self, "Erreur", message)
 
     def retourner_livre(self):
         """Enregistre le retour d'un livre"""
-        if self.ret_emprunt_combo.count() == 0:
-            QMessageBox.warning(self, "Erreur", "Aucun emprunt actif!")
+        emprunt = self.ret_emprunt_input.objet_selectionne()
+        if emprunt is None:
+            QMessageBox.warning(self, "Erreur", "Choisissez un emprunt actif dans les suggestions!")
             return
 
-        emprunt = self.ret_emprunt_combo.currentData()
         success, message = self.bibliotheque.retourner_emprunt(emprunt.adherent, emprunt.livre)
 
         if success:
+            self.ret_emprunt_input.effacer()
             QMessageBox.information(self, "Succès", message)
-            self.actualiser_combos_emprunts()
-            self.actualiser_table_emprunts()
-            self.actualiser_table_documents()
         else:
             QMessageBox.warning(self, "Erreur", message)
 
+    def ajouter_au_panier_emprunts(self):
+        """Ajoute le livre choisi au panier d'emprunts"""
+        livre = self.emp_livre_input.objet_selectionne()
+        if livre is None:
+            QMessageBox.warning(self, "Erreur", "Choisissez un livre disponible dans les suggestions!")
+            return
+        if livre in self.panier_emprunts:
+            QMessageBox.warning(self, "Erreur", "Ce livre est déjà dans le panier!")
+            return
+        self.panier_emprunts.append(livre)
+        self.panier_emprunts_liste.addItem(self.libelle_livre(livre))
+        self.emp_livre_input.effacer()
+
+    def vider_panier_emprunts(self):
+        """Vide le panier d'emprunts"""
+        self.panier_emprunts = []
+        self.panier_emprunts_liste.clear()
+
+    def emprunter_panier(self):
+        """Emprunte tous les livres du panier (tout ou rien)"""
+        adherent = self.emp_adherent_input.objet_selectionne()
+        if adherent is None:
+            QMessageBox.warning(self, "Erreur", "Choisissez un adhérent dans les suggestions!")
+            return
+        if not self.panier_emprunts:
+            QMessageBox.warning(self, "Erreur", "Le panier est vide!")
+            return
+
+        success, message = self.bibliotheque.emprunter_lot(adherent, self.panier_emprunts)
+
+        if success:
+            self.vider_panier_emprunts()
+            # Une seule écriture pour tout le lot
+            self.lancer_sauvegarde(manuelle=False)
+            QMessageBox.information(self, "Reçu", message)
+        else:
+            QMessageBox.warning(self, "Erreur", message)
+
+    def ajouter_au_panier_retours(self):
+        """Ajoute l'emprunt choisi à la pile de retours"""
+        emprunt = self.ret_emprunt_input.objet_selectionne()
+        if emprunt is None:
+            QMessageBox.warning(self, "Erreur", "Choisissez un emprunt actif dans les suggestions!")
+            return
+        if emprunt in self.panier_retours:
+            QMessageBox.warning(self, "Erreur", "Cet emprunt est déjà dans la pile!")
+            return
+        self.panier_retours.append(emprunt)
+        self.panier_retours_liste.addItem(self.libelle_emprunt(emprunt))
+        self.ret_emprunt_input.effacer()
+
+    def vider_panier_retours(self):
+        """Vide la pile de retours"""
+        self.panier_retours = []
+        self.panier_retours_liste.clear()
+
+    def retourner_panier(self):
+        """Enregistre le retour de tous les livres de la pile (tout ou rien)"""
+        if not self.panier_retours:
+            QMessageBox.warning(self, "Erreur", "La pile de retours est vide!")
+            return
+
+        success, message = self.bibliotheque.retourner_lot(self.panier_retours)
+
+        if success:
+            self.vider_panier_retours()
+            self.lancer_sauvegarde(manuelle=False)
+            QMessageBox.information(self, "Reçu", message)
+        else:
+            QMessageBox.warning(self, "Erreur", message)
+
+    def reserver_livre(self):
+        """Réserve le livre emprunté choisi pour l'adhérent choisi"""
+        adherent = self.emp_adherent_input.objet_selectionne()
+        if adherent is None:
+            QMessageBox.warning(self, "Erreur", "Choisissez un adhérent dans les suggestions!")
+            return
+
+        emprunt = self.res_emprunt_input.objet_selectionne()
+        if emprunt is None:
+            QMessageBox.warning(self, "Erreur", "Choisissez un livre emprunté dans les suggestions!")
+            return
+
+        success, message = self.bibliotheque.reserver(adherent, emprunt.livre)
+
+        if success:
+            self.res_emprunt_input.effacer()
+            QMessageBox.information(self, "Succès", message)
+        else:
+            QMessageBox.warning(self, "Erreur", message)
+
+    def annuler_reservation_selectionnee(self):
+        """Annule la réservation sélectionnée dans les livres à retirer"""
+        ligne = self.reservations_pretes_liste.currentRow()
+        if ligne < 0 or ligne >= len(self.reservations_pretes):
+            QMessageBox.warning(self, "Erreur", "Sélectionnez un livre à retirer!")
+            return
+
+        reservation = self.reservations_pretes[ligne]
+        reponse = QMessageBox.question(
+            self, "Confirmation",
+            f"Annuler la réservation de {reservation.livre.titre} pour "
+            f"{self.libelle_adherent(reservation.adherent)} ?")
+        if reponse != QMessageBox.StandardButton.Yes:
+            return
+
+        success, message = self.bibliotheque.annuler_reservation(reservation.adherent,
+                                                                 reservation.livre)
+        if not success:
+            QMessageBox.warning(self, "Erreur", message)
+
+    def actualiser_reservations_pretes(self):
+        """Actualise la liste des livres mis de côté à retirer"""
+        self.reservations_pretes = self.bibliotheque.get_reservations_pretes()
+        self.reservations_pretes_liste.clear()
+        for reservation in self.reservations_pretes:
+            self.reservations_pretes_liste.addItem(
+                f"{reservation.livre.titre} - {self.libelle_adherent(reservation.adherent)} "
+                f"(depuis le {reservation.date_mise_de_cote.strftime('%d/%m/%Y')})")
+
     def actualiser_table_emprunts(self):
-        """Actualise l'affichage de la table des emprunts"""
-        emprunts = self.bibliotheque.get_emprunts()
-        self.emprunts_table.setRowCount(len(emprunts))
-
-        for i, emp in enumerate(emprunts):
-            # Adhérent
-            adherent_text = f"{emp.adherent.prenom} {emp.adherent.nom}"
-            self.emprunts_table.setItem(i, 0, QTableWidgetItem(adherent_text))
-
-            # Livre
-            self.emprunts_table.setItem(i, 1, QTableWidgetItem(emp.livre.titre))
-
-            # Date emprunt
-            date_emp = emp.date_emprunt.strftime('%d/%m/%Y')
-            self.emprunts_table.setItem(i, 2, QTableWidgetItem(date_emp))
-
-            # Date retour
-            date_ret = emp.date_retour.strftime('%d/%m/%Y') if emp.date_retour else "En cours"
-            self.emprunts_table.setItem(i, 3, QTableWidgetItem(date_ret))
-
-            # Statut
-            if emp.est_actif():
-                if emp.est_en_retard():
-                    statut = f"️RETARD ({emp.jours_retard()} j)"
-                else:
-                    statut = "En cours"
-            else:
-                statut = "Retourné"
-            self.emprunts_table.setItem(i, 4, QTableWidgetItem(statut))
+        """Actualise l'affichage de la table des emprunts (page courante)"""
+        self.emprunts_modele.actualiser()
+
+    def filtrer_emprunts(self):
+        """Applique les filtres de l'historique des emprunts"""
+        date_debut = date_fin = None
+        if self.filtre_periode_check.isChecked():
+            qdebut = self.filtre_debut_input.date()
+            qfin = self.filtre_fin_input.date()
+            date_debut = date(qdebut.year(), qdebut.month(), qdebut.day())
+            date_fin = date(qfin.year(), qfin.month(), qfin.day())
+
+        self.emprunts_modele.definir_filtres(
+            adherent=self.filtre_adherent_input.objet_selectionne(),
+            livre=self.filtre_livre_input.objet_selectionne(),
+            statut=self.filtre_statut_combo.currentData(),
+            date_debut=date_debut,
+            date_fin=date_fin)
+
+    def reinitialiser_filtres_emprunts(self):
+        """Retire tous les filtres de l'historique des emprunts"""
+        self.filtre_adherent_input.effacer()
+        self.filtre_livre_input.effacer()
+        self.filtre_statut_combo.setCurrentIndex(0)
+        self.filtre_periode_check.setChecked(False)
+        self.emprunts_modele.definir_filtres()
+
+    def actualiser_pagination_emprunts(self):
+        """Affiche la page courante et le nombre d'emprunts trouvés"""
+        modele = self.emprunts_modele
+        self.emprunts_page_label.setText(
+            f"Page {modele.page + 1} / {modele.nombre_pages()} ({modele.total} emprunts)")
 
     # ========== Onglet Statistiques ==========
 
@@ -563,7 +869,8 @@ class BibliothequeGUI(QWidget):
 
     def actualiser_statistiques(self):
         """Actualise l'affichage des statistiques"""
-        stats = self.bibliotheque.get_statistiques()
+        aujourd_hui = self.bibliotheque.aujourd_hui()
+        stats = self.bibliotheque.get_statistiques(aujourd_hui)
 
         text = f"""
         STATISTIQUES DE LA BIBLIOTHÈQUE
@@ -575,6 +882,7 @@ class BibliothequeGUI(QWidget):
         • Livres : {stats['total_livres']}
         • Livres disponibles : {stats['livres_disponibles']}
         • Livres empruntés : {stats['livres_empruntes']}
+        • Exemplaires disponibles : {stats['exemplaires_disponibles']} / {stats['total_exemplaires']}
 
         ADHÉRENTS
         ─────────────────
@@ -587,36 +895,223 @@ class BibliothequeGUI(QWidget):
         • Emprunts en retard : {stats['emprunts_retard']}
         """
 
+        # Activité des douze derniers mois (agrégats mensuels pré-calculés)
+        if aujourd_hui.month == 12:
+            debut = date(aujourd_hui.year, 1, 1)
+        else:
+            debut = date(aujourd_hui.year - 1, aujourd_hui.month + 1, 1)
+        text += "\n\n ACTIVITÉ MENSUELLE (emprunts / retours / passages en retard)\n─────────────────\n"
+        for mois, emprunts, retours, retards in self.bibliotheque.get_series(
+                debut, aujourd_hui, SeriesEmprunts.PAS_MOIS):
+            text += f"• {mois.strftime('%m/%Y')} : {emprunts} / {retours} / {retards}\n"
+
+        # Palmarès sur fenêtres glissantes (tenus à jour à chaque emprunt)
+        for jours in (30, 365):
+            circulation = self.bibliotheque.get_circulation(jours)
+            text += f"\n\n CIRCULATION SUR {jours} JOURS\n─────────────────\n"
+            text += (f"• {circulation['emprunts']} emprunt(s), "
+                     f"{circulation['retours']} retour(s)\n")
+            text += "• Livres les plus empruntés :\n"
+            for livre, nombre in self.bibliotheque.get_livres_populaires(5, jours):
+                text += f"    {livre.titre} ({nombre})\n"
+            text += "• Adhérents les plus actifs :\n"
+            for adherent, nombre in self.bibliotheque.get_adherents_actifs(5, jours):
+                text += f"    {self.libelle_adherent(adherent)} ({nombre})\n"
+            text += "• Auteurs les plus lus :\n"
+            for auteur, nombre in self.bibliotheque.get_circulation_auteurs(5, jours):
+                text += f"    {auteur} ({nombre})\n"
+
         # Ajouter liste des retards
-        retards = self.bibliotheque.get_emprunts_en_retard()
+        retards = self.bibliotheque.get_emprunts_en_retard(aujourd_hui)
         if retards:
             text += "\n\n EMPRUNTS EN RETARD\n─────────────────\n"
             for emp in retards:
                 text += f"• {emp.livre.titre} - {emp.adherent.prenom} {emp.adherent.nom} "
-                text += f"({emp.jours_retard()} jours de retard)\n"
+                text += f"({emp.jours_retard(aujourd_hui)} jours de retard)\n"
 
         self.stats_text.setPlainText(text)
 
-    # ========== Actions globales ==========
+    # ========== Mises à jour incrémentales ==========
 
-    def sauvegarder_donnees(self):
-        """Sauvegarde toutes les données"""
-        if FileManager.sauvegarder_bibliotheque(self.bibliotheque):
-            QMessageBox.information(self, "Succès", "Données sauvegardées avec succès!")
+    def bibliotheque_modifiee(self, evenements):
+        """
+        Met à jour uniquement les lignes touchées par un lot de modifications
+        (les sélecteurs interrogent la bibliothèque à la demande)
+        """
+        # Sauvegarde automatique après une courte période sans modification
+        self.minuteur_sauvegarde.start()
+
+        if any(isinstance(e, EvenementReservation) for e in evenements):
+            self.actualiser_reservations_pretes()
+            evenements = [e for e in evenements if not isinstance(e, EvenementReservation)]
+            if not evenements:
+                return
+
+        if len(evenements) > 1:
+            # Lot : les positions ne sont plus celles de la liste actuelle,
+            # chaque table concernée est relue une seule fois
+            modeles = {self.adherents_modele if isinstance(e, EvenementAdherent)
+                       else self.documents_modele if isinstance(e, EvenementDocument)
+                       else self.emprunts_modele for e in evenements}
+            for modele in modeles:
+                modele.actualiser()
+            return
+
+        evenement = evenements[0]
+        if isinstance(evenement, AdherentAjoute):
+            self.adherents_modele.ligne_inseree(evenement.ligne, evenement.objet)
+        elif isinstance(evenement, AdherentEnleve):
+            self.adherents_modele.ligne_supprimee(evenement.ligne)
+        elif isinstance(evenement, DocumentAjoute):
+            self.documents_modele.ligne_inseree(evenement.ligne, evenement.objet)
+        elif isinstance(evenement, DocumentEnleve):
+            self.documents_modele.ligne_supprimee(evenement.ligne)
+        elif isinstance(evenement, DocumentModifie):
+            self.documents_modele.ligne_modifiee(evenement.ligne)
+        elif isinstance(evenement, EvenementEmprunt):
+            # Seule la page affichée est relue
+            self.emprunts_modele.actualiser()
+
+    # ========== Chargement et sauvegarde en arrière-plan ==========
+
+    def charger_donnees(self):
+        """Lance le chargement des fichiers sans bloquer l'interface"""
+        self.tabs.setEnabled(False)
+        self.afficher_progression(0, "Chargement des données...")
+        self.tache_chargement = TacheChargement(self)
+        self.tache_chargement.progression.connect(self.afficher_progression)
+        self.tache_chargement.terminee.connect(self.chargement_termine)
+        self.tache_chargement.start()
+
+    def chargement_termine(self, bibliotheque):
+        """Affiche la bibliothèque chargée"""
+        self.tache_chargement.wait()
+        self.tache_chargement = None
+        self.definir_bibliotheque(bibliotheque)
+        self.tabs.setEnabled(True)
+        self.masquer_progression()
+
+    def definir_bibliotheque(self, bibliotheque):
+        """Remplace la bibliothèque affichée"""
+        self.bibliotheque.desabonner(self.bibliotheque_modifiee)
+        self.bibliotheque = bibliotheque
+        for modele in (self.adherents_modele, self.documents_modele, self.emprunts_modele):
+            modele.bibliotheque = bibliotheque
+        for selecteur in (self.emp_adherent_input, self.emp_livre_input, self.ret_emprunt_input,
+                          self.res_emprunt_input, self.filtre_adherent_input,
+                          self.filtre_livre_input):
+            selecteur.effacer()
+        self.vider_panier_emprunts()
+        self.vider_panier_retours()
+        self.actualiser_reservations_pretes()
+        self.emprunts_modele.definir_filtres()
+        self.actualiser_statistiques()
+        self.bibliotheque.abonner(self.bibliotheque_modifiee, par_lot=True)
+
+    def afficher_progression(self, pourcentage, message):
+        """Affiche la progression d'une tâche de fond (pourcentage < 0 : indéterminée)"""
+        self.etat_label.setText(message)
+        if pourcentage < 0:
+            self.barre_progression.setRange(0, 0)
         else:
+            self.barre_progression.setRange(0, 100)
+            self.barre_progression.setValue(pourcentage)
+        self.barre_progression.show()
+
+    def masquer_progression(self, message=""):
+        """Masque la barre de progression"""
+        self.barre_progression.hide()
+        self.etat_label.setText(message)
+
+    def sauvegarde_automatique(self):
+        """Sauvegarde déclenchée après une série de modifications"""
+        self.lancer_sauvegarde(manuelle=False)
+
+    def lancer_sauvegarde(self, manuelle):
+        """
+        Sauvegarde un instantané de la bibliothèque dans un thread séparé
+        (une seule sauvegarde à la fois, la suivante attend la fin de la précédente)
+        """
+        if self.tache_sauvegarde is not None:
+            self.sauvegarde_en_attente = bool(self.sauvegarde_en_attente) or manuelle
+            return
+
+        self.minuteur_sauvegarde.stop()
+        self.afficher_progression(-1, "Sauvegarde en cours...")
+        self.tache_sauvegarde = TacheSauvegarde(self.bibliotheque.instantane(), self)
+        self.tache_sauvegarde.terminee.connect(
+            lambda succes: self.sauvegarde_terminee(succes, manuelle))
+        self.tache_sauvegarde.start()
+
+    def sauvegarde_terminee(self, succes, manuelle):
+        """Traite la fin d'une sauvegarde en arrière-plan"""
+        self.tache_sauvegarde.wait()
+        self.tache_sauvegarde.instantane.fermer()
+        self.tache_sauvegarde = None
+
+        if succes:
+            self.masquer_progression(f"Sauvegardé à {datetime.now().strftime('%H:%M:%S')}")
+        else:
+            self.masquer_progression("Échec de la sauvegarde")
+
+        if self.fermeture_demandee and self.sauvegarde_en_attente is not None:
+            # Une sauvegarde plus récente attend : c'est elle qui fermera la fenêtre
+            self.sauvegarde_en_attente = None
+            self.lancer_sauvegarde(manuelle=False)
+            return
+
+        if self.fermeture_demandee:
+            self.fermeture_demandee = False
+            if succes:
+                self.fermeture_autorisee = True
+                self.close()
+                return
+            self.setEnabled(True)
             QMessageBox.critical(self, "Erreur", "Erreur lors de la sauvegarde!")
+            return
+
+        if manuelle:
+            if succes:
+                QMessageBox.information(self, "Succès", "Données sauvegardées avec succès!")
+            else:
+                QMessageBox.critical(self, "Erreur", "Erreur lors de la sauvegarde!")
+
+        if self.sauvegarde_en_attente is not None:
+            manuelle_suivante = self.sauvegarde_en_attente
+            self.sauvegarde_en_attente = None
+            self.lancer_sauvegarde(manuelle_suivante)
+        elif (succes and self.bibliotheque.etat_fichiers.get('fusion')
+              and not self.minuteur_sauvegarde.isActive()):
+            # Une autre instance a modifié les fichiers : afficher les données fusionnées
+            self.charger_donnees()
+
+    # ========== Actions globales ==========
+
+    def sauvegarder_donnees(self):
+        """Sauvegarde toutes les données (en arrière-plan)"""
+        self.lancer_sauvegarde(manuelle=True)
 
     def actualiser_affichage(self):
-        """Actualise tous les affichages"""
-        self.actualiser_table_adherents()
-        self.actualiser_table_documents()
-        self.actualiser_combos_emprunts()
+        """
+        Actualise les affichages qui dépendent de la date du jour
+        (les tables et les listes suivent déjà chaque modification)
+        """
         self.actualiser_table_emprunts()
         self.actualiser_statistiques()
         QMessageBox.information(self, "Succès", "Affichage actualisé!")
 
     def closeEvent(self, event):
         """Gère la fermeture de l'application"""
+        if self.fermeture_autorisee:
+            event.accept()
+            return
+
+        if self.tache_chargement is not None:
+            # Rien à sauvegarder tant que les données ne sont pas chargées
+            self.tache_chargement.wait()
+            event.accept()
+            return
+
         reply = QMessageBox.question(self, "Confirmation",
                                      "Voulez-vous sauvegarder avant de quitter?",
                                      QMessageBox.StandardButton.Yes |
@@ -624,18 +1119,37 @@ class BibliothequeGUI(QWidget):
                                      QMessageBox.StandardButton.Cancel)
 
         if reply == QMessageBox.StandardButton.Yes:
-            self.sauvegarder_donnees()
-            event.accept()
+            # La fenêtre se ferme à la fin de la sauvegarde (voir sauvegarde_terminee)
+            self.fermeture_demandee = True
+            self.setEnabled(False)
+            self.lancer_sauvegarde(manuelle=False)
+            event.ignore()
         elif reply == QMessageBox.StandardButton.No:
+            self.minuteur_sauvegarde.stop()
+            if self.tache_sauvegarde is not None:
+                self.tache_sauvegarde.wait()
             event.accept()
         else:
             event.ignore()
 
 
-def lancer_application():
-    """Lance l'application GUI"""
+def lancer_application(profileur=None):
+    """
+    Lance l'application GUI
+    Args:
+        profileur: Profileur du mode --profil, dont la section « demarrage »
+                   est en cours ; chaque rafraîchissement actualiser_* est profilé
+    """
     import sys
     app = QApplication(sys.argv)
+    if profileur:
+        profileur.envelopper(BibliothequeGUI, prefixe="actualiser_")
     fenetre = BibliothequeGUI()
     fenetre.show()
-    sys.exit(app.exec())
\ No newline at end of file
+    if profileur:
+        profileur.terminer("demarrage")
+    code = app.exec()
+    if profileur:
+        profileur.fermer()
+        print(f"{len(profileur.fichiers)} fichiers de profil dans {profileur.dossier}")
+    sys.exit(code)
\ No newline at end of file
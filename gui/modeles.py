@@ -0,0 +1,301 @@
+"""
+Modèles Qt (model/view) branchés directement sur la Bibliotheque
+
+Les vues ne demandent que les cellules visibles : aucune donnée n'est
+recopiée dans des QTableWidgetItem, quelle que soit la taille des tables.
+"""
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QAbstractListModel, QModelIndex
+
+from classes.bibliotheque import Bibliotheque
+from classes.document import Livre
+
+
+class ModeleTable(QAbstractTableModel):
+    """Modèle de base : une ligne par élément de la bibliothèque"""
+
+    ENTETES = []
+
+    def __init__(self, bibliotheque, parent=None):
+        super().__init__(parent)
+        self._bibliotheque = bibliotheque
+        # Éléments tels que les vues les connaissent : la bibliothèque
+        # notifie après coup, cette liste ne change qu'entre begin* et end*
+        self._elements = self._lire()
+
+    @property
+    def bibliotheque(self):
+        """Retourne la bibliothèque affichée"""
+        return self._bibliotheque
+
+    @bibliotheque.setter
+    def bibliotheque(self, value):
+        """Change la bibliothèque affichée"""
+        self._bibliotheque = value
+        self.actualiser()
+
+    def _lire(self):
+        """Retourne les éléments à afficher, lus dans la bibliothèque"""
+        return []
+
+    def _compter(self):
+        """Retourne le nombre de lignes"""
+        return len(self._elements)
+
+    def _element(self, ligne):
+        """Retourne l'objet affiché à une ligne"""
+        return self._elements[ligne]
+
+    def _texte(self, element, colonne):
+        """Retourne le texte d'une cellule (à implémenter dans les sous-classes)"""
+        raise NotImplementedError("Méthode à implémenter dans les sous-classes")
+
+    def element(self, index):
+        """
+        Retourne l'objet correspondant à un index de la vue
+        """
+        if not index.isValid() or index.row() >= self._compter():
+            return None
+        return self._element(index.row())
+
+    def actualiser(self):
+        """Relit tous les éléments et le signale à la vue"""
+        self.beginResetModel()
+        self._elements = self._lire()
+        self.endResetModel()
+
+    # La bibliothèque notifie après coup : les méthodes suivantes reportent
+    # le changement dans la liste du modèle, entre begin* et end*, sans
+    # relire le reste de la table.
+
+    def ligne_inseree(self, ligne, element):
+        """Ajoute un élément à une ligne"""
+        self.beginInsertRows(QModelIndex(), ligne, ligne)
+        self._elements.insert(ligne, element)
+        self.endInsertRows()
+
+    def ligne_supprimee(self, ligne):
+        """Supprime la ligne d'un élément"""
+        self.beginRemoveRows(QModelIndex(), ligne, ligne)
+        del self._elements[ligne]
+        self.endRemoveRows()
+
+    def ligne_modifiee(self, ligne):
+        """Signale la modification d'une ligne"""
+        self.dataChanged.emit(self.index(ligne, 0),
+                              self.index(ligne, len(self.ENTETES) - 1))
+
+    # ========== Interface QAbstractTableModel ==========
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._compter()
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.ENTETES)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        element = self.element(index)
+        if element is None:
+            return None
+        return self._texte(element, index.column())
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.ENTETES[section]
+        return str(section + 1)
+
+
+class ModeleAdherents(ModeleTable):
+    """Modèle de la table des adhérents"""
+
+    ENTETES = ["Nom", "Prénom", "Email"]
+
+    def _lire(self):
+        return self._bibliotheque.get_adherents()
+
+    def _texte(self, adherent, colonne):
+        if colonne == 0:
+            return adherent.nom
+        if colonne == 1:
+            return adherent.prenom
+        return adherent.email
+
+
+class ModeleDocuments(ModeleTable):
+    """Modèle de la table des documents"""
+
+    ENTETES = ["Type", "Titre", "Info", "Statut"]
+
+    def _lire(self):
+        return self._bibliotheque.get_documents()
+
+    def _texte(self, doc, colonne):
+        if colonne == 0:
+            return doc.__class__.__name__
+        if colonne == 1:
+            return doc.titre
+        if colonne == 2:
+            info = ""
+            if hasattr(doc, 'auteur'):
+                info = f"Auteur: {doc.auteur}"
+            if hasattr(doc, 'dessinateur'):
+                info += f" | Dessin: {doc.dessinateur}"
+            if hasattr(doc, 'date_parution'):
+                info = f"Date: {doc.date_parution.strftime('%d/%m/%Y')}"
+            return info
+        if isinstance(doc, Livre):
+            if doc.exemplaires > 1:
+                return f"{doc.disponibles}/{doc.exemplaires} disponibles"
+            return "Disponible" if doc.disponible else "Emprunté"
+        return "Consultation sur place"
+
+
+class ModeleEmprunts(ModeleTable):
+    """
+    Modèle paginé de l'historique des emprunts : seule la page courante est
+    demandée à la bibliothèque (Bibliotheque.rechercher_emprunts)
+    """
+
+    ENTETES = ["Adhérent", "Livre", "Date Emprunt", "Date Retour", "Statut"]
+    COLONNE_DATE = 2
+    COLONNE_STATUT = 4
+
+    def __init__(self, bibliotheque, parent=None, taille_page=100):
+        super().__init__(bibliotheque, parent)
+        self._taille_page = taille_page
+        self._page = 0
+        self._filtres = {}
+        self._tri = Bibliotheque.TRI_DATE
+        self._decroissant = True
+        self._lignes = []
+        self._total = 0
+        # Une seule date de référence pour toutes les lignes d'un affichage
+        self._aujourd_hui = bibliotheque.aujourd_hui()
+
+    @property
+    def page(self):
+        """Retourne la page courante (à partir de 0)"""
+        return self._page
+
+    @property
+    def total(self):
+        """Retourne le nombre d'emprunts correspondant aux filtres"""
+        return self._total
+
+    def nombre_pages(self):
+        """Retourne le nombre de pages (au moins 1)"""
+        return max(1, -(-self._total // self._taille_page))
+
+    def definir_filtres(self, **filtres):
+        """
+        Applique des filtres (arguments de Bibliotheque.rechercher_emprunts :
+        adherent, livre, statut, date_debut, date_fin) et revient à la première page
+        """
+        self._filtres = {cle: valeur for cle, valeur in filtres.items() if valeur is not None}
+        self._page = 0
+        self.actualiser()
+
+    def aller_a_page(self, page):
+        """Affiche une autre page"""
+        self._page = max(0, min(page, self.nombre_pages() - 1))
+        self.actualiser()
+
+    def actualiser(self):
+        """Relit la page courante"""
+        self._aujourd_hui = self._bibliotheque.aujourd_hui()
+        self.beginResetModel()
+        self._lignes, self._total = self._bibliotheque.rechercher_emprunts(
+            tri=self._tri, decroissant=self._decroissant, page=self._page,
+            taille_page=self._taille_page, date_reference=self._aujourd_hui,
+            **self._filtres)
+        if not self._lignes and self._page > 0:
+            # La page courante n'existe plus (filtre plus restrictif)
+            self._page = self.nombre_pages() - 1
+            self._lignes, self._total = self._bibliotheque.rechercher_emprunts(
+                tri=self._tri, decroissant=self._decroissant, page=self._page,
+                taille_page=self._taille_page, date_reference=self._aujourd_hui,
+                **self._filtres)
+        self.endResetModel()
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        """Tri demandé par un clic sur l'en-tête (date ou statut)"""
+        self._tri = (Bibliotheque.TRI_STATUT if column == self.COLONNE_STATUT
+                     else Bibliotheque.TRI_DATE)
+        self._decroissant = order == Qt.SortOrder.DescendingOrder
+        self._page = 0
+        self.actualiser()
+
+    def _compter(self):
+        return len(self._lignes)
+
+    def _element(self, ligne):
+        return self._lignes[ligne]
+
+    def _texte(self, emp, colonne):
+        if colonne == 0:
+            return f"{emp.adherent.prenom} {emp.adherent.nom}"
+        if colonne == 1:
+            return emp.livre.titre
+        if colonne == 2:
+            return emp.date_emprunt.strftime('%d/%m/%Y')
+        if colonne == 3:
+            return emp.date_retour.strftime('%d/%m/%Y') if emp.date_retour else "En cours"
+        if emp.est_actif():
+            jours = emp.jours_retard(self._aujourd_hui)
+            if jours > 0:
+                return f"️RETARD ({jours} j)"
+            return "En cours"
+        return "Retourné"
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if (role == Qt.ItemDataRole.DisplayRole and
+                orientation == Qt.Orientation.Vertical):
+            return str(self._page * self._taille_page + section + 1)
+        return super().headerData(section, orientation, role)
+
+
+class ModeleSuggestions(QAbstractListModel):
+    """Modèle des suggestions d'un sélecteur : seulement les résultats de la dernière recherche"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._libelles = []
+        self._objets = []
+
+    def definir(self, objets, libelle):
+        """
+        Remplace les suggestions
+        Args:
+            objets: objets trouvés
+            libelle: fonction donnant le texte affiché pour un objet
+        """
+        self.beginResetModel()
+        self._objets = list(objets)
+        self._libelles = [libelle(o) for o in self._objets]
+        self.endResetModel()
+
+    def objet(self, texte):
+        """Retourne l'objet suggéré sous ce libellé, ou None"""
+        for libelle, objet in zip(self._libelles, self._objets):
+            if libelle == texte:
+                return objet
+        return None
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._libelles)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole,
+                                               Qt.ItemDataRole.EditRole):
+            return None
+        return self._libelles[index.row()]
@@ -0,0 +1,70 @@
+"""
+Sélecteurs avec saisie semi-automatique pour choisir un adhérent, un livre
+ou un emprunt sans remplir de liste déroulante
+"""
+
+from PyQt6.QtWidgets import QLineEdit, QCompleter
+from PyQt6.QtCore import Qt
+
+from gui.modeles import ModeleSuggestions
+
+
+class SelecteurRecherche(QLineEdit):
+    """
+    Champ de saisie qui interroge la bibliothèque à chaque frappe et propose
+    les résultats dans un QCompleter : rien n'est chargé à l'avance.
+    """
+
+    # Nombre maximal de suggestions affichées
+    LIMITE = 50
+
+    def __init__(self, rechercher, libelle, texte_aide="", parent=None):
+        """
+        Initialise le sélecteur
+        Args:
+            rechercher: fonction (prefixe, limite) -> liste d'objets
+            libelle: fonction donnant le texte affiché pour un objet
+            texte_aide: texte affiché quand le champ est vide
+        """
+        super().__init__(parent)
+        self._rechercher = rechercher
+        self._libelle = libelle
+        self._selection = None
+
+        self.setPlaceholderText(texte_aide)
+        self._modele = ModeleSuggestions(self)
+        completer = QCompleter(self._modele, self)
+        # Le filtrage est fait par les index de la bibliothèque
+        completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        completer.activated[str].connect(self._choisir)
+        self.setCompleter(completer)
+
+        self.textEdited.connect(self._actualiser_suggestions)
+
+    def _actualiser_suggestions(self, texte):
+        """Recherche les objets correspondant au texte saisi"""
+        self._selection = None
+        if not texte.strip():
+            self._modele.definir([], self._libelle)
+            return
+        self._modele.definir(self._rechercher(texte, self.LIMITE), self._libelle)
+        self.completer().complete()
+
+    def _choisir(self, texte):
+        """Mémorise l'objet choisi dans les suggestions"""
+        self._selection = self._modele.objet(texte)
+
+    def objet_selectionne(self):
+        """
+        Retourne l'objet choisi, ou None si le texte ne correspond à aucune suggestion
+        """
+        if self._selection is not None and self._libelle(self._selection) == self.text():
+            return self._selection
+        return self._modele.objet(self.text())
+
+    def effacer(self):
+        """Vide le champ et la sélection"""
+        self._selection = None
+        self._modele.definir([], self._libelle)
+        self.clear()
@@ -0,0 +1,49 @@
+"""
+Tâches de fond (chargement et sauvegarde) exécutées hors du thread de l'interface
+"""
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from utils.file_manager import FileManager
+
+
+class TacheChargement(QThread):
+    """Charge la bibliothèque depuis les fichiers dans un thread séparé"""
+
+    progression = pyqtSignal(int, str)
+    terminee = pyqtSignal(object)
+
+    def run(self):
+        """Charge les données et émet la bibliothèque obtenue"""
+        bibliotheque = FileManager.charger_bibliotheque(self.progression.emit,
+                                                        recommandations=True)
+        self.terminee.emit(bibliotheque)
+
+
+class TacheSauvegarde(QThread):
+    """
+    Sauvegarde un instantané de la bibliothèque dans un thread séparé.
+    L'instantané reste cohérent pendant que l'interface continue de modifier
+    la bibliothèque ; il doit être fermé par le thread de l'interface une
+    fois la tâche terminée.
+    """
+
+    terminee = pyqtSignal(bool)
+
+    def __init__(self, instantane, parent=None):
+        super().__init__(parent)
+        self._instantane = instantane
+
+    @property
+    def instantane(self):
+        """Retourne l'instantané sauvegardé"""
+        return self._instantane
+
+    def run(self):
+        """Écrit l'instantané et émet le résultat de la sauvegarde"""
+        try:
+            succes = FileManager.sauvegarder_bibliotheque(self._instantane)
+        except Exception as e:
+            print(f"Erreur lors de la sauvegarde: {e}")
+            succes = False
+        self.terminee.emit(succes)
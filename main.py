@@ -8,7 +8,6 @@ import os
 # Ajouter le répertoire parent au path pour les imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from gui.interface import lancer_application
 from utils.file_manager import FileManager
 
 
@@ -24,7 +23,8 @@ def initialiser_application():
     print("✓ Fichiers de données initialisés")
 
     # Vérifier si les fichiers sont vides (première utilisation)
-    if os.path.getsize(FileManager.ADHERENTS_FILE) == 0:
+    # Sans terminal (lancement planifié ou redirigé), ne pas bloquer sur la question
+    if os.path.getsize(FileManager.ADHERENTS_FILE) == 0 and sys.stdin and sys.stdin.isatty():
         print("\n Première utilisation détectée")
         reponse = input("Voulez-vous créer des données de test? (o/n): ")
 
@@ -42,14 +42,71 @@ def initialiser_application():
     print()
 
 
-def main():
-    """Fonction principale"""
+def extraire_profil(arguments):
+    """
+    Retire l'option --profil[=DOSSIER] des arguments
+    Returns:
+        tuple: (dossier des profils ou None, arguments restants)
+    """
+    dossier = None
+    restants = []
+    for argument in arguments:
+        if argument == "--profil":
+            dossier = "profils"
+        elif argument.startswith("--profil="):
+            dossier = argument.split("=", 1)[1] or "profils"
+        else:
+            restants.append(argument)
+    return dossier, restants
+
+
+def creer_profileur(dossier):
+    """
+    Crée le profileur du mode --profil : le chargement de la bibliothèque
+    est profilé à chaque appel
+    """
+    # Import différé : sans --profil, cProfile et tracemalloc ne sont pas chargés
+    from utils.profilage import Profileur
+    profileur = Profileur(dossier)
+    profileur.envelopper(FileManager, "charger_bibliotheque")
+    print(f"Profilage activé : profils écrits dans {os.path.abspath(dossier)}")
+    return profileur
+
+
+def main(arguments=None):
+    """
+    Fonction principale
+    Avec des arguments, exécute la commande demandée sans interface graphique ;
+    sinon lance l'interface PyQt6.
+    Avec --profil[=DOSSIER], le démarrage, le chargement et les
+    rafraîchissements de l'interface sont profilés (voir utils/profilage.py).
+    """
+    if arguments is None:
+        arguments = sys.argv[1:]
+
+    dossier_profils, arguments = extraire_profil(arguments)
+    profileur = creer_profileur(dossier_profils) if dossier_profils else None
+
+    if arguments:
+        # Mode ligne de commande : PyQt6 n'est pas importé
+        from cli import executer
+        if profileur is None:
+            sys.exit(executer(arguments))
+        with profileur.section("commande"):
+            code = executer(arguments)
+        profileur.fermer()
+        sys.exit(code)
+
     try:
+        if profileur:
+            profileur.commencer("demarrage")
+
         # Initialiser l'application
         initialiser_application()
 
-        # Lancer l'interface graphique
-        lancer_application()
+        # Import différé : PyQt6 n'est chargé que pour l'interface graphique
+        from gui.interface import lancer_application
+        lancer_application(profileur)
 
     except KeyboardInterrupt:
         print("\n\n Application interrompue par l'utilisateur")
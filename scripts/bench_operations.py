@@ -0,0 +1,222 @@
+"""
+Banc d'essai des opérations courantes à plusieurs échelles : chargement,
+sauvegarde, recherches, emprunt, retour, statistiques et retards, sur des
+jeux synthétiques de 1 000, 100 000 et 1 000 000 d'emprunts.
+
+Les résultats sont écrits en JSON (sortie standard ou --sortie) ; avec
+--reference, chaque mesure est comparée à celle d'un résultat précédent et
+le code de sortie vaut 1 si une opération a ralenti au-delà du seuil.
+
+Usage: python scripts/bench_operations.py [--tailles 1000,100000,1000000]
+           [--repetitions N] [--reference FICHIER] [--seuil RAPPORT] [--sortie FICHIER]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from classes.horloge import HorlogeFixe
+from utils.file_manager import FileManager
+from utils.generateur import generer_donnees
+
+FORMAT = 1
+DATE_REFERENCE = date(2026, 6, 30)
+
+# Appels par mesure pour les opérations unitaires (temps par appel = moyenne)
+APPELS = 1000
+APPELS_RECHERCHE = 20000
+
+# Écart absolu (secondes par appel) en dessous duquel un ralentissement
+# relève du bruit de mesure
+PLANCHER = 2e-6
+
+
+def signaler(message):
+    """Affiche l'avancement sur la sortie d'erreur (la sortie standard reste du JSON)"""
+    print(message, file=sys.stderr, flush=True)
+
+
+def mesurer(fonction, repetitions, appels=1):
+    """
+    Chronomètre une fonction
+    Args:
+        fonction: appelée avec le numéro de l'appel (0 à appels - 1)
+    Returns:
+        list: temps par appel de chaque répétition, en secondes
+    """
+    temps = []
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        for i in range(appels):
+            fonction(i)
+        temps.append((time.perf_counter() - debut) / appels)
+    return temps
+
+
+def resultat(taille, operation, temps, appels):
+    """Met en forme une mesure"""
+    return {'taille': taille, 'operation': operation,
+            'secondes': statistics.median(temps), 'min': min(temps),
+            'repetitions': len(temps), 'appels': appels}
+
+
+def bencher_taille(taille, repetitions, graine):
+    """
+    Mesure toutes les opérations sur un jeu de `taille` emprunts
+    Returns:
+        list: mesures (voir resultat)
+    """
+    nb_adherents = max(taille // 50, 10)
+    nb_documents = max(taille // 10, 20)
+    dossier = tempfile.mkdtemp(prefix="bench_biblio_")
+    mesures = []
+    try:
+        FileManager.definir_dossier_data(dossier)
+        generer_donnees(nb_adherents, nb_documents, taille, graine=graine,
+                        date_fin=DATE_REFERENCE)
+        hasard = random.Random(graine)
+
+        temps_chargements = []
+        for _ in range(repetitions):
+            debut = time.perf_counter()
+            bibliotheque = FileManager.charger_bibliotheque()
+            temps_chargements.append(time.perf_counter() - debut)
+        mesures.append(resultat(taille, "charger", temps_chargements, 1))
+        bibliotheque.horloge = HorlogeFixe(DATE_REFERENCE)
+
+        adherents = bibliotheque.get_adherents()
+        documents = bibliotheque.get_documents()
+        livres = bibliotheque.get_livres_disponibles()
+        appels = min(APPELS, len(livres))
+
+        cibles = [hasard.choice(adherents) for _ in range(APPELS_RECHERCHE)]
+        mesures.append(resultat(taille, "rechercher_adherent", mesurer(
+            lambda i: bibliotheque.rechercher_adherent(cibles[i].nom, cibles[i].prenom),
+            repetitions, APPELS_RECHERCHE), APPELS_RECHERCHE))
+
+        titres = [hasard.choice(documents).titre for _ in range(APPELS_RECHERCHE)]
+        mesures.append(resultat(taille, "rechercher_document", mesurer(
+            lambda i: bibliotheque.rechercher_document(titres[i]), repetitions,
+            APPELS_RECHERCHE), APPELS_RECHERCHE))
+
+        # Emprunts puis retours des mêmes couples, à chaque répétition
+        temps_emprunts, temps_retours = [], []
+        for _ in range(repetitions):
+            couples = [(hasard.choice(adherents), livre)
+                       for livre in hasard.sample(livres, appels)]
+            reussis = []
+
+            def emprunter(i):
+                if bibliotheque.ajouter_emprunt(*couples[i])[0]:
+                    reussis.append(couples[i])
+            temps_emprunts += mesurer(emprunter, 1, appels)
+            if reussis:
+                temps_retours += mesurer(
+                    lambda i: bibliotheque.retourner_emprunt(*reussis[i]), 1, len(reussis))
+        mesures.append(resultat(taille, "ajouter_emprunt", temps_emprunts, appels))
+        mesures.append(resultat(taille, "retourner_emprunt", temps_retours, appels))
+
+        mesures.append(resultat(taille, "get_statistiques", mesurer(
+            lambda _: bibliotheque.get_statistiques(), repetitions), 1))
+        mesures.append(resultat(taille, "get_emprunts_en_retard", mesurer(
+            lambda _: bibliotheque.get_emprunts_en_retard(), repetitions), 1))
+
+        # Sauvegarde après un emprunt : ce que fait la sauvegarde automatique
+        def sauvegarder(_):
+            FileManager.sauvegarder_bibliotheque(bibliotheque)
+        temps_sauvegardes = []
+        for livre in hasard.sample(livres, repetitions):
+            bibliotheque.ajouter_emprunt(hasard.choice(adherents), livre)
+            temps_sauvegardes += mesurer(sauvegarder, 1)
+        mesures.append(resultat(taille, "sauvegarder", temps_sauvegardes, 1))
+    finally:
+        shutil.rmtree(dossier, ignore_errors=True)
+    return mesures
+
+
+def comparer(mesures, reference, seuil, plancher=PLANCHER):
+    """
+    Compare les meilleurs temps (les moins sensibles à la charge de la
+    machine) à ceux d'un résultat de référence
+    Returns:
+        list: une entrée par opération présente des deux côtés
+    """
+    anciennes = {(m['taille'], m['operation']): m['min'] for m in reference['resultats']}
+    comparaison = []
+    for mesure in mesures:
+        ancienne = anciennes.get((mesure['taille'], mesure['operation']))
+        if not ancienne:
+            continue
+        rapport = mesure['min'] / ancienne
+        regression = rapport > seuil and mesure['min'] - ancienne > plancher
+        comparaison.append({'taille': mesure['taille'], 'operation': mesure['operation'],
+                            'reference': ancienne, 'mesure': mesure['min'],
+                            'rapport': round(rapport, 3), 'regression': regression})
+    return comparaison
+
+
+def main():
+    """Fonction principale"""
+    parseur = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parseur.add_argument("--tailles", default="1000,100000,1000000",
+                         help="nombres d'emprunts, séparés par des virgules")
+    parseur.add_argument("--repetitions", type=int, default=3)
+    parseur.add_argument("--graine", type=int, default=1)
+    parseur.add_argument("--reference", metavar="FICHIER",
+                         help="résultat JSON précédent auquel se comparer")
+    parseur.add_argument("--seuil", type=float, default=1.5,
+                         help="rapport au-delà duquel un ralentissement est signalé")
+    parseur.add_argument("--sortie", metavar="FICHIER", help="écrit le JSON dans un fichier")
+    args = parseur.parse_args()
+
+    tailles = [int(t) for t in args.tailles.split(",")]
+    mesures = []
+    for taille in tailles:
+        signaler(f"{taille} emprunts...")
+        debut = time.perf_counter()
+        mesures += bencher_taille(taille, args.repetitions, args.graine)
+        signaler(f"  terminé en {time.perf_counter() - debut:.1f} s")
+
+    rapport = {
+        'format': FORMAT,
+        'date': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'environnement': {'python': platform.python_version(),
+                          'implementation': platform.python_implementation(),
+                          'plateforme': platform.platform()},
+        'graine': args.graine,
+        'resultats': mesures,
+    }
+    regressions = []
+    if args.reference:
+        with open(args.reference, 'r', encoding='utf-8') as f:
+            reference = json.load(f)
+        rapport['reference'] = args.reference
+        rapport['seuil'] = args.seuil
+        rapport['comparaison'] = comparer(mesures, reference, args.seuil)
+        regressions = [c for c in rapport['comparaison'] if c['regression']]
+
+    texte = json.dumps(rapport, indent=2, ensure_ascii=False)
+    if args.sortie:
+        with open(args.sortie, 'w', encoding='utf-8') as f:
+            f.write(texte + "\n")
+    else:
+        print(texte)
+
+    for c in regressions:
+        signaler(f"✗ {c['operation']} ({c['taille']} emprunts) : x{c['rapport']} "
+                 f"par rapport à la référence")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
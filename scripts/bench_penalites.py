@@ -0,0 +1,99 @@
+"""
+Banc d'essai du calcul des pénalités de retard : compare la boucle naïve
+sur les objets Emprunt (jours_retard puis tarif, emprunt par emprunt) au
+calcul par lot sur colonnes, et vérifie que les totaux sont identiques.
+
+Usage: python scripts/bench_penalites.py [--emprunts N] [--adherents N] [--sans-naif]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from classes.adherent import Adherent
+from classes.document import Livre
+from classes.emprunt import Emprunt
+from utils import penalites
+from utils.penalites import TARIFS, ColonnesEmprunts, MoteurPenalites
+
+
+def generer_emprunts(nb_emprunts, nb_adherents, graine=1):
+    """Génère un historique d'emprunts sur deux ans (environ 10 % en cours)"""
+    hasard = random.Random(graine)
+    adherents = [Adherent(f"Nom{i}", f"Prenom{i}") for i in range(nb_adherents)]
+    livres = [Livre(f"Livre {i}", f"Auteur {i % 100}") for i in range(max(nb_emprunts // 20, 1))]
+    origine = date(2025, 1, 1)
+    emprunts = []
+    for _ in range(nb_emprunts):
+        debut = origine + timedelta(days=hasard.randrange(730))
+        retour = None
+        if hasard.random() < 0.9:
+            retour = debut + timedelta(days=hasard.randrange(40))
+        emprunts.append(Emprunt(hasard.choice(adherents), hasard.choice(livres), debut, retour))
+    return emprunts
+
+
+def calculer_naif(emprunts, date_reference):
+    """Référence : boucle sur les objets, un calcul de pénalité par emprunt"""
+    totaux = {}
+    for emprunt in emprunts:
+        if emprunt.date_emprunt > date_reference:
+            continue
+        if emprunt.date_retour and emprunt.date_retour <= date_reference:
+            jours = max((emprunt.date_retour - emprunt.calculer_date_retour_prevue()).days, 0)
+        else:
+            jours = max((date_reference - emprunt.calculer_date_retour_prevue()).days, 0)
+        tarif = TARIFS.get(type(emprunt.livre).__name__)
+        montant = tarif.calculer(jours) if tarif else 0
+        if montant:
+            identifiant = emprunt.adherent.get_identifiant()
+            totaux[identifiant] = totaux.get(identifiant, 0) + montant
+    return totaux
+
+
+def chronometrer(fonction, *args):
+    """Retourne (résultat, durée en secondes)"""
+    debut = time.perf_counter()
+    resultat = fonction(*args)
+    return resultat, time.perf_counter() - debut
+
+
+def main():
+    """Fonction principale"""
+    parseur = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parseur.add_argument("--emprunts", type=int, default=1_000_000)
+    parseur.add_argument("--adherents", type=int, default=50_000)
+    parseur.add_argument("--sans-naif", action="store_true", help="ne lance pas la boucle naïve")
+    args = parseur.parse_args()
+
+    date_reference = date(2026, 6, 30)
+    emprunts, duree = chronometrer(generer_emprunts, args.emprunts, args.adherents)
+    print(f"{len(emprunts)} emprunts générés en {duree:.2f} s")
+
+    colonnes, duree_colonnes = chronometrer(ColonnesEmprunts.depuis_emprunts, emprunts)
+    print(f"Colonnes construites en {duree_colonnes:.2f} s (une fois, réutilisables)")
+
+    moteur = MoteurPenalites()
+    totaux, duree_lot = chronometrer(moteur.calculer, colonnes, date_reference)
+    mode = "numpy" if penalites.numpy is not None else "Python pur"
+    print(f"Calcul par lot ({mode}) : {duree_lot:.2f} s, {len(totaux)} adhérents pénalisés, "
+          f"total {penalites.formater_montant(sum(totaux.values()))}")
+
+    if not args.sans_naif:
+        reference, duree_naif = chronometrer(calculer_naif, emprunts, date_reference)
+        print(f"Boucle naïve sur les objets : {duree_naif:.2f} s "
+              f"(x{duree_naif / duree_lot:.1f} par rapport au calcul par lot)")
+        if reference != totaux:
+            print("✗ Les totaux diffèrent de la boucle naïve")
+            return 1
+        print("✓ Totaux identiques")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""
+Générateur de charge pour le service HTTP de la bibliothèque : plusieurs
+clients keep-alive envoient un mélange de recherches, d'emprunts et de
+retours, puis le débit (requêtes/s) et les latences (p50, p99) sont affichés.
+
+Usage:
+    python scripts/charge_service.py --demarrer             service local sur données de test
+    python scripts/charge_service.py --port 8765            service déjà lancé
+Options: --clients N --requetes N --ecritures FRACTION
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from classes.adherent import Adherent
+from classes.bibliotheque import Bibliotheque
+from classes.document import Livre
+from services.serveur_http import ServiceBibliotheque
+from utils.file_manager import FileManager
+
+
+class Client:
+    """Client HTTP minimal sur une connexion persistante"""
+
+    def __init__(self, hote, port):
+        self._hote = hote
+        self._port = port
+        self._reader = None
+        self._writer = None
+
+    async def ouvrir(self):
+        """Ouvre la connexion"""
+        self._reader, self._writer = await asyncio.open_connection(self._hote, self._port)
+
+    async def fermer(self):
+        """Ferme la connexion"""
+        self._writer.close()
+        await self._writer.wait_closed()
+
+    async def requete(self, methode, chemin, donnees=None):
+        """
+        Envoie une requête et retourne (statut, réponse JSON)
+        """
+        corps = json.dumps(donnees).encode("utf-8") if donnees is not None else b""
+        self._writer.write((f"{methode} {chemin} HTTP/1.1\r\nHost: {self._hote}\r\n"
+                            f"Content-Length: {len(corps)}\r\n\r\n").encode("latin-1") + corps)
+        await self._writer.drain()
+        entete = await self._reader.readuntil(b"\r\n\r\n")
+        lignes = entete.decode("latin-1").split("\r\n")
+        statut = int(lignes[0].split(" ")[1])
+        longueur = 0
+        for ligne in lignes[1:]:
+            if ligne.lower().startswith("content-length:"):
+                longueur = int(ligne.split(":", 1)[1])
+        return statut, json.loads(await self._reader.readexactly(longueur))
+
+
+def creer_donnees(dossier, nb_adherents, nb_livres):
+    """Écrit une bibliothèque de test dans un dossier et retourne ses noms et titres"""
+    FileManager.definir_dossier_data(dossier)
+    FileManager.initialiser_fichiers()
+    bibliotheque = Bibliotheque()
+    for i in range(nb_adherents):
+        bibliotheque.ajouter_adherent(Adherent(f"Nom{i}", f"Prenom{i}"))
+    for i in range(nb_livres):
+        bibliotheque.ajouter_document(Livre(f"Livre {i}", f"Auteur {i % 100}"))
+    FileManager.sauvegarder_bibliotheque(bibliotheque)
+
+
+async def client_charge(hote, port, nb_requetes, ecritures, nb_adherents, nb_livres,
+                        graine, latences, statuts):
+    """Envoie nb_requetes requêtes et enregistre leurs latences"""
+    hasard = random.Random(graine)
+    client = Client(hote, port)
+    await client.ouvrir()
+    try:
+        for _ in range(nb_requetes):
+            tirage = hasard.random()
+            if tirage < ecritures:
+                i = hasard.randrange(nb_adherents)
+                donnees = {"nom": f"Nom{i}", "prenom": f"Prenom{i}",
+                           "titre": f"Livre {hasard.randrange(nb_livres)}"}
+                chemin = "/emprunts" if hasard.random() < 0.5 else "/retours"
+                requete = ("POST", chemin, donnees)
+            elif tirage < ecritures + 0.05:
+                requete = ("GET", "/statistiques", None)
+            else:
+                chemin = hasard.choice(["/adherents?q=Prenom1", "/documents?q=Livre 4",
+                                        "/livres/disponibles?q=Livre", "/emprunts/actifs?q=Nom"])
+                requete = ("GET", chemin.replace(" ", "%20"), None)
+
+            debut = time.perf_counter()
+            statut, _ = await client.requete(*requete)
+            latences.append(time.perf_counter() - debut)
+            statuts[statut] = statuts.get(statut, 0) + 1
+    finally:
+        await client.fermer()
+
+
+def centile(valeurs, fraction):
+    """Retourne le centile d'une liste triée"""
+    return valeurs[min(len(valeurs) - 1, int(fraction * len(valeurs)))]
+
+
+async def lancer(args):
+    """Lance la charge (et éventuellement le service) puis affiche le résultat"""
+    service = dossier = None
+    port = args.port
+    if args.demarrer:
+        dossier = tempfile.mkdtemp(prefix="charge_bibliotheque_")
+        creer_donnees(dossier, args.adherents, args.livres)
+        service = ServiceBibliotheque(FileManager.charger_bibliotheque(), args.hote, 0)
+        await service.demarrer()
+        port = service.port
+
+    latences, statuts = [], {}
+    try:
+        debut = time.perf_counter()
+        await asyncio.gather(*(client_charge(args.hote, port, args.requetes, args.ecritures,
+                                             args.adherents, args.livres, graine,
+                                             latences, statuts)
+                               for graine in range(args.clients)))
+        duree = time.perf_counter() - debut
+    finally:
+        if service is not None:
+            await service.arreter()
+            shutil.rmtree(dossier, ignore_errors=True)
+
+    latences.sort()
+    print(f"{len(latences)} requêtes en {duree:.2f} s : {len(latences) / duree:.0f} req/s")
+    print(f"Latence p50 {centile(latences, 0.50) * 1000:.2f} ms, "
+          f"p99 {centile(latences, 0.99) * 1000:.2f} ms, "
+          f"max {latences[-1] * 1000:.2f} ms")
+    print("Statuts: " + ", ".join(f"{s}: {n}" for s, n in sorted(statuts.items())))
+    if service is not None:
+        print(f"{service.nb_modifications} modifications validées en {service.nb_lots} lots")
+
+
+def main():
+    """Fonction principale"""
+    parseur = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parseur.add_argument("--hote", default="127.0.0.1")
+    parseur.add_argument("--port", type=int, default=8765)
+    parseur.add_argument("--demarrer", action="store_true",
+                         help="démarre un service local sur des données temporaires")
+    parseur.add_argument("--clients", type=int, default=32)
+    parseur.add_argument("--requetes", type=int, default=500, help="par client")
+    parseur.add_argument("--ecritures", type=float, default=0.3,
+                         help="proportion d'emprunts et de retours")
+    parseur.add_argument("--adherents", type=int, default=1000)
+    parseur.add_argument("--livres", type=int, default=5000)
+    args = parseur.parse_args()
+    asyncio.run(lancer(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
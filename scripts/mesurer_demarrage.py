@@ -0,0 +1,69 @@
+"""
+Mesure le temps de démarrage à froid du mode ligne de commande et vérifie
+que PyQt6 n'est pas importé.
+
+Usage: python scripts/mesurer_demarrage.py [--repetitions N] [--budget MS] [--data DOSSIER]
+Code de sortie 1 si la médiane dépasse le budget ou si PyQt6 est chargé.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(RACINE, "main.py")
+
+# Budget de démarrage (médiane) pour `main.py statistiques`, en millisecondes
+BUDGET_MS = 250
+
+
+def lancer(commande, **options):
+    """Lance une commande et retourne (durée en ms, processus terminé)"""
+    debut = time.perf_counter()
+    resultat = subprocess.run(commande, cwd=RACINE, capture_output=True, text=True, **options)
+    return (time.perf_counter() - debut) * 1000, resultat
+
+
+def main():
+    """Fonction principale"""
+    parseur = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parseur.add_argument("--repetitions", type=int, default=10)
+    parseur.add_argument("--budget", type=float, default=BUDGET_MS, help="budget en ms")
+    parseur.add_argument("--data", metavar="DOSSIER", help="dossier de données à utiliser")
+    args = parseur.parse_args()
+
+    commande = [sys.executable, MAIN]
+    if args.data:
+        commande += ["--data", args.data]
+    commande.append("statistiques")
+
+    # Vérifier qu'aucun module Qt n'est importé
+    _, resultat = lancer([sys.executable, "-X", "importtime"] + commande[1:])
+    if resultat.returncode != 0:
+        print(resultat.stderr)
+        print("✗ La commande a échoué")
+        return 1
+    modules_qt = [ligne.split("|")[-1].strip() for ligne in resultat.stderr.splitlines()
+                  if "PyQt6" in ligne]
+    if modules_qt:
+        print(f"✗ PyQt6 importé en mode ligne de commande: {', '.join(modules_qt[:5])}")
+        return 1
+    print("✓ PyQt6 n'est pas importé")
+
+    durees = [lancer(commande)[0] for _ in range(args.repetitions)]
+    mediane = statistics.median(durees)
+    print(f"Démarrage: médiane {mediane:.0f} ms, min {min(durees):.0f} ms, "
+          f"max {max(durees):.0f} ms ({args.repetitions} lancements)")
+
+    if mediane > args.budget:
+        print(f"✗ Budget dépassé ({args.budget:.0f} ms)")
+        return 1
+    print(f"✓ Dans le budget ({args.budget:.0f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
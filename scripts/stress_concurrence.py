@@ -0,0 +1,140 @@
+"""
+Test de charge des emprunts concurrents : plusieurs postes de prêt (threads)
+empruntent et retournent les mêmes livres sur une bibliothèque partagée,
+puis on vérifie qu'aucun exemplaire n'a été prêté deux fois.
+
+Usage: python scripts/stress_concurrence.py [--postes N] [--livres N] [--operations N]
+                                            [--exemplaires N] [--sans-verrous]
+Code de sortie 1 si un double prêt ou une incohérence est détecté.
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from classes.adherent import Adherent
+from classes.bibliotheque import Bibliotheque
+from classes.document import Livre
+
+
+def creer_bibliotheque(nb_livres, nb_adherents, concurrent, exemplaires=1):
+    """Crée une bibliothèque de test"""
+    bibliotheque = Bibliotheque(concurrent=concurrent)
+    adherents = [Adherent(f"Nom{i}", f"Prenom{i}") for i in range(nb_adherents)]
+    livres = [Livre(f"Livre {i}", f"Auteur {i % 50}", exemplaires=exemplaires)
+              for i in range(nb_livres)]
+    for adherent in adherents:
+        bibliotheque.ajouter_adherent(adherent)
+    for livre in livres:
+        bibliotheque.ajouter_document(livre)
+    return bibliotheque, adherents, livres
+
+
+def poste_de_pret(bibliotheque, adherents, livres, operations, graine, depart, prets):
+    """
+    Simule un poste : emprunts et retours aléatoires.
+    Chaque prêt accordé est compté dans `prets` (par titre).
+    """
+    hasard = random.Random(graine)
+    compteur = Counter()
+    depart.wait()
+    for _ in range(operations):
+        adherent = hasard.choice(adherents)
+        livre = hasard.choice(livres)
+        success, _ = bibliotheque.ajouter_emprunt(adherent, livre)
+        if success:
+            compteur[livre.titre] += 1
+        elif hasard.random() < 0.5:
+            actifs = [e for e in bibliotheque.get_emprunts_livre(livre) if e.est_actif()]
+            if actifs:
+                emprunt = hasard.choice(actifs)
+                bibliotheque.retourner_emprunt(emprunt.adherent, livre)
+    prets.append(compteur)
+
+
+def verifier(bibliotheque, livres, prets):
+    """
+    Vérifie les invariants après la charge
+    Returns:
+        list: descriptions des anomalies trouvées
+    """
+    anomalies = []
+    total_prets = sum(prets, Counter())
+    if sum(total_prets.values()) != bibliotheque.compter_emprunts():
+        anomalies.append(f"{sum(total_prets.values())} prêts accordés mais "
+                         f"{bibliotheque.compter_emprunts()} emprunts enregistrés")
+
+    for livre in livres:
+        emprunts = bibliotheque.get_emprunts_livre(livre)
+        actifs = [e for e in emprunts if e.est_actif()]
+        if len(actifs) > livre.exemplaires:
+            anomalies.append(f"'{livre.titre}' prêté {len(actifs)} fois simultanément "
+                             f"pour {livre.exemplaires} exemplaire(s)")
+        if livre.disponibles != livre.exemplaires - len(actifs):
+            anomalies.append(f"'{livre.titre}' {livre.disponibles} exemplaire(s) disponible(s) "
+                             f"avec {len(actifs)} emprunt(s) actif(s)")
+        if len({e.adherent.get_identifiant() for e in actifs}) != len(actifs):
+            anomalies.append(f"'{livre.titre}' prêté deux fois au même adhérent")
+        # Exemplaire unique : un prêt n'est accordé que si le précédent a été retourné
+        if livre.exemplaires == 1:
+            for precedent in emprunts[:-1]:
+                if precedent.est_actif():
+                    anomalies.append(f"'{livre.titre}' prêté alors qu'un emprunt était en cours")
+                    break
+    return anomalies
+
+
+def main():
+    """Fonction principale"""
+    parseur = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parseur.add_argument("--postes", type=int, default=8)
+    parseur.add_argument("--livres", type=int, default=50)
+    parseur.add_argument("--adherents", type=int, default=200)
+    parseur.add_argument("--operations", type=int, default=20000, help="par poste")
+    parseur.add_argument("--exemplaires", type=int, default=1, help="par livre")
+    parseur.add_argument("--sans-verrous", action="store_true",
+                         help="désactive le mode concurrent (montre les doubles prêts)")
+    args = parseur.parse_args()
+
+    # Changements de thread très fréquents pour provoquer les entrelacements
+    sys.setswitchinterval(1e-6)
+
+    bibliotheque, adherents, livres = creer_bibliotheque(
+        args.livres, args.adherents, concurrent=not args.sans_verrous,
+        exemplaires=args.exemplaires)
+    depart = threading.Barrier(args.postes)
+    prets = []
+    threads = [threading.Thread(target=poste_de_pret,
+                                args=(bibliotheque, adherents, livres, args.operations,
+                                      graine, depart, prets))
+               for graine in range(args.postes)]
+
+    debut = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duree = time.perf_counter() - debut
+
+    operations = args.postes * args.operations
+    print(f"{args.postes} postes, {operations} opérations en {duree:.2f} s "
+          f"({operations / duree:.0f} op/s), {bibliotheque.compter_emprunts()} emprunts")
+
+    anomalies = verifier(bibliotheque, livres, prets)
+    if anomalies:
+        for anomalie in anomalies[:10]:
+            print(f"✗ {anomalie}")
+        print(f"✗ {len(anomalies)} anomalie(s)")
+        return 1
+    print("✓ Aucun double prêt")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
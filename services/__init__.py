@@ -0,0 +1,4 @@
+"""
+Package des services réseau de la bibliothèque
+(les modules se lancent avec python -m services.<module>)
+"""
@@ -0,0 +1,453 @@
+"""
+Service HTTP/JSON (bibliothèque standard uniquement) qui héberge une
+Bibliotheque pour plusieurs postes de prêt du réseau local.
+
+Routes :
+    GET  /adherents?q=PREFIXE&limite=N           recherche d'adhérents
+    GET  /documents?q=PREFIXE&limite=N           recherche de documents
+    GET  /livres/disponibles?q=PREFIXE&limite=N  livres empruntables
+    GET  /emprunts/actifs?q=PREFIXE&limite=N     emprunts en cours
+    GET  /statistiques                           statistiques
+    GET  /metrics                                métriques Prometheus (avec --metriques)
+    POST /emprunts  {"nom", "prenom", "titre"}   crée un emprunt
+    POST /retours   {"nom", "prenom", "titre"}   enregistre un retour
+
+Les modifications sont regroupées par lots : toutes celles reçues pendant
+l'écriture précédente sont appliquées ensemble, puis sauvegardées en une
+seule écriture (validation groupée). La réponse n'est envoyée qu'une fois
+le lot écrit sur disque ; si l'écriture échoue, les modifications du lot
+sont annulées et aucune n'est confirmée (503).
+
+Usage: python -m services.serveur_http [--hote H] [--port P] [--data DOSSIER]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from urllib.parse import urlsplit, parse_qs
+
+from classes.document import Livre
+from utils.file_manager import FileManager
+
+
+# ========== Conversion en JSON ==========
+
+def adherent_json(adherent):
+    """Représentation JSON d'un adhérent"""
+    return {"nom": adherent.nom, "prenom": adherent.prenom, "email": adherent.email}
+
+
+def document_json(document):
+    """Représentation JSON d'un document"""
+    donnees = {"type": type(document).__name__, "titre": document.titre}
+    if isinstance(document, Livre):
+        donnees["auteur"] = document.auteur
+        donnees["disponible"] = document.disponible
+        donnees["exemplaires"] = document.exemplaires
+        donnees["disponibles"] = document.disponibles
+    return donnees
+
+
+def emprunt_json(emprunt):
+    """Représentation JSON d'un emprunt"""
+    return {
+        "adherent": adherent_json(emprunt.adherent),
+        "titre": emprunt.livre.titre,
+        "date_emprunt": emprunt.date_emprunt.isoformat(),
+        "date_retour_prevue": emprunt.calculer_date_retour_prevue().isoformat(),
+        "date_retour": emprunt.date_retour.isoformat() if emprunt.date_retour else None,
+    }
+
+
+class ErreurRequete(Exception):
+    """Requête invalide (statut HTTP et message d'erreur)"""
+
+    def __init__(self, statut, message):
+        """Initialise l'erreur avec son statut HTTP"""
+        super().__init__(message)
+        self.statut = statut
+
+
+class ServiceBibliotheque:
+    """
+    Serveur asyncio exposant une bibliothèque en HTTP/JSON.
+
+    Tout s'exécute dans la boucle asyncio (un seul thread modifie la
+    bibliothèque) ; seule l'écriture des fichiers, faite à partir d'un
+    instantané, est déléguée à un thread.
+    """
+
+    RAISONS = {200: "OK", 400: "Bad Request", 404: "Not Found",
+               405: "Method Not Allowed", 409: "Conflict",
+               413: "Payload Too Large", 500: "Internal Server Error",
+               503: "Service Unavailable"}
+
+    # Taille maximale d'un corps de requête
+    TAILLE_MAX = 64 * 1024
+
+    def __init__(self, bibliotheque, hote="127.0.0.1", port=8765, delai_lot=0.0,
+                 persister=True, registre=None):
+        """
+        Initialise le service
+        Args:
+            bibliotheque: bibliothèque hébergée
+            delai_lot: attente (s) avant d'appliquer un lot, pour en grouper davantage
+            persister: False pour ne rien écrire sur disque (mesures)
+            registre: registre de métriques exposé sur /metrics (None : pas de route)
+        """
+        self._bibliotheque = bibliotheque
+        self._hote = hote
+        self._port = port
+        self._delai_lot = delai_lot
+        self._persister = persister
+        self._file = None
+        self._serveur = None
+        self._tache_lots = None
+        self._nb_lots = 0
+        self._nb_modifications = 0
+
+        self._routes = {
+            ("GET", "/adherents"): self._get_adherents,
+            ("GET", "/documents"): self._get_documents,
+            ("GET", "/livres/disponibles"): self._get_livres_disponibles,
+            ("GET", "/emprunts/actifs"): self._get_emprunts_actifs,
+            ("GET", "/statistiques"): self._get_statistiques,
+            ("POST", "/emprunts"): self._post_emprunt,
+            ("POST", "/retours"): self._post_retour,
+        }
+        self._registre = registre
+        if registre is not None:
+            self._routes[("GET", "/metrics")] = self._get_metrics
+
+    @property
+    def bibliotheque(self):
+        """Retourne la bibliothèque hébergée"""
+        return self._bibliotheque
+
+    @property
+    def port(self):
+        """Retourne le port d'écoute (réel, même si 0 a été demandé)"""
+        if self._serveur is not None and self._serveur.sockets:
+            return self._serveur.sockets[0].getsockname()[1]
+        return self._port
+
+    @property
+    def nb_lots(self):
+        """Retourne le nombre de lots de modifications validés"""
+        return self._nb_lots
+
+    @property
+    def nb_modifications(self):
+        """Retourne le nombre de modifications appliquées"""
+        return self._nb_modifications
+
+    # ========== Cycle de vie ==========
+
+    async def demarrer(self):
+        """Ouvre le port d'écoute et lance le traitement des lots"""
+        self._file = asyncio.Queue()
+        self._tache_lots = asyncio.create_task(self._traiter_lots())
+        self._serveur = await asyncio.start_server(self._connexion, self._hote, self._port)
+
+    async def arreter(self):
+        """Ferme le port d'écoute puis valide les modifications en attente"""
+        if self._serveur is not None:
+            self._serveur.close()
+            await self._serveur.wait_closed()
+            self._serveur = None
+        if self._tache_lots is not None:
+            await self._file.put(None)
+            await self._tache_lots
+            self._tache_lots = None
+
+    async def servir(self):
+        """Démarre le service et répond jusqu'à l'annulation"""
+        await self.demarrer()
+        print(f"Service bibliothèque sur http://{self._hote}:{self.port}")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.arreter()
+
+    # ========== Modifications groupées ==========
+
+    async def _modifier(self, operation, *arguments):
+        """
+        Met une modification en file et attend qu'elle soit appliquée et écrite
+        Returns:
+            tuple: (succès, message) retourné par la bibliothèque
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._file.put((operation, arguments, future))
+        return await future
+
+    async def _traiter_lots(self):
+        """
+        Applique les modifications par lots et les valide en une seule écriture
+        """
+        arret = False
+        while not arret:
+            lot = [await self._file.get()]
+            if self._delai_lot:
+                await asyncio.sleep(self._delai_lot)
+            while not self._file.empty():
+                lot.append(self._file.get_nowait())
+            if None in lot:
+                arret = True
+                lot = [element for element in lot if element is not None]
+            if not lot:
+                continue
+
+            resultats = []
+            modifie = False
+            # État d'avant le lot, pour l'annuler si son écriture échoue
+            avant = self._bibliotheque.instantane() if self._persister else None
+            # Les abonnés reçoivent les événements du lot en une fois
+            with self._bibliotheque.lot():
+                for operation, arguments, future in lot:
+                    try:
+                        resultat = operation(*arguments)
+                        modifie |= resultat[0]
+                        resultats.append((future, resultat, None))
+                    except Exception as e:
+                        resultats.append((future, None, e))
+
+            if modifie and self._persister:
+                # Écriture hors de la boucle : les requêtes suivantes forment le lot suivant
+                with self._bibliotheque.instantane() as instantane:
+                    if not await asyncio.to_thread(FileManager.sauvegarder_bibliotheque,
+                                                   instantane):
+                        print("Erreur: échec de la sauvegarde du lot, modifications annulées")
+                        # Rien n'est confirmé ni gardé tant que le lot n'est pas sur disque
+                        self._bibliotheque.revenir_a(avant)
+                        echec = ErreurRequete(503, "Échec de la sauvegarde : "
+                                                   "modification non enregistrée")
+                        resultats = [(future, None, erreur or echec)
+                                     for future, _, erreur in resultats]
+            if avant is not None:
+                avant.fermer()
+
+            self._nb_lots += 1
+            self._nb_modifications += len(lot)
+            for future, resultat, erreur in resultats:
+                if future.cancelled():
+                    continue
+                if erreur is not None:
+                    future.set_exception(erreur)
+                else:
+                    future.set_result(resultat)
+
+    # ========== HTTP ==========
+
+    async def _connexion(self, reader, writer):
+        """Traite les requêtes d'une connexion (keep-alive)"""
+        try:
+            while True:
+                try:
+                    entete = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+                        ConnectionError):
+                    break
+
+                garder = True
+                corps = None
+                try:
+                    methode, cible, en_tetes = self._analyser_entete(entete)
+                    garder = en_tetes.get("connection", "").lower() != "close"
+                    longueur = self._longueur_corps(en_tetes)
+                    if longueur > self.TAILLE_MAX:
+                        raise ErreurRequete(413, "Corps de requête trop volumineux")
+                    corps = await reader.readexactly(longueur) if longueur else b""
+                    statut, reponse = await self._traiter(methode, cible, corps)
+                except ErreurRequete as e:
+                    statut, reponse = e.statut, {"succes": False, "message": str(e)}
+                except asyncio.IncompleteReadError:
+                    break
+                except Exception as e:
+                    print(f"Erreur lors du traitement d'une requête: {e}")
+                    statut, reponse = 500, {"succes": False, "message": "Erreur interne"}
+                if corps is None:
+                    # Corps refusé sans être lu (413, longueur invalide) : ses
+                    # octets seraient pris pour la requête suivante
+                    garder = False
+
+                writer.write(self._reponse(statut, reponse, garder))
+                await writer.drain()
+                if not garder:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _analyser_entete(entete):
+        """
+        Découpe l'en-tête HTTP
+        Returns:
+            tuple: (méthode, cible, en-têtes en minuscules)
+        """
+        lignes = entete.decode("latin-1").split("\r\n")
+        try:
+            methode, cible, _ = lignes[0].split(" ", 2)
+        except ValueError:
+            raise ErreurRequete(400, "Ligne de requête invalide")
+        en_tetes = {}
+        for ligne in lignes[1:]:
+            if ":" in ligne:
+                nom, valeur = ligne.split(":", 1)
+                en_tetes[nom.strip().lower()] = valeur.strip()
+        return methode.upper(), cible, en_tetes
+
+    @staticmethod
+    def _longueur_corps(en_tetes):
+        """Retourne la longueur du corps annoncée par Content-Length"""
+        try:
+            longueur = int(en_tetes.get("content-length", 0))
+        except ValueError:
+            raise ErreurRequete(400, "Content-Length invalide")
+        if longueur < 0:
+            raise ErreurRequete(400, "Content-Length invalide")
+        return longueur
+
+    def _reponse(self, statut, donnees, garder):
+        """Construit une réponse HTTP JSON (texte brut si donnees est une chaîne)"""
+        if isinstance(donnees, str):
+            corps = donnees.encode("utf-8")
+            type_contenu = "text/plain; version=0.0.4; charset=utf-8"
+        else:
+            corps = json.dumps(donnees, ensure_ascii=False).encode("utf-8")
+            type_contenu = "application/json; charset=utf-8"
+        entete = (f"HTTP/1.1 {statut} {self.RAISONS.get(statut, '')}\r\n"
+                  f"Content-Type: {type_contenu}\r\n"
+                  f"Content-Length: {len(corps)}\r\n"
+                  f"Connection: {'keep-alive' if garder else 'close'}\r\n\r\n")
+        return entete.encode("latin-1") + corps
+
+    async def _traiter(self, methode, cible, corps):
+        """
+        Oriente une requête vers sa route
+        Returns:
+            tuple: (statut HTTP, données JSON)
+        """
+        url = urlsplit(cible)
+        route = self._routes.get((methode, url.path.rstrip("/") or "/"))
+        if route is None:
+            if any(chemin == url.path for _, chemin in self._routes):
+                raise ErreurRequete(405, "Méthode non autorisée")
+            raise ErreurRequete(404, f"Route inconnue: {url.path}")
+
+        parametres = {cle: valeurs[-1] for cle, valeurs in parse_qs(url.query).items()}
+        if methode == "POST":
+            try:
+                parametres.update(json.loads(corps or b"{}"))
+            except (ValueError, TypeError, AttributeError):
+                raise ErreurRequete(400, "Corps JSON invalide")
+        return await route(parametres)
+
+    # ========== Routes ==========
+
+    @staticmethod
+    def _prefixe_limite(parametres):
+        """Lit les paramètres de recherche q et limite"""
+        try:
+            limite = min(int(parametres.get("limite", 20)), 500)
+        except ValueError:
+            raise ErreurRequete(400, "Paramètre limite invalide")
+        return parametres.get("q", ""), limite
+
+    async def _get_adherents(self, parametres):
+        """GET /adherents : recherche d'adhérents par préfixe"""
+        prefixe, limite = self._prefixe_limite(parametres)
+        adherents = self._bibliotheque.rechercher_adherents(prefixe, limite)
+        return 200, [adherent_json(a) for a in adherents]
+
+    async def _get_documents(self, parametres):
+        """GET /documents : recherche de documents par préfixe"""
+        prefixe, limite = self._prefixe_limite(parametres)
+        documents = self._bibliotheque.rechercher_documents(prefixe, limite)
+        return 200, [document_json(d) for d in documents]
+
+    async def _get_livres_disponibles(self, parametres):
+        """GET /livres/disponibles : livres empruntables par préfixe"""
+        prefixe, limite = self._prefixe_limite(parametres)
+        livres = self._bibliotheque.rechercher_livres_disponibles(prefixe, limite)
+        return 200, [document_json(l) for l in livres]
+
+    async def _get_emprunts_actifs(self, parametres):
+        """GET /emprunts/actifs : emprunts en cours par préfixe"""
+        prefixe, limite = self._prefixe_limite(parametres)
+        emprunts = self._bibliotheque.rechercher_emprunts_actifs(prefixe, limite)
+        return 200, [emprunt_json(e) for e in emprunts]
+
+    async def _get_statistiques(self, parametres):
+        """GET /statistiques : statistiques de la bibliothèque"""
+        return 200, self._bibliotheque.get_statistiques()
+
+    async def _get_metrics(self, parametres):
+        """GET /metrics : métriques au format texte de Prometheus"""
+        return 200, self._registre.exporter_prometheus()
+
+    def _adherent_livre(self, parametres):
+        """
+        Retrouve l'adhérent et le livre désignés par une requête de prêt
+        """
+        try:
+            nom, prenom, titre = parametres["nom"], parametres["prenom"], parametres["titre"]
+        except (KeyError, TypeError):
+            raise ErreurRequete(400, "Champs nom, prenom et titre obligatoires")
+        adherent = self._bibliotheque.rechercher_adherent(nom, prenom)
+        if adherent is None:
+            raise ErreurRequete(404, f"Adhérent {prenom} {nom} introuvable")
+        livre = self._bibliotheque.rechercher_document(titre)
+        if not isinstance(livre, Livre):
+            raise ErreurRequete(404, f"Livre '{titre}' introuvable")
+        return adherent, livre
+
+    async def _post_emprunt(self, parametres):
+        """POST /emprunts : crée un emprunt"""
+        adherent, livre = self._adherent_livre(parametres)
+        success, message = await self._modifier(self._bibliotheque.ajouter_emprunt,
+                                                adherent, livre)
+        return (200 if success else 409), {"succes": success, "message": message}
+
+    async def _post_retour(self, parametres):
+        """POST /retours : enregistre un retour"""
+        adherent, livre = self._adherent_livre(parametres)
+        success, message = await self._modifier(self._bibliotheque.retourner_emprunt,
+                                                adherent, livre)
+        return (200 if success else 409), {"succes": success, "message": message}
+
+
+def main(arguments=None):
+    """Fonction principale"""
+    parseur = argparse.ArgumentParser(description="Service HTTP/JSON de la bibliothèque")
+    parseur.add_argument("--hote", default="127.0.0.1")
+    parseur.add_argument("--port", type=int, default=8765)
+    parseur.add_argument("--data", metavar="DOSSIER", help="dossier des fichiers de données")
+    parseur.add_argument("--delai-lot", type=float, default=0.0,
+                         help="attente (s) pour grouper les modifications")
+    parseur.add_argument("--metriques", action="store_true",
+                         help="chronomètre les opérations et les expose sur /metrics")
+    args = parseur.parse_args(arguments)
+
+    registre = None
+    if args.metriques:
+        from utils import metriques
+        metriques.instrumenter()
+        registre = metriques.REGISTRE
+
+    if args.data:
+        FileManager.definir_dossier_data(args.data)
+    service = ServiceBibliotheque(FileManager.charger_bibliotheque(), args.hote,
+                                  args.port, args.delai_lot, registre=registre)
+    try:
+        asyncio.run(service.servir())
+    except KeyboardInterrupt:
+        print("\nService arrêté")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
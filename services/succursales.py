@@ -0,0 +1,481 @@
+"""
+Réseau de succursales : une Bibliotheque par succursale, chacune dans son
+propre processus, derrière un coordinateur.
+
+Chaque succursale a son catalogue et ses emprunts ; les adhérents sont
+communs (chaque inscription est diffusée à toutes les succursales, qui en
+gardent une copie dans leur dossier). Les opérations sur un document sont
+dirigées vers la succursale qui le possède ; les recherches d'adhérents et
+les statistiques sont diffusées à toutes puis fusionnées.
+
+Usage: python -m services.succursales NOM=DOSSIER [NOM=DOSSIER ...]
+       (affiche les statistiques consolidées)
+"""
+
+import argparse
+import multiprocessing
+import sys
+import threading
+from contextlib import ExitStack
+
+from classes.document import Livre
+from classes.index import IndexPrefixe
+from utils.file_manager import FileManager
+
+
+class ErreurSuccursale(Exception):
+    """Erreur survenue dans le processus d'une succursale"""
+
+
+# ========== Processus d'une succursale ==========
+
+class _Operations:
+    """
+    Opérations exécutées dans le processus d'une succursale ; les arguments
+    et résultats transitent par un tube et doivent être sérialisables.
+    """
+
+    def __init__(self, bibliotheque):
+        self._bibliotheque = bibliotheque
+
+    def _adherent_livre(self, nom, prenom, titre):
+        """Retrouve l'adhérent et le livre d'une opération de prêt"""
+        adherent = self._bibliotheque.rechercher_adherent(nom, prenom)
+        livre = self._bibliotheque.rechercher_document(titre)
+        if adherent is None:
+            return None, None, f"Adhérent {prenom} {nom} introuvable"
+        if not isinstance(livre, Livre):
+            return None, None, f"Livre '{titre}' introuvable"
+        return adherent, livre, None
+
+    def titres(self):
+        """Retourne les titres du catalogue"""
+        return [document.titre for document in self._bibliotheque.get_documents()]
+
+    def adherents(self):
+        """Retourne les adhérents inscrits"""
+        return self._bibliotheque.get_adherents()
+
+    def ajouter_adherent(self, adherent):
+        """Inscrit un adhérent"""
+        return self._bibliotheque.ajouter_adherent(adherent)
+
+    def ajouter_adherents(self, adherents):
+        """Inscrit les adhérents pas encore inscrits"""
+        return sum(self._bibliotheque.ajouter_adherent(adherent) for adherent in adherents)
+
+    def enlever_adherent(self, nom, prenom):
+        """Désinscrit un adhérent"""
+        adherent = self._bibliotheque.rechercher_adherent(nom, prenom)
+        return adherent is not None and self._bibliotheque.enlever_adherent(adherent)
+
+    def rechercher_adherents(self, prefixe, limite):
+        """Recherche d'adhérents par préfixe"""
+        return self._bibliotheque.rechercher_adherents(prefixe, limite)
+
+    def compter_emprunts_actifs(self, nom, prenom):
+        """Nombre d'emprunts en cours d'un adhérent dans la succursale"""
+        adherent = self._bibliotheque.rechercher_adherent(nom, prenom)
+        if adherent is None:
+            return 0
+        return sum(1 for e in self._bibliotheque.get_emprunts_adherent(adherent) if e.est_actif())
+
+    def emprunts_adherent(self, nom, prenom):
+        """Emprunts d'un adhérent dans la succursale"""
+        adherent = self._bibliotheque.rechercher_adherent(nom, prenom)
+        if adherent is None:
+            return []
+        return self._bibliotheque.get_emprunts_adherent(adherent)
+
+    def ajouter_document(self, document):
+        """Ajoute un document au catalogue"""
+        return self._bibliotheque.ajouter_document(document)
+
+    def enlever_document(self, titre):
+        """Retire un document du catalogue"""
+        document = self._bibliotheque.rechercher_document(titre)
+        return document is not None and self._bibliotheque.enlever_document(document)
+
+    def rechercher_documents(self, prefixe, limite):
+        """Recherche de documents par préfixe"""
+        return self._bibliotheque.rechercher_documents(prefixe, limite)
+
+    def emprunter(self, nom, prenom, titre):
+        """Crée un emprunt"""
+        adherent, livre, erreur = self._adherent_livre(nom, prenom, titre)
+        if erreur:
+            return False, erreur
+        return self._bibliotheque.ajouter_emprunt(adherent, livre)
+
+    def retourner(self, nom, prenom, titre):
+        """Enregistre un retour"""
+        adherent, livre, erreur = self._adherent_livre(nom, prenom, titre)
+        if erreur:
+            return False, erreur
+        return self._bibliotheque.retourner_emprunt(adherent, livre)
+
+    def statistiques(self, date_reference):
+        """Statistiques de la succursale"""
+        return self._bibliotheque.get_statistiques(date_reference)
+
+    def sauvegarder(self):
+        """Écrit les fichiers de la succursale"""
+        return FileManager.sauvegarder_bibliotheque(self._bibliotheque)
+
+
+def _executer_succursale(dossier, connexion):
+    """
+    Boucle du processus d'une succursale : charge ses données puis exécute
+    les commandes reçues jusqu'à la commande d'arrêt (None)
+    """
+    FileManager.definir_dossier_data(dossier)
+    operations = _Operations(FileManager.charger_bibliotheque())
+    while True:
+        try:
+            message = connexion.recv()
+        except EOFError:
+            break
+        if message is None:
+            break
+        commande, arguments = message
+        try:
+            connexion.send((True, getattr(operations, commande)(*arguments)))
+        except Exception as e:
+            connexion.send((False, f"{type(e).__name__}: {e}"))
+    connexion.close()
+
+
+class _Succursale:
+    """Accès du coordinateur au processus d'une succursale"""
+
+    def __init__(self, nom, dossier):
+        self.nom = nom
+        self.dossier = dossier
+        self.verrou = threading.Lock()     # un seul échange à la fois sur le tube
+        self._connexion, connexion_fille = multiprocessing.Pipe()
+        self._processus = multiprocessing.Process(
+            target=_executer_succursale, args=(dossier, connexion_fille),
+            name=f"succursale-{nom}", daemon=True)
+        self._processus.start()
+        connexion_fille.close()
+
+    def envoyer(self, commande, arguments):
+        """Envoie une commande (le verrou doit être tenu)"""
+        self._connexion.send((commande, arguments))
+
+    def recevoir(self):
+        """Attend le résultat de la dernière commande (le verrou doit être tenu)"""
+        try:
+            succes, resultat = self._connexion.recv()
+        except EOFError:
+            raise ErreurSuccursale(f"La succursale {self.nom} s'est arrêtée")
+        if not succes:
+            raise ErreurSuccursale(f"Succursale {self.nom}: {resultat}")
+        return resultat
+
+    def appeler(self, commande, *arguments):
+        """Exécute une commande et retourne son résultat"""
+        with self.verrou:
+            self.envoyer(commande, arguments)
+            return self.recevoir()
+
+    def arreter(self):
+        """Arrête le processus"""
+        with self.verrou:
+            try:
+                self._connexion.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        self._processus.join(timeout=10)
+        if self._processus.is_alive():
+            self._processus.terminate()
+        self._connexion.close()
+
+
+# ========== Coordinateur ==========
+
+class Succursales:
+    """
+    Coordinateur des succursales : dirige les opérations vers le processus
+    qui possède le document, diffuse et fusionne les autres.
+
+    Utilisable depuis plusieurs threads : les succursales différentes
+    travaillent en parallèle, chacune traite ses commandes une à une.
+    """
+
+    def __init__(self, dossiers):
+        """
+        Initialise le coordinateur
+        Args:
+            dossiers: dictionnaire nom de succursale -> dossier de ses fichiers
+        """
+        self._dossiers = dict(dossiers)
+        self._succursales = {}
+        self._proprietaires = {}    # titre normalisé -> nom de la succursale
+
+    @property
+    def noms(self):
+        """Retourne les noms des succursales"""
+        return list(self._dossiers)
+
+    # ========== Cycle de vie ==========
+
+    def demarrer(self):
+        """
+        Lance un processus par succursale, aligne les adhérents (union des
+        fichiers de toutes les succursales) et construit la table de routage
+        """
+        for nom, dossier in self._dossiers.items():
+            self._succursales[nom] = _Succursale(nom, dossier)
+
+        inscrits = {}
+        for adherents in self._diffuser("adherents").values():
+            for adherent in adherents:
+                inscrits.setdefault(adherent.get_identifiant(), adherent)
+        self._diffuser("ajouter_adherents", list(inscrits.values()))
+
+        for nom, titres in self._diffuser("titres").items():
+            for titre in titres:
+                cle = self._cle(titre)
+                if cle in self._proprietaires:
+                    print(f"Attention: '{titre}' existe dans {self._proprietaires[cle]} "
+                          f"et {nom}, seul le premier est accessible")
+                else:
+                    self._proprietaires[cle] = nom
+
+    def arreter(self, sauvegarder=True):
+        """Sauvegarde (si demandé) puis arrête les processus"""
+        if not self._succursales:
+            return True
+        success = self.sauvegarder() if sauvegarder else True
+        for succursale in self._succursales.values():
+            succursale.arreter()
+        self._succursales = {}
+        self._proprietaires = {}
+        return success
+
+    def __enter__(self):
+        self.demarrer()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.arreter()
+        return False
+
+    # ========== Routage ==========
+
+    @staticmethod
+    def _cle(titre):
+        """Clé de routage d'un titre (même comparaison que rechercher_document)"""
+        return titre.lower()
+
+    def succursale_de(self, titre):
+        """
+        Retourne le nom de la succursale qui possède un document, ou None
+        """
+        return self._proprietaires.get(self._cle(titre))
+
+    def _verrouiller(self):
+        """
+        Verrouille toutes les succursales, dans un ordre fixe : aucune autre
+        commande ne peut s'intercaler jusqu'à la sortie du bloc with
+        """
+        pile = ExitStack()
+        for succursale in self._succursales.values():
+            pile.enter_context(succursale.verrou)
+        return pile
+
+    def _diffuser(self, commande, *arguments):
+        """
+        Envoie une commande à toutes les succursales, qui l'exécutent en parallèle
+        Returns:
+            dict: nom de la succursale -> résultat
+        Raises:
+            ErreurSuccursale: première erreur, une fois toutes les réponses lues
+        """
+        with self._verrouiller():
+            return self._echanger(commande, arguments)
+
+    def _echanger(self, commande, arguments):
+        """
+        Diffuse une commande, toutes les succursales étant déjà verrouillées
+        (voir _diffuser)
+        """
+        succursales = list(self._succursales.values())
+        # Tous les envois avant toutes les réponses
+        for succursale in succursales:
+            succursale.envoyer(commande, arguments)
+        # Toutes les réponses sont lues, même après une erreur : une réponse
+        # laissée dans un tube serait prise pour celle de la commande suivante
+        resultats = {}
+        erreur = None
+        for succursale in succursales:
+            try:
+                resultats[succursale.nom] = succursale.recevoir()
+            except ErreurSuccursale as e:
+                erreur = erreur or e
+        if erreur is not None:
+            raise erreur
+        return resultats
+
+    # ========== Adhérents (communs) ==========
+
+    def ajouter_adherent(self, adherent):
+        """
+        Inscrit un adhérent dans toutes les succursales
+        """
+        return any(self._diffuser("ajouter_adherent", adherent).values())
+
+    def enlever_adherent(self, nom, prenom):
+        """
+        Désinscrit un adhérent s'il n'a d'emprunt en cours dans aucune succursale
+        (vérification et désinscription sous les verrous de toutes les
+        succursales : aucun emprunt ne peut être créé entre les deux)
+        """
+        with self._verrouiller():
+            if sum(self._echanger("compter_emprunts_actifs", (nom, prenom)).values()):
+                return False
+            return any(self._echanger("enlever_adherent", (nom, prenom)).values())
+
+    def rechercher_adherents(self, prefixe, limite=20):
+        """
+        Recherche d'adhérents par préfixe dans toutes les succursales (sans doublon)
+        """
+        fusion = {}
+        for adherents in self._diffuser("rechercher_adherents", prefixe, limite).values():
+            for adherent in adherents:
+                fusion.setdefault(adherent.get_identifiant(), adherent)
+        resultats = sorted(fusion.values(), key=lambda a: IndexPrefixe.normaliser(
+            f"{a.prenom} {a.nom}"))
+        return resultats[:limite]
+
+    def get_emprunts_adherent(self, nom, prenom):
+        """
+        Retourne les emprunts d'un adhérent dans toutes les succursales
+        Returns:
+            list: (nom de la succursale, emprunt), du plus ancien au plus récent
+        """
+        emprunts = [(succursale, emprunt)
+                    for succursale, liste in self._diffuser("emprunts_adherent", nom, prenom).items()
+                    for emprunt in liste]
+        emprunts.sort(key=lambda paire: paire[1].date_emprunt)
+        return emprunts
+
+    # ========== Documents (par succursale) ==========
+
+    def ajouter_document(self, succursale, document):
+        """
+        Ajoute un document au catalogue d'une succursale
+        Returns:
+            tuple: (succès, message)
+        """
+        if succursale not in self._succursales:
+            return False, f"Succursale inconnue: {succursale}"
+        proprietaire = self.succursale_de(document.titre)
+        if proprietaire is not None:
+            return False, f"Document déjà présent dans la succursale {proprietaire}"
+        self._succursales[succursale].appeler("ajouter_document", document)
+        self._proprietaires[self._cle(document.titre)] = succursale
+        return True, "Document ajouté"
+
+    def enlever_document(self, titre):
+        """
+        Retire un document du catalogue de sa succursale
+        """
+        succursale = self.succursale_de(titre)
+        if succursale is None:
+            return False
+        if self._succursales[succursale].appeler("enlever_document", titre):
+            self._proprietaires.pop(self._cle(titre), None)
+            return True
+        return False
+
+    def rechercher_documents(self, prefixe, limite=20):
+        """
+        Recherche de documents par préfixe dans toutes les succursales
+        Returns:
+            list: (nom de la succursale, document) par ordre alphabétique
+        """
+        resultats = [(succursale, document)
+                     for succursale, documents in
+                     self._diffuser("rechercher_documents", prefixe, limite).items()
+                     for document in documents]
+        resultats.sort(key=lambda paire: IndexPrefixe.normaliser(paire[1].titre))
+        return resultats[:limite]
+
+    # ========== Emprunts (dirigés vers la succursale du livre) ==========
+
+    def _router(self, commande, nom, prenom, titre):
+        """Exécute une opération de prêt dans la succursale qui possède le livre"""
+        succursale = self.succursale_de(titre)
+        if succursale is None:
+            return False, f"Livre '{titre}' introuvable"
+        return self._succursales[succursale].appeler(commande, nom, prenom, titre)
+
+    def emprunter(self, nom, prenom, titre):
+        """
+        Crée un emprunt dans la succursale du livre
+        Returns:
+            tuple: (succès, message)
+        """
+        return self._router("emprunter", nom, prenom, titre)
+
+    def retourner(self, nom, prenom, titre):
+        """
+        Enregistre un retour dans la succursale du livre
+        Returns:
+            tuple: (succès, message)
+        """
+        return self._router("retourner", nom, prenom, titre)
+
+    # ========== Statistiques et sauvegarde ==========
+
+    def get_statistiques_par_succursale(self, date_reference=None):
+        """
+        Retourne les statistiques de chaque succursale
+        """
+        return self._diffuser("statistiques", date_reference)
+
+    def get_statistiques(self, date_reference=None):
+        """
+        Retourne les statistiques consolidées du réseau
+        (les adhérents, communs, ne sont pas additionnés)
+        """
+        total = {}
+        for stats in self.get_statistiques_par_succursale(date_reference).values():
+            for cle, valeur in stats.items():
+                if cle == 'total_adherents':
+                    total[cle] = max(total.get(cle, 0), valeur)
+                else:
+                    total[cle] = total.get(cle, 0) + valeur
+        return total
+
+    def sauvegarder(self):
+        """
+        Sauvegarde toutes les succursales (en parallèle)
+        """
+        return all(self._diffuser("sauvegarder").values())
+
+
+def main(arguments=None):
+    """Fonction principale : affiche les statistiques consolidées"""
+    parseur = argparse.ArgumentParser(description="Statistiques d'un réseau de succursales")
+    parseur.add_argument("succursales", nargs="+", metavar="NOM=DOSSIER")
+    args = parseur.parse_args(arguments)
+
+    dossiers = {}
+    for definition in args.succursales:
+        nom, separateur, dossier = definition.partition("=")
+        if not separateur:
+            parseur.error(f"format attendu NOM=DOSSIER: {definition}")
+        dossiers[nom] = dossier
+
+    with Succursales(dossiers) as reseau:
+        for nom, stats in reseau.get_statistiques_par_succursale().items():
+            print(f"{nom}: {stats}")
+        print(f"Total: {reseau.get_statistiques()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
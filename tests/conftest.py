@@ -0,0 +1,23 @@
+"""
+Configuration commune des tests : imports depuis la racine du projet et
+dossier de données temporaire
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.file_manager import FileManager
+
+
+@pytest.fixture
+def dossier_data(tmp_path):
+    """Dossier de données vide, remis à sa valeur d'origine après le test"""
+    ancien = FileManager.DATA_DIR
+    FileManager.definir_dossier_data(str(tmp_path))
+    FileManager.initialiser_fichiers()
+    yield str(tmp_path)
+    FileManager.definir_dossier_data(ancien)
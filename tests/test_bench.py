@@ -0,0 +1,28 @@
+"""
+Tests de la comparaison des résultats du banc d'essai
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "scripts"))
+
+from bench_operations import comparer
+
+
+def _resultats(temps):
+    return [{'taille': 1000, 'operation': operation, 'min': t} for operation, t in temps.items()]
+
+
+def test_regression_au_dela_du_seuil_et_du_plancher():
+    reference = {'resultats': _resultats({'charger': 0.5, 'emprunter': 1e-6, 'retourner': 0.1})}
+    mesures = _resultats({'charger': 0.7, 'emprunter': 2e-6, 'retourner': 0.105, 'nouvelle': 1})
+    comparaison = {c['operation']: c for c in comparer(mesures, reference, seuil=1.2)}
+
+    assert set(comparaison) == {'charger', 'emprunter', 'retourner'}
+    assert comparaison['charger']['regression']
+    assert comparaison['charger']['rapport'] == 1.4
+    # Deux fois plus lent, mais d'une microseconde : bruit de mesure
+    assert not comparaison['emprunter']['regression']
+    assert not comparaison['retourner']['regression']
@@ -0,0 +1,42 @@
+"""
+Tests du chargement et de la sauvegarde hors du thread de l'interface
+"""
+
+import threading
+
+from classes.adherent import Adherent
+from classes.bibliotheque import Bibliotheque
+from classes.document import Livre
+from utils.file_manager import FileManager
+
+
+def test_chargement_signale_sa_progression(dossier_data):
+    FileManager.creer_donnees_test()
+    etapes = []
+    bibliotheque = FileManager.charger_bibliotheque(
+        progression=lambda pourcentage, message: etapes.append(pourcentage))
+    assert etapes == sorted(etapes)
+    assert etapes[0] == 0 and etapes[-1] == 100
+    assert bibliotheque.compter_adherents() == 3
+
+
+def test_sauvegarde_d_un_instantane_depuis_un_autre_thread(dossier_data):
+    bibliotheque = Bibliotheque()
+    marie = Adherent("Dupont", "Marie")
+    livre = Livre("1984", "George Orwell")
+    bibliotheque.ajouter_adherent(marie)
+    bibliotheque.ajouter_document(livre)
+
+    with bibliotheque.instantane() as instantane:
+        tache = threading.Thread(target=FileManager.sauvegarder_bibliotheque,
+                                 args=(instantane,))
+        # Modifications pendant l'écriture : elles n'apparaissent pas dans les fichiers
+        bibliotheque.ajouter_emprunt(marie, livre)
+        tache.start()
+        bibliotheque.ajouter_adherent(Adherent("Martin", "Pierre"))
+        tache.join()
+
+    assert FileManager._lire_lignes(FileManager.EMPRUNTS_FILE) == []
+    assert len(FileManager._lire_lignes(FileManager.ADHERENTS_FILE)) == 1
+    assert FileManager._lire_lignes(FileManager.BIBLIO_FILE) == [
+        "Livre,1984,George Orwell,True,1,1"]
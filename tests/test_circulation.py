@@ -0,0 +1,71 @@
+"""
+Tests des statistiques de circulation sur fenêtres glissantes
+"""
+
+from datetime import date, timedelta
+
+from classes.adherent import Adherent
+from classes.bibliotheque import Bibliotheque
+from classes.circulation import FenetreGlissante
+from classes.document import Livre
+from classes.horloge import HorlogeFixe
+
+
+AUJOURD_HUI = date(2024, 3, 1)
+
+
+def test_fenetre_compte_les_derniers_jours():
+    fenetre = FenetreGlissante(30, capacite=10)
+    jour = AUJOURD_HUI.toordinal()
+    fenetre.ajouter(jour - 40, "ancien")
+    fenetre.ajouter(jour - 5, "recent")
+    fenetre.ajouter(jour, "recent")
+    assert fenetre.comptes(jour) == {"recent": 2}
+    assert fenetre.comptes(jour - 3) == {"recent": 1}
+
+
+def test_date_future_ne_fait_pas_glisser_la_fenetre():
+    fenetre = FenetreGlissante(30, capacite=10)
+    jour = AUJOURD_HUI.toordinal()
+    fenetre.ajouter(jour - 10, "a")
+    fenetre.ajouter(jour, "b")
+
+    assert fenetre.comptes(jour + 25) == {"b": 1}
+    # Les jours suivis sont intacts pour la date réelle
+    assert fenetre.comptes(jour) == {"a": 1, "b": 1}
+    assert fenetre.plus_frequents(5, jour) == [("a", 1), ("b", 1)]
+
+
+def _bibliotheque():
+    bibliotheque = Bibliotheque(HorlogeFixe(AUJOURD_HUI))
+    adherents = [Adherent("Dupont", "Marie"), Adherent("Martin", "Pierre")]
+    livres = [Livre("1984", "George Orwell", exemplaires=2), Livre("Dune", "Frank Herbert")]
+    for adherent in adherents:
+        bibliotheque.ajouter_adherent(adherent)
+    for livre in livres:
+        bibliotheque.ajouter_document(livre)
+    return bibliotheque, adherents, livres
+
+
+def test_palmares_a_une_date_future_puis_aujourd_hui():
+    bibliotheque, (marie, pierre), (livre_1984, dune) = _bibliotheque()
+    bibliotheque.horloge = HorlogeFixe(AUJOURD_HUI - timedelta(days=20))
+    bibliotheque.ajouter_emprunt(marie, dune)
+    bibliotheque.horloge = HorlogeFixe(AUJOURD_HUI)
+    bibliotheque.ajouter_emprunt(marie, livre_1984)
+    bibliotheque.ajouter_emprunt(pierre, livre_1984)
+
+    bibliotheque.horloge = HorlogeFixe(AUJOURD_HUI + timedelta(days=15))
+    assert bibliotheque.get_livres_populaires() == [(livre_1984, 2)]
+    bibliotheque.horloge = HorlogeFixe(AUJOURD_HUI)
+    assert bibliotheque.get_livres_populaires() == [(livre_1984, 2), (dune, 1)]
+    assert bibliotheque.get_circulation() == {'emprunts': 3, 'retours': 0}
+
+
+def test_livres_retires_absents_du_palmares():
+    bibliotheque, (marie, _), (livre_1984, dune) = _bibliotheque()
+    bibliotheque.ajouter_emprunt(marie, dune)
+    bibliotheque.retourner_emprunt(marie, dune)
+    bibliotheque.ajouter_emprunt(marie, livre_1984)
+    assert bibliotheque.enlever_document(dune)
+    assert bibliotheque.get_livres_populaires() == [(livre_1984, 1)]
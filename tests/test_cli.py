@@ -0,0 +1,47 @@
+"""
+Tests du mode ligne de commande (sans interface graphique)
+"""
+
+import os
+import subprocess
+import sys
+
+from cli import executer
+from utils.file_manager import FileManager
+
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_emprunt_et_retour_sauvegardes(dossier_data, capsys):
+    assert executer(["--data", dossier_data, "ajouter-adherent", "Dupont", "Marie"]) == 0
+    assert executer(["--data", dossier_data, "ajouter-document", "Livre", "1984",
+                     "--auteur", "George Orwell"]) == 0
+    assert executer(["--data", dossier_data, "--date", "2026-01-01",
+                     "emprunter", "Dupont", "Marie", "1984"]) == 0
+    assert len(FileManager._lire_lignes(FileManager.EMPRUNTS_FILE)) == 1
+
+    capsys.readouterr()
+    assert executer(["--data", dossier_data, "--date", "2026-02-01", "retards"]) == 0
+    assert "1984 - Marie Dupont" in capsys.readouterr().out
+
+    assert executer(["--data", dossier_data, "retourner", "Dupont", "Marie", "1984"]) == 0
+    assert executer(["--data", dossier_data, "--date", "2026-02-01", "retards"]) == 0
+    assert "0 emprunt(s) en retard" in capsys.readouterr().out
+
+
+def test_echec_sans_sauvegarde(dossier_data, capsys):
+    executer(["--data", dossier_data, "ajouter-adherent", "Dupont", "Marie"])
+    avant = FileManager._lire_lignes(FileManager.EMPRUNTS_FILE)
+    assert executer(["--data", dossier_data, "emprunter", "Dupont", "Marie", "Inconnu"]) == 1
+    assert "introuvable" in capsys.readouterr().err
+    assert FileManager._lire_lignes(FileManager.EMPRUNTS_FILE) == avant
+
+
+def test_pyqt_jamais_importe(dossier_data):
+    script = ("import sys; from cli import executer; "
+              f"code = executer(['--data', {dossier_data!r}, 'statistiques']); "
+              "sys.exit(code or 'PyQt6' in sys.modules)")
+    resultat = subprocess.run([sys.executable, "-c", script], cwd=RACINE,
+                              capture_output=True, text=True)
+    assert resultat.returncode == 0, resultat.stderr
@@ -0,0 +1,58 @@
+"""
+Tests des postes de prêt concurrents (Bibliotheque(concurrent=True))
+"""
+
+import threading
+
+from classes.adherent import Adherent
+from classes.bibliotheque import Bibliotheque
+from classes.document import Livre
+
+
+def _en_parallele(fonctions):
+    """Lance les fonctions dans des threads démarrés ensemble et retourne leurs résultats"""
+    depart = threading.Barrier(len(fonctions))
+    resultats = [None] * len(fonctions)
+
+    def lancer(i, fonction):
+        depart.wait()
+        resultats[i] = fonction()
+
+    taches = [threading.Thread(target=lancer, args=(i, f)) for i, f in enumerate(fonctions)]
+    for tache in taches:
+        tache.start()
+    for tache in taches:
+        tache.join()
+    return resultats
+
+
+def test_un_seul_emprunt_par_exemplaire():
+    bibliotheque = Bibliotheque(concurrent=True)
+    livre = Livre("1984", "George Orwell", exemplaires=2)
+    bibliotheque.ajouter_document(livre)
+    adherents = [Adherent(f"Nom{i}", f"Prenom{i}") for i in range(12)]
+    for adherent in adherents:
+        bibliotheque.ajouter_adherent(adherent)
+
+    for _ in range(20):
+        resultats = _en_parallele([lambda a=a: bibliotheque.ajouter_emprunt(a, livre)
+                                   for a in adherents])
+        assert sum(succes for succes, _ in resultats) == 2
+        assert livre.disponibles == 0
+        actifs = [e for e in bibliotheque.get_emprunts() if e.est_actif()]
+        assert len(actifs) == 2
+        for emprunt in actifs:
+            assert bibliotheque.retourner_emprunt(emprunt.adherent, livre)[0]
+    assert livre.disponibles == 2
+
+
+def test_meme_adherent_sur_plusieurs_postes():
+    bibliotheque = Bibliotheque(concurrent=True)
+    marie = Adherent("Dupont", "Marie")
+    livre = Livre("1984", "George Orwell", exemplaires=5)
+    bibliotheque.ajouter_adherent(marie)
+    bibliotheque.ajouter_document(livre)
+
+    resultats = _en_parallele([lambda: bibliotheque.ajouter_emprunt(marie, livre)] * 8)
+    assert sum(succes for succes, _ in resultats) == 1
+    assert livre.disponibles == 4
@@ -0,0 +1,71 @@
+"""
+Tests des événements de modification de la bibliothèque
+"""
+
+from classes.adherent import Adherent
+from classes.bibliotheque import Bibliotheque
+from classes.document import BD, Livre
+from classes.evenements import (AdherentAjoute, BusEvenements, DocumentEnleve,
+                                DocumentModifie, EmpruntCree, EmpruntRetourne,
+                                EvenementEmprunt)
+
+
+def test_lignes_des_documents_apres_suppression():
+    bibliotheque = Bibliotheque()
+    marie = Adherent("Dupont", "Marie")
+    bibliotheque.ajouter_adherent(marie)
+    bd = BD("Tintin", "Hergé", "Hergé")
+    dune, fondation = Livre("Dune", "Frank Herbert"), Livre("Fondation", "Isaac Asimov")
+    for document in (bd, dune, fondation):
+        bibliotheque.ajouter_document(document)
+    evenements = []
+    bibliotheque.abonner(evenements.append)
+
+    bibliotheque.enlever_document(bd)
+    bibliotheque.ajouter_emprunt(marie, fondation)
+    bibliotheque.retourner_emprunt(marie, fondation)
+
+    lignes = [(type(e), e.ligne) for e in evenements
+              if isinstance(e, (DocumentEnleve, DocumentModifie, EmpruntRetourne))]
+    assert lignes == [(DocumentEnleve, 0), (DocumentModifie, 1),
+                      (EmpruntRetourne, None), (DocumentModifie, 1)]
+    assert bibliotheque.get_documents()[1] is fondation
+
+
+def test_filtre_par_type_et_lots():
+    bus = BusEvenements()
+    tous, emprunts, lots = [], [], []
+    bus.abonner(tous.append)
+    bus.abonner(emprunts.append, types=EvenementEmprunt)
+    bus.abonner(lots.append, par_lot=True)
+
+    bus.publier(AdherentAjoute("a", 0))
+    with bus.lot():
+        bus.publier(EmpruntCree("e", None))
+        with bus.lot():
+            bus.publier(EmpruntRetourne("r", None))
+        assert len(tous) == 1
+    assert [type(e) for e in tous] == [AdherentAjoute, EmpruntCree, EmpruntRetourne]
+    assert [type(e) for e in emprunts] == [EmpruntCree, EmpruntRetourne]
+    # Un appel hors lot, puis un seul appel pour tout le lot (imbriqué compris)
+    assert [[type(e) for e in lot] for lot in lots] == [
+        [AdherentAjoute], [EmpruntCree, EmpruntRetourne]]
+
+    bus.desabonner(tous.append)
+    bus.publier(AdherentAjoute("b", 1))
+    assert len(tous) == 3
+
+
+def test_emprunt_groupe_distribue_en_un_lot():
+    bibliotheque = Bibliotheque()
+    marie = Adherent("Dupont", "Marie")
+    livres = [Livre("Dune", "Frank Herbert"), Livre("Fondation", "Isaac Asimov")]
+    bibliotheque.ajouter_adherent(marie)
+    for livre in livres:
+        bibliotheque.ajouter_document(livre)
+    lots = []
+    bibliotheque.abonner(lots.append, types=EmpruntCree, par_lot=True)
+
+    assert bibliotheque.emprunter_lot(marie, livres)[0]
+    assert len(lots) == 1
+    assert [e.objet.livre for e in lots[0]] == livres
@@ -0,0 +1,113 @@
+"""
+Tests des compteurs d'exemplaires des livres
+"""
+
+from classes.adherent import Adherent
+from classes.bibliotheque import Bibliotheque
+from classes.document import Livre
+from cli import executer
+from utils.file_manager import FileManager
+
+
+def _creer_fonds():
+    """Un livre en trois exemplaires et deux adhérents, sauvegardés"""
+    bibliotheque = Bibliotheque()
+    bibliotheque.ajouter_adherent(Adherent("Dupont", "Marie"))
+    bibliotheque.ajouter_adherent(Adherent("Martin", "Pierre"))
+    bibliotheque.ajouter_document(Livre("1984", "George Orwell", exemplaires=3))
+    assert FileManager.sauvegarder_bibliotheque(bibliotheque)
+
+
+def test_sauvegardes_concurrentes_gardent_les_exemplaires_disponibles(dossier_data):
+    _creer_fonds()
+    premiere = FileManager.charger_bibliotheque()
+    seconde = FileManager.charger_bibliotheque()
+
+    for bibliotheque, nom, prenom in ((premiere, "Dupont", "Marie"),
+                                      (seconde, "Martin", "Pierre")):
+        succes, _ = bibliotheque.ajouter_emprunt(
+            bibliotheque.rechercher_adherent(nom, prenom),
+            bibliotheque.rechercher_document("1984"))
+        assert succes
+    assert FileManager.sauvegarder_bibliotheque(premiere)
+    assert FileManager.sauvegarder_bibliotheque(seconde)
+    assert seconde.etat_fichiers['fusion']
+
+    assert "Livre,1984,George Orwell,True,3,1" in FileManager._lire_lignes(FileManager.BIBLIO_FILE)
+    rechargee = FileManager.charger_bibliotheque()
+    livre = rechargee.rechercher_document("1984")
+    assert len(rechargee.get_emprunts_actifs()) == 2
+    assert (livre.exemplaires, livre.disponibles) == (3, 1)
+
+
+def test_chargement_recalcule_un_compteur_faux(dossier_data):
+    _creer_fonds()
+    bibliotheque = FileManager.charger_bibliotheque()
+    bibliotheque.ajouter_emprunt(bibliotheque.rechercher_adherent("Dupont", "Marie"),
+                                 bibliotheque.rechercher_document("1984"))
+    FileManager.sauvegarder_bibliotheque(bibliotheque)
+    FileManager._ecrire_lignes(FileManager.BIBLIO_FILE, ["Livre,1984,George Orwell,True,3,3"])
+
+    livre = FileManager.charger_bibliotheque().rechercher_document("1984")
+    assert livre.disponibles == 2
+
+
+def test_recompter_lignes_livres():
+    lignes = FileManager.recompter_lignes_livres(
+        ["Livre,A,X,True,2,2", "BD,B,Y,Z", "Livre,C,X,True,1,1"],
+        ["Dupont_Marie,A,2026-01-02,None", "Martin_Pierre,A,2026-01-03,2026-01-05",
+         "Martin_Pierre,C,2026-01-04,None"])
+    assert lignes == ["Livre,A,X,True,2,1", "BD,B,Y,Z", "Livre,C,X,False,1,0"]
+
+
+def test_nombre_d_exemplaires_invalide_refuse():
+    livre = Livre("1984", "George Orwell")
+    assert not livre.ajouter_exemplaires(0)
+    assert not livre.ajouter_exemplaires(-5)
+    assert not livre.ajouter_exemplaires(2, disponibles=3)
+    assert (livre.exemplaires, livre.disponibles) == (1, 1)
+
+    bibliotheque = Bibliotheque()
+    bibliotheque.ajouter_document(livre)
+    assert not bibliotheque.ajouter_exemplaires(livre, -5)
+    assert bibliotheque.ajouter_exemplaires(livre, 2)
+    assert (livre.exemplaires, livre.disponibles) == (3, 3)
+
+
+def test_cli_refuse_un_nombre_negatif_pour_un_livre_existant(dossier_data):
+    _creer_fonds()
+    avant = FileManager._lire_lignes(FileManager.BIBLIO_FILE)
+    code = executer(["--data", dossier_data, "ajouter-document", "Livre", "1984",
+                     "--exemplaires", "-5"])
+    assert code == 1
+    assert FileManager._lire_lignes(FileManager.BIBLIO_FILE) == avant
+
+
+def test_homonymes_d_auteurs_differents_restent_distincts(dossier_data):
+    lignes = FileManager.recompter_lignes_livres(
+        ["Livre,Dune,Frank Herbert,True,2,2", "Livre,Dune,Autre Auteur,True,1,1"],
+        ["Dupont_Marie,Dune,2026-01-02,None"])
+    assert lignes == ["Livre,Dune,Frank Herbert,True,2,1", "Livre,Dune,Autre Auteur,True,1,1"]
+
+    # Ancien format (une ligne par exemplaire) : seuls les exemplaires du même livre s'additionnent
+    FileManager._ecrire_lignes(FileManager.BIBLIO_FILE, [
+        "Livre,Dune,Frank Herbert,True", "Livre,Dune,Frank Herbert,True",
+        "Livre,Dune,Autre Auteur,True"])
+    documents = FileManager.charger_bibliotheque().get_documents()
+    assert [(d.auteur, d.exemplaires) for d in documents] == [("Frank Herbert", 2),
+                                                              ("Autre Auteur", 1)]
+
+    bibliotheque = Bibliotheque()
+    bibliotheque.ajouter_document(Livre("Dune", "Frank Herbert"))
+    bibliotheque.ajouter_document(Livre("Dune", "Autre Auteur", exemplaires=2))
+    assert [(d.auteur, d.exemplaires) for d in bibliotheque.get_documents()] == [
+        ("Frank Herbert", 1), ("Autre Auteur", 2)]
+
+
+def test_cli_n_ajoute_pas_d_exemplaires_a_un_homonyme(dossier_data):
+    _creer_fonds()
+    avant = FileManager._lire_lignes(FileManager.BIBLIO_FILE)
+    code = executer(["--data", dossier_data, "ajouter-document", "Livre", "1984",
+                     "--auteur", "Autre Auteur", "--exemplaires", "2"])
+    assert code == 1
+    assert FileManager._lire_lignes(FileManager.BIBLIO_FILE) == avant
@@ -0,0 +1,73 @@
+"""
+Tests de la fusion à trois voies des sauvegardes concurrentes
+"""
+
+from classes.adherent import Adherent
+from classes.bibliotheque import Bibliotheque
+from classes.document import Livre
+from utils.file_manager import FileManager
+
+
+def _fusionner(base, nous, eux):
+    return FileManager.fusionner_lignes(FileManager._empreinte(base), nous, eux)
+
+
+def test_ajouts_des_deux_cotes():
+    assert _fusionner(["a"], ["a", "b"], ["a", "c"]) == ["a", "c", "b"]
+
+
+def test_suppression_d_un_seul_cote():
+    assert _fusionner(["a", "b"], ["a"], ["a", "b", "c"]) == ["a", "c"]
+    assert _fusionner(["a", "b"], ["a", "b", "c"], ["b"]) == ["b", "c"]
+
+
+def test_meme_modification_appliquee_une_fois():
+    assert _fusionner(["a"], ["a", "b"], ["a", "b"]) == ["a", "b"]
+    assert _fusionner(["a", "b"], ["b"], ["b"]) == ["b"]
+
+
+def test_modification_d_une_ligne_et_ajout_concurrent():
+    # Modifier une ligne, c'est retirer l'ancienne et ajouter la nouvelle
+    assert _fusionner(["x,1", "y,1"], ["x,2", "y,1"], ["x,1", "y,1", "z,1"]) == \
+        ["y,1", "z,1", "x,2"]
+
+
+def test_lignes_en_double_comptees_en_multiensemble():
+    assert _fusionner(["a", "a"], ["a", "a", "a"], ["a"]) == ["a", "a"]
+    assert _fusionner([], ["a"], ["a", "a"]) == ["a", "a"]
+
+
+def test_sauvegardes_concurrentes_de_deux_instances(dossier_data):
+    bibliotheque = Bibliotheque()
+    bibliotheque.ajouter_adherent(Adherent("Dupont", "Marie"))
+    bibliotheque.ajouter_adherent(Adherent("Martin", "Pierre"))
+    bibliotheque.ajouter_document(Livre("1984", "George Orwell"))
+    assert FileManager.sauvegarder_bibliotheque(bibliotheque)
+
+    premiere = FileManager.charger_bibliotheque()
+    seconde = FileManager.charger_bibliotheque()
+    premiere.ajouter_adherent(Adherent("Leroy", "Paul"))
+    premiere.enlever_adherent(premiere.rechercher_adherent("Martin", "Pierre"))
+    seconde.ajouter_adherent(Adherent("Roux", "Lea"))
+    seconde.ajouter_document(Livre("Dune", "Frank Herbert"))
+
+    assert FileManager.sauvegarder_bibliotheque(premiere)
+    assert not premiere.etat_fichiers['fusion']
+    assert FileManager.sauvegarder_bibliotheque(seconde)
+    assert seconde.etat_fichiers['fusion']
+
+    rechargee = FileManager.charger_bibliotheque()
+    assert sorted(a.nom for a in rechargee.get_adherents()) == ["Dupont", "Leroy", "Roux"]
+    assert sorted(d.titre for d in rechargee.get_documents()) == ["1984", "Dune"]
+    assert FileManager.lire_versions()["Adherents.txt"] == 3
+
+
+def test_sauvegarde_sans_changement_ne_reecrit_rien(dossier_data):
+    bibliotheque = Bibliotheque()
+    bibliotheque.ajouter_adherent(Adherent("Dupont", "Marie"))
+    FileManager.sauvegarder_bibliotheque(bibliotheque)
+    versions = FileManager.lire_versions()
+
+    chargee = FileManager.charger_bibliotheque()
+    assert FileManager.sauvegarder_bibliotheque(chargee)
+    assert FileManager.lire_versions() == versions
@@ -0,0 +1,40 @@
+"""
+Tests du générateur de jeux de données synthétiques
+"""
+
+from datetime import date
+
+from utils.file_manager import FileManager
+from utils.generateur import generer_donnees
+
+
+FIN = date(2026, 3, 1)
+
+
+def _fichiers():
+    return {filepath: FileManager._lire_lignes(filepath)
+            for filepath in (FileManager.ADHERENTS_FILE, FileManager.BIBLIO_FILE,
+                             FileManager.EMPRUNTS_FILE)}
+
+
+def test_meme_graine_memes_fichiers(dossier_data):
+    bilan = generer_donnees(50, 80, 2000, graine=3, date_fin=FIN)
+    premiers = _fichiers()
+    assert generer_donnees(50, 80, 2000, graine=3, date_fin=FIN) == bilan
+    assert _fichiers() == premiers
+    generer_donnees(50, 80, 2000, graine=4, date_fin=FIN)
+    assert _fichiers() != premiers
+
+
+def test_jeu_genere_coherent_au_chargement(dossier_data):
+    bilan = generer_donnees(40, 60, 1500, graine=1, date_fin=FIN)
+    bibliotheque = FileManager.charger_bibliotheque()
+
+    assert bibliotheque.compter_adherents() == bilan['adherents']
+    assert len(bibliotheque.get_emprunts()) == bilan['emprunts']
+    actifs = [e for e in bibliotheque.get_emprunts() if e.est_actif()]
+    assert len(actifs) == bilan['emprunts_actifs']
+    assert len(bibliotheque.get_emprunts_en_retard(FIN)) == bilan['emprunts_retard']
+    # Jamais plus d'emprunts en cours que d'exemplaires
+    for livre in {e.livre for e in actifs}:
+        assert livre.disponibles >= 0
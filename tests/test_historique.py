@@ -0,0 +1,68 @@
+"""
+Tests de la recherche paginée dans l'historique des emprunts
+"""
+
+from datetime import date, timedelta
+
+from classes.adherent import Adherent
+from classes.bibliotheque import Bibliotheque
+from classes.document import Livre
+from classes.emprunt import Emprunt
+from classes.horloge import HorlogeFixe
+
+
+AUJOURD_HUI = date(2026, 3, 1)
+
+
+def _historique(ordre=range(10)):
+    """Dix emprunts, un tous les cinq jours ; les pairs sont rendus"""
+    bibliotheque = Bibliotheque(HorlogeFixe(AUJOURD_HUI))
+    marie, pierre = Adherent("Dupont", "Marie"), Adherent("Martin", "Pierre")
+    bibliotheque.ajouter_adherent(marie)
+    bibliotheque.ajouter_adherent(pierre)
+    emprunts = []
+    for i in range(10):
+        livre = Livre(f"Livre {i}", "Auteur")
+        bibliotheque.ajouter_document(livre)
+        debut = AUJOURD_HUI - timedelta(days=50 - 5 * i)
+        retour = debut + timedelta(days=3) if i % 2 == 0 else None
+        emprunts.append(Emprunt(marie if i < 5 else pierre, livre, debut, retour))
+    for i in ordre:
+        bibliotheque.restaurer_emprunt(emprunts[i])
+    return bibliotheque, emprunts, marie
+
+
+def test_pages_du_plus_recent_au_plus_ancien():
+    bibliotheque, emprunts, _ = _historique()
+    page, total = bibliotheque.rechercher_emprunts(page=1, taille_page=4)
+    assert total == 10
+    assert page == emprunts[5::-1][:4]
+    page, _ = bibliotheque.rechercher_emprunts(page=2, taille_page=4, decroissant=False)
+    assert page == emprunts[8:]
+    assert bibliotheque.rechercher_emprunts(page=5, taille_page=4) == ([], 10)
+
+
+def test_filtres_periode_et_statut():
+    bibliotheque, emprunts, marie = _historique()
+    page, total = bibliotheque.rechercher_emprunts(
+        date_debut=emprunts[2].date_emprunt, date_fin=emprunts[6].date_emprunt,
+        decroissant=False)
+    assert (page, total) == (emprunts[2:7], 5)
+
+    page, total = bibliotheque.rechercher_emprunts(adherent=marie,
+                                                   statut=Bibliotheque.STATUT_ACTIF)
+    assert page == [emprunts[3], emprunts[1]]
+
+    # Prêtés depuis plus de 14 jours et non rendus
+    page, _ = bibliotheque.rechercher_emprunts(statut=Bibliotheque.STATUT_RETARD)
+    assert page == [emprunts[7], emprunts[5], emprunts[3], emprunts[1]]
+
+
+def test_tri_par_statut_et_historique_non_trie():
+    bibliotheque, emprunts, _ = _historique(ordre=[3, 0, 9, 1, 8, 2, 7, 4, 6, 5])
+    page, total = bibliotheque.rechercher_emprunts(tri=Bibliotheque.TRI_STATUT, taille_page=10)
+    # Retards, puis en cours, puis rendus ; les plus récents d'abord dans chaque groupe
+    assert page == [emprunts[7], emprunts[5], emprunts[3], emprunts[1], emprunts[9],
+                    emprunts[8], emprunts[6], emprunts[4], emprunts[2], emprunts[0]]
+    page, _ = bibliotheque.rechercher_emprunts(page=0, taille_page=3)
+    assert page == [emprunts[9], emprunts[8], emprunts[7]]
@@ -0,0 +1,40 @@
+"""
+Tests de l'horloge injectable et de l'évaluation des emprunts à une date
+"""
+
+from datetime import date
+
+from classes.adherent import Adherent
+from classes.bibliotheque import Bibliotheque
+from classes.document import Livre
+from classes.emprunt import Emprunt
+from classes.horloge import HorlogeFixe
+
+
+def test_retard_evalue_a_la_date_de_reference():
+    emprunt = Emprunt(Adherent("Dupont", "Marie"), Livre("1984", "George Orwell"),
+                      date(2026, 1, 1))
+    assert emprunt.calculer_date_retour_prevue() == date(2026, 1, 15)
+    assert not emprunt.est_en_retard(date(2026, 1, 15))
+    assert emprunt.est_en_retard(date(2026, 1, 20))
+    assert emprunt.jours_retard(date(2026, 1, 20)) == 5
+    assert emprunt.jours_retard(date(2026, 1, 10)) == 0
+
+
+def test_bibliotheque_date_et_evalue_avec_son_horloge():
+    horloge = HorlogeFixe(date(2026, 1, 1))
+    bibliotheque = Bibliotheque(horloge)
+    marie, livre = Adherent("Dupont", "Marie"), Livre("1984", "George Orwell")
+    bibliotheque.ajouter_adherent(marie)
+    bibliotheque.ajouter_document(livre)
+    bibliotheque.ajouter_emprunt(marie, livre)
+
+    [emprunt] = bibliotheque.get_emprunts()
+    assert emprunt.date_emprunt == date(2026, 1, 1)
+    assert bibliotheque.get_emprunts_en_retard() == []
+
+    horloge.date_reference = date(2026, 2, 1)
+    assert bibliotheque.get_emprunts_en_retard() == [emprunt]
+    assert bibliotheque.get_statistiques()['emprunts_retard'] == 1
+    # Rapport « à la date du » sans toucher à l'horloge
+    assert bibliotheque.get_statistiques(date(2026, 1, 10))['emprunts_retard'] == 0
@@ -0,0 +1,48 @@
+"""
+Tests de la recherche par préfixe (sélecteurs d'adhérents et de livres)
+"""
+
+from classes.adherent import Adherent
+from classes.bibliotheque import Bibliotheque
+from classes.document import Livre
+from classes.index import IndexPrefixe
+
+
+def test_recherche_sans_casse_ni_accents_et_sans_doublon():
+    index = IndexPrefixe()
+    helene = Adherent("Durand", "Hélène")
+    index.ajouter(helene, "Hélène Durand", "Durand Hélène")
+    index.ajouter("autre", "Henri Dupont", "Dupont Henri")
+    assert index.rechercher("helene") == [helene]
+    assert index.rechercher("DU") == ["autre", helene]
+    assert index.rechercher("h", limite=1) == [helene]
+
+
+def test_retraits_et_ajouts_nombreux():
+    index = IndexPrefixe()
+    objets = [f"livre {i:03d}" for i in range(200)]
+    for objet in objets:
+        index.ajouter(objet, objet)
+    for objet in objets[:150]:
+        index.retirer(objet)
+    assert len(index) == 50
+    assert index.rechercher("livre", limite=3) == objets[150:153]
+    assert objets[0] not in index
+
+
+def test_livres_disponibles_suivent_les_emprunts():
+    bibliotheque = Bibliotheque()
+    marie = Adherent("Dupont", "Marie")
+    livre = Livre("Les Misérables", "Victor Hugo")
+    bibliotheque.ajouter_adherent(marie)
+    bibliotheque.ajouter_document(livre)
+    assert bibliotheque.rechercher_livres_disponibles("les mis") == [livre]
+    assert bibliotheque.rechercher_livres_disponibles("victor") == [livre]
+    assert bibliotheque.rechercher_adherents("marie d") == [marie]
+
+    bibliotheque.ajouter_emprunt(marie, livre)
+    assert bibliotheque.rechercher_livres_disponibles("les mis") == []
+    assert [e.livre for e in bibliotheque.rechercher_emprunts_actifs("dupont")] == [livre]
+    bibliotheque.retourner_emprunt(marie, livre)
+    assert bibliotheque.rechercher_livres_disponibles("les mis") == [livre]
+    assert bibliotheque.rechercher_emprunts_actifs("dupont") == []
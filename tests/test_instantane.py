@@ -0,0 +1,86 @@
+"""
+Tests des instantanés (copie sur écriture)
+"""
+
+from datetime import date
+
+from classes.adherent import Adherent
+from classes.bibliotheque import Bibliotheque
+from classes.document import Livre
+from classes.horloge import HorlogeFixe
+from utils.file_manager import FileManager
+
+
+def _bibliotheque():
+    bibliotheque = Bibliotheque()
+    bibliotheque.horloge = HorlogeFixe(date(2026, 3, 2))
+    bibliotheque.ajouter_adherent(Adherent("Dupont", "Marie"))
+    bibliotheque.ajouter_document(Livre("1984", "George Orwell", exemplaires=2))
+    return bibliotheque
+
+
+def test_instantane_fige_listes_objets_et_agregats():
+    bibliotheque = _bibliotheque()
+    marie = bibliotheque.rechercher_adherent("Dupont", "Marie")
+    livre = bibliotheque.rechercher_document("1984")
+    bibliotheque.ajouter_emprunt(marie, livre)
+
+    with bibliotheque.instantane() as instantane:
+        agregats = instantane.lignes_csv_agregats()
+        documents = list(instantane.lignes_csv_documents())
+        bibliotheque.retourner_emprunt(marie, livre)
+        bibliotheque.ajouter_adherent(Adherent("Martin", "Pierre"))
+
+        assert instantane.lignes_csv_agregats() == agregats
+        assert list(instantane.lignes_csv_documents()) == documents
+        assert [e.est_actif() for e in instantane.get_emprunts()] == [True]
+        assert len(instantane.get_adherents()) == 1
+
+    assert bibliotheque.lignes_csv_agregats() != agregats
+    assert not bibliotheque.get_emprunts()[0].est_actif()
+    assert len(bibliotheque.get_adherents()) == 2
+
+
+def test_sauvegarde_d_un_instantane_ecrit_des_agregats_a_jour(dossier_data):
+    bibliotheque = _bibliotheque()
+    bibliotheque.ajouter_emprunt(bibliotheque.rechercher_adherent("Dupont", "Marie"),
+                                 bibliotheque.rechercher_document("1984"))
+    with bibliotheque.instantane() as instantane:
+        assert FileManager.sauvegarder_bibliotheque(instantane)
+
+    lignes = FileManager._lire_lignes(FileManager.AGREGATS_FILE)
+    assert lignes[0] == "version,1,1"
+    assert lignes[1:] == bibliotheque.lignes_csv_agregats()
+    chargee = FileManager.charger_bibliotheque()
+    assert chargee.lignes_csv_agregats() == bibliotheque.lignes_csv_agregats()
+
+
+def test_listes_copiees_seulement_a_la_premiere_modification():
+    bibliotheque = _bibliotheque()
+    instantane = bibliotheque.instantane()
+    assert instantane._documents is bibliotheque._documents
+    assert instantane._adherents is bibliotheque._adherents
+
+    bibliotheque.ajouter_adherent(Adherent("Martin", "Pierre"))
+    assert instantane._adherents is not bibliotheque._adherents
+    assert instantane._documents is bibliotheque._documents
+    instantane.fermer()
+
+    # Instantané fermé : plus de copie à la modification suivante
+    adherents = bibliotheque._adherents
+    bibliotheque.ajouter_adherent(Adherent("Durand", "Paul"))
+    assert bibliotheque._adherents is adherents
+
+
+def test_statistiques_de_l_instantane_a_sa_date():
+    bibliotheque = _bibliotheque()
+    marie = bibliotheque.rechercher_adherent("Dupont", "Marie")
+    livre = bibliotheque.rechercher_document("1984")
+    with bibliotheque.instantane() as instantane:
+        bibliotheque.ajouter_emprunt(marie, livre)
+        stats = instantane.get_statistiques()
+        assert stats['emprunts_actifs'] == 0
+        assert stats['exemplaires_disponibles'] == 2
+        assert instantane.get_livres_disponibles()[0].disponibles == 2
+    assert livre.disponibles == 1
+    assert bibliotheque.get_statistiques()['emprunts_actifs'] == 1
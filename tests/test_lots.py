@@ -0,0 +1,58 @@
+"""
+Tests des emprunts et retours groupés (tout ou rien)
+"""
+
+from datetime import date
+
+from classes.adherent import Adherent
+from classes.bibliotheque import Bibliotheque
+from classes.document import Dictionnaire, Livre
+from classes.horloge import HorlogeFixe
+
+
+def _bibliotheque():
+    """Une adhérente et trois livres à un exemplaire"""
+    bibliotheque = Bibliotheque(HorlogeFixe(date(2026, 1, 1)))
+    marie = Adherent("Dupont", "Marie")
+    bibliotheque.ajouter_adherent(marie)
+    livres = [Livre("Dune", "Frank Herbert"), Livre("Fondation", "Isaac Asimov"),
+              Livre("1984", "George Orwell")]
+    for livre in livres:
+        bibliotheque.ajouter_document(livre)
+    return bibliotheque, marie, livres
+
+
+def test_emprunt_groupe_refuse_en_entier():
+    bibliotheque, marie, livres = _bibliotheque()
+    pierre = Adherent("Martin", "Pierre")
+    bibliotheque.ajouter_adherent(pierre)
+    bibliotheque.ajouter_emprunt(pierre, livres[2])
+    dictionnaire = Dictionnaire("Larousse", "Pierre Larousse")
+    bibliotheque.ajouter_document(dictionnaire)
+
+    succes, message = bibliotheque.emprunter_lot(
+        marie, [livres[0], livres[0], livres[2], dictionnaire])
+    assert not succes
+    assert "Dune: présent deux fois" in message
+    assert "1984: aucun exemplaire" in message
+    assert "Larousse: seuls les livres" in message
+    assert bibliotheque.get_emprunts_adherent(marie) == []
+    assert livres[0].disponibles == 1
+
+
+def test_emprunt_puis_retour_groupes():
+    bibliotheque, marie, livres = _bibliotheque()
+    succes, recu = bibliotheque.emprunter_lot(marie, livres)
+    assert succes and "1984" in recu
+    assert all(livre.disponibles == 0 for livre in livres)
+
+    emprunts = bibliotheque.get_emprunts_adherent(marie)
+    assert bibliotheque.retourner_lot(emprunts[:1])[0]
+    # Un retour déjà enregistré fait échouer tout le lot
+    succes, message = bibliotheque.retourner_lot(emprunts)
+    assert not succes and "aucun emprunt actif" in message
+    assert [livre.disponibles for livre in livres] == [1, 0, 0]
+
+    assert bibliotheque.retourner_lot(emprunts[1:])[0]
+    assert all(livre.disponibles == 1 for livre in livres)
+    assert not any(emprunt.est_actif() for emprunt in emprunts)
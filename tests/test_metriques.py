@@ -0,0 +1,70 @@
+"""
+Tests des métriques d'exploitation et de leur export
+"""
+
+import json
+
+import pytest
+
+from classes.adherent import Adherent
+from classes.bibliotheque import Bibliotheque
+from classes.document import Livre
+from utils import metriques
+from utils.metriques import Histogramme, Registre
+
+
+@pytest.fixture
+def registre():
+    """Registre neuf, méthodes de Bibliotheque chronométrées le temps du test"""
+    registre = Registre()
+    metriques.instrumenter((Bibliotheque,), registre)
+    yield registre
+    metriques.desinstrumenter()
+
+
+def test_appels_refus_et_erreurs_comptes(registre):
+    bibliotheque = Bibliotheque()
+    marie, livre = Adherent("Dupont", "Marie"), Livre("1984", "George Orwell")
+    bibliotheque.ajouter_adherent(marie)
+    bibliotheque.ajouter_document(livre)
+    assert bibliotheque.ajouter_emprunt(marie, livre)[0]
+    assert not bibliotheque.ajouter_emprunt(marie, livre)[0]
+    with pytest.raises(Exception):
+        bibliotheque.ajouter_emprunt(None, livre)
+
+    emprunts = registre.histogramme("Bibliotheque", "ajouter_emprunt")
+    assert (emprunts.appels, emprunts.refus, emprunts.erreurs) == (3, 1, 1)
+    assert registre.histogramme("Bibliotheque", "_verrouiller") is None
+
+    metriques.desinstrumenter()
+    assert not metriques.est_instrumente()
+    bibliotheque.get_emprunts()
+    assert registre.histogramme("Bibliotheque", "get_emprunts") is None
+
+
+def test_export_prometheus_et_json(tmp_path):
+    registre = Registre(bornes=(0.01, 0.1))
+    for duree in (0.005, 0.05, 0.5):
+        registre.observer("Bibliotheque", "ajouter_emprunt", duree)
+    texte = registre.exporter_prometheus()
+    etiquettes = 'classe="Bibliotheque",operation="ajouter_emprunt"'
+    assert f'_bucket{{{etiquettes},le="0.01"}} 1' in texte
+    assert f'_bucket{{{etiquettes},le="0.1"}} 2' in texte
+    assert f'_bucket{{{etiquettes},le="+Inf"}} 3' in texte
+    assert f'_count{{{etiquettes}}} 3' in texte
+
+    chemin = str(tmp_path / "metriques.json")
+    registre.ecrire_json(chemin)
+    with open(chemin, encoding='utf-8') as f:
+        resume = json.load(f)["Bibliotheque.ajouter_emprunt"]
+    assert resume['appels'] == 3 and resume['max'] == 0.5
+
+
+def test_quantiles_de_l_histogramme():
+    histogramme = Histogramme(bornes=(0.001, 0.01, 0.1))
+    for _ in range(90):
+        histogramme.observer(0.0005)
+    for _ in range(10):
+        histogramme.observer(0.05)
+    assert histogramme.quantile(0.5) <= 0.001
+    assert 0.01 < histogramme.quantile(0.99) <= 0.1
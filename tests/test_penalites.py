@@ -0,0 +1,84 @@
+"""
+Tests du calcul des pénalités de retard par lot
+"""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from classes.emprunt import Emprunt
+from utils import penalites
+from utils.penalites import ColonnesEmprunts, MoteurPenalites, Tarif, formater_montant
+
+
+REFERENCE = date(2026, 3, 1)
+
+
+def _attendu(lignes, tarifs, reference):
+    """Pénalités calculées emprunt par emprunt avec Tarif.calculer"""
+    totaux = {}
+    for identifiant, nom_type, debut, retour in lignes:
+        tarif = tarifs.get(nom_type)
+        if tarif is None or debut > reference:
+            continue
+        fin = reference if retour is None or retour > reference else retour
+        jours = (fin - debut).days - Emprunt.DUREE_EMPRUNT_JOURS
+        montant = tarif.calculer(jours)
+        if montant:
+            totaux[identifiant] = totaux.get(identifiant, 0) + montant
+    return totaux
+
+
+def _lignes(graine, nombre=500):
+    aleatoire = random.Random(graine)
+    lignes = []
+    for _ in range(nombre):
+        debut = REFERENCE - timedelta(days=aleatoire.randint(-10, 200))
+        duree = aleatoire.randint(0, 120)
+        retour = debut + timedelta(days=duree) if aleatoire.random() < 0.6 else None
+        lignes.append((f"adherent_{aleatoire.randint(0, 40)}",
+                       aleatoire.choice(["Livre", "BD", "Journal"]), debut, retour))
+    return lignes
+
+
+def _colonnes(lignes):
+    colonnes = ColonnesEmprunts()
+    for ligne in lignes:
+        colonnes.ajouter(*ligne)
+    return colonnes
+
+
+TARIFS = {"Livre": Tarif(20, jours_grace=3, plafond=1000), "BD": Tarif(50)}
+
+
+def test_calcul_par_lot_egal_au_calcul_unitaire(monkeypatch):
+    monkeypatch.setattr(penalites, "numpy", None)
+    for graine in range(3):
+        lignes = _lignes(graine)
+        moteur = MoteurPenalites(TARIFS)
+        assert moteur.calculer(_colonnes(lignes), REFERENCE) == _attendu(lignes, TARIFS, REFERENCE)
+
+
+def test_calcul_numpy_identique():
+    pytest.importorskip("numpy")
+    lignes = _lignes(7)
+    colonnes = _colonnes(lignes)
+    moteur = MoteurPenalites(TARIFS)
+    regles = moteur._regles(colonnes)
+    reference = REFERENCE.toordinal()
+    assert (moteur._calculer_numpy(colonnes, regles, reference)
+            == moteur._calculer_python(colonnes, regles, reference))
+
+
+def test_grace_plafond_et_emprunt_rendu(monkeypatch):
+    monkeypatch.setattr(penalites, "numpy", None)
+    debut = REFERENCE - timedelta(days=Emprunt.DUREE_EMPRUNT_JOURS + 10)
+    lignes = [("marie", "Livre", debut, None),                                # 10 jours
+              ("marie", "Livre", debut - timedelta(days=200), None),          # plafonné
+              ("pierre", "Livre", debut, debut + timedelta(days=16)),         # 2 jours : grâce
+              ("lea", "Dictionnaire", debut, None)]                           # sans tarif
+    totaux = MoteurPenalites().calculer(_colonnes(lignes), REFERENCE)
+    assert totaux == {"marie": 7 * 20 + 1000}
+    assert formater_montant(totaux["marie"]) == "11,40 €"
+    assert MoteurPenalites().calculer(ColonnesEmprunts(), REFERENCE) == {}
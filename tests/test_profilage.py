@@ -0,0 +1,50 @@
+"""
+Tests du mode profilage (fichiers de profil par section)
+"""
+
+import os
+import pstats
+
+from utils.profilage import Profileur
+
+
+class _Fenetre:
+    def __init__(self, profileur):
+        self.profileur = profileur
+
+    def actualiser_liste(self):
+        return sum(range(1000))
+
+    def charger(self):
+        with self.profileur.section("imbriquee"):
+            return self.actualiser_liste()
+
+
+def test_fichiers_par_section_et_sections_imbriquees(tmp_path):
+    dossier = str(tmp_path / "profils")
+    originaux = dict(vars(_Fenetre))
+    profileur = Profileur(dossier)
+    try:
+        profileur.envelopper(_Fenetre, "charger", prefixe="actualiser_")
+        fenetre = _Fenetre(profileur)
+        # Argument en trop (checked d'un signal Qt) : ignoré
+        assert fenetre.actualiser_liste(False) == sum(range(1000))
+        assert fenetre.charger() == sum(range(1000))
+    finally:
+        profileur.fermer()
+
+    noms = sorted(os.path.basename(f).split("_", 2)[2] for f in profileur.fichiers)
+    assert noms == ["actualiser_liste.prof", "actualiser_liste.txt",
+                    "charger.prof", "charger.txt"]
+    assert sorted(os.listdir(dossier)) == sorted(map(os.path.basename, profileur.fichiers))
+
+    [rapport] = [f for f in profileur.fichiers if f.endswith("charger.txt")]
+    with open(rapport, encoding='utf-8') as f:
+        texte = f.read()
+    assert texte.startswith("Section: charger\n")
+    assert "actualiser_liste" in texte
+    pstats.Stats(rapport[:-4] + ".prof")
+
+    # Méthodes d'origine remises
+    assert vars(_Fenetre)["charger"] is originaux["charger"]
+    assert vars(_Fenetre)["actualiser_liste"] is originaux["actualiser_liste"]
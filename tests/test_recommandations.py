@@ -0,0 +1,50 @@
+"""
+Tests de l'index des recommandations
+"""
+
+import random
+from datetime import date
+
+from classes.adherent import Adherent
+from classes.bibliotheque import Bibliotheque
+from classes.document import Livre
+from classes.emprunt import Emprunt
+from classes.recommandations import IndexRecommandations
+from utils.file_manager import FileManager
+
+
+def test_construction_en_un_passage_identique_aux_ajouts():
+    hasard = random.Random(3)
+    adherents = [Adherent(f"Nom{i}", "Prenom") for i in range(30)]
+    livres = [Livre(f"Titre {i}", "Auteur") for i in range(80)]
+    emprunts = [Emprunt(hasard.choice(adherents), hasard.choice(livres), date(2026, 1, 1))
+                for _ in range(5000)]
+
+    index = IndexRecommandations.depuis_emprunts(emprunts, historique_max=7)
+    attendu = IndexRecommandations(historique_max=7)
+    for emprunt in emprunts:
+        attendu.ajouter_emprunt(emprunt)
+    for livre in livres:
+        assert sorted(index.recommander(livre.titre, 100)) == \
+            sorted(attendu.recommander(livre.titre, 100))
+    assert index.compter_couples() == attendu.compter_couples()
+
+
+def test_index_construit_au_chargement(dossier_data):
+    bibliotheque = Bibliotheque()
+    marie, pierre = Adherent("Dupont", "Marie"), Adherent("Martin", "Pierre")
+    dune = Livre("Dune", "Frank Herbert", exemplaires=2)
+    fondation = Livre("Fondation", "Isaac Asimov", exemplaires=2)
+    for objet in (marie, pierre):
+        bibliotheque.ajouter_adherent(objet)
+    for objet in (dune, fondation):
+        bibliotheque.ajouter_document(objet)
+    for adherent in (marie, pierre):
+        for livre in (dune, fondation):
+            bibliotheque.ajouter_emprunt(adherent, livre)
+    FileManager.sauvegarder_bibliotheque(bibliotheque)
+
+    chargee = FileManager.charger_bibliotheque(recommandations=True)
+    assert chargee._recommandations is not None
+    [(livre, nombre)] = chargee.get_recommandations(chargee.rechercher_document("Dune"))
+    assert (livre.titre, nombre) == ("Fondation", 2)
@@ -0,0 +1,20 @@
+"""
+Tests du journal des relances
+"""
+
+from utils.relances import JournalRelances
+
+
+def test_journal_reprend_apres_une_ligne_coupee(tmp_path):
+    chemin = tmp_path / "relances.log"
+    chemin.write_text("2026-01-02_Dupont_Marie\n2026-01-02_Mar", encoding="utf-8")
+
+    journal = JournalRelances(str(chemin))
+    assert journal.deja_envoye("2026-01-02_Dupont_Marie")
+    assert not journal.deja_envoye("2026-01-02_Mar")
+    journal.noter("2026-01-02_Martin_Pierre")
+    journal.fermer()
+
+    journal = JournalRelances(str(chemin))
+    assert journal.deja_envoye("2026-01-02_Martin_Pierre")
+    journal.fermer()
@@ -0,0 +1,91 @@
+"""
+Tests des files de réservations
+"""
+
+from classes.adherent import Adherent
+from classes.bibliotheque import Bibliotheque
+from classes.document import Livre
+from utils.file_manager import FileManager
+
+
+def _bibliotheque():
+    bibliotheque = Bibliotheque()
+    for nom, prenom in (("Dupont", "Marie"), ("Martin", "Pierre"), ("Roux", "Lea")):
+        bibliotheque.ajouter_adherent(Adherent(nom, prenom))
+    bibliotheque.ajouter_document(Livre("1984", "George Orwell"))
+    return bibliotheque
+
+
+def _adherents(bibliotheque):
+    return [bibliotheque.rechercher_adherent(nom, prenom)
+            for nom, prenom in (("Dupont", "Marie"), ("Martin", "Pierre"), ("Roux", "Lea"))]
+
+
+def test_file_servie_dans_l_ordre_au_retour():
+    bibliotheque = _bibliotheque()
+    marie, pierre, lea = _adherents(bibliotheque)
+    livre = bibliotheque.rechercher_document("1984")
+
+    assert not bibliotheque.reserver(pierre, livre)[0]     # disponible : pas de réservation
+    assert bibliotheque.ajouter_emprunt(marie, livre)[0]
+    assert bibliotheque.reserver(pierre, livre)[0]
+    assert bibliotheque.reserver(lea, livre)[0]
+    assert not bibliotheque.reserver(lea, livre)[0]        # déjà dans la file
+
+    bibliotheque.retourner_emprunt(marie, livre)
+    [prete] = bibliotheque.get_reservations_pretes()
+    assert prete.adherent is pierre
+    # L'exemplaire mis de côté n'est empruntable que par Pierre
+    assert not bibliotheque.ajouter_emprunt(lea, livre)[0]
+    assert bibliotheque.ajouter_emprunt(pierre, livre)[0]
+    assert [r.adherent for r in bibliotheque.get_file_reservations(livre)] == [lea]
+
+
+def test_reservations_conservees_a_la_sauvegarde(dossier_data):
+    bibliotheque = _bibliotheque()
+    marie, pierre, lea = _adherents(bibliotheque)
+    livre = bibliotheque.rechercher_document("1984")
+    bibliotheque.ajouter_emprunt(marie, livre)
+    bibliotheque.reserver(pierre, livre)
+    bibliotheque.reserver(lea, livre)
+    bibliotheque.retourner_emprunt(marie, livre)
+    FileManager.sauvegarder_bibliotheque(bibliotheque)
+
+    chargee = FileManager.charger_bibliotheque()
+    livre = chargee.rechercher_document("1984")
+    assert [r.adherent.prenom for r in chargee.get_reservations_pretes()] == ["Pierre"]
+    assert [r.adherent.prenom for r in chargee.get_file_reservations(livre)] == ["Lea"]
+    assert not chargee.ajouter_emprunt(chargee.rechercher_adherent("Roux", "Lea"), livre)[0]
+
+
+def test_annulation_et_desinscription_passent_au_suivant():
+    bibliotheque = _bibliotheque()
+    marie, pierre, lea = _adherents(bibliotheque)
+    jean = Adherent("Petit", "Jean")
+    bibliotheque.ajouter_adherent(jean)
+    livre = bibliotheque.rechercher_document("1984")
+    bibliotheque.ajouter_emprunt(jean, livre)
+    for adherent in (pierre, lea, marie):
+        bibliotheque.reserver(adherent, livre)
+    assert not bibliotheque.reserver(jean, livre)[0]       # déjà emprunté par Jean
+
+    # Annulation dans la file : l'ordre des autres est conservé
+    assert bibliotheque.annuler_reservation(lea, livre)[0]
+    assert not bibliotheque.annuler_reservation(lea, livre)[0]
+    assert bibliotheque.reserver(lea, livre)[0]
+    assert [r.adherent for r in bibliotheque.get_file_reservations(livre)] == [pierre, marie, lea]
+
+    bibliotheque.retourner_emprunt(jean, livre)
+    assert [r.adherent for r in bibliotheque.get_reservations_pretes()] == [pierre]
+
+    # Pierre se désinscrit : l'exemplaire mis de côté passe à Marie
+    assert bibliotheque.enlever_adherent(pierre)
+    assert [r.adherent for r in bibliotheque.get_reservations_pretes()] == [marie]
+    assert [r.adherent for r in bibliotheque.get_file_reservations(livre)] == [lea]
+
+    # Marie annule à son tour : Léa est servie
+    assert bibliotheque.annuler_reservation(marie, livre)[0]
+    assert [r.adherent for r in bibliotheque.get_reservations_pretes()] == [lea]
+    assert not bibliotheque.ajouter_emprunt(marie, livre)[0]
+    assert bibliotheque.ajouter_emprunt(lea, livre)[0]
+    assert bibliotheque.get_reservations_pretes() == []
@@ -0,0 +1,52 @@
+"""
+Tests des agrégats journaliers et mensuels des emprunts
+"""
+
+from datetime import date, timedelta
+
+from classes.adherent import Adherent
+from classes.bibliotheque import Bibliotheque
+from classes.document import Livre
+from classes.horloge import HorlogeFixe
+from classes.series import SeriesEmprunts
+
+
+def test_agregats_tenus_a_jour_comme_une_reconstruction():
+    horloge = HorlogeFixe(date(2026, 1, 10))
+    bibliotheque = Bibliotheque(horloge)
+    marie = Adherent("Dupont", "Marie")
+    bibliotheque.ajouter_adherent(marie)
+    livres = [Livre(f"Livre {i}", "Auteur") for i in range(3)]
+    for livre in livres:
+        bibliotheque.ajouter_document(livre)
+        bibliotheque.ajouter_emprunt(marie, livre)
+
+    horloge.date_reference = date(2026, 1, 20)              # à temps
+    bibliotheque.retourner_emprunt(marie, livres[0])
+    horloge.date_reference = date(2026, 2, 3)               # en retard
+    bibliotheque.retourner_emprunt(marie, livres[1])
+
+    reconstruites = SeriesEmprunts.depuis_emprunts(bibliotheque.get_emprunts())
+    assert bibliotheque.lignes_csv_agregats() == list(reconstruites.lignes_csv())
+
+    [janvier, fevrier] = bibliotheque.get_series(date(2026, 1, 1), date(2026, 2, 28),
+                                                 SeriesEmprunts.PAS_MOIS)
+    assert janvier == (date(2026, 1, 1), 3, 1, 2)           # livres 1 et 2 en retard le 25
+    assert fevrier == (date(2026, 2, 1), 0, 1, 0)
+
+
+def test_retards_prevus_ignores_et_mois_partiels():
+    series = SeriesEmprunts()
+    debut = date(2026, 3, 30)
+    series.ajouter(debut)                                   # en retard le 14 avril
+    series.ajouter(debut, debut + timedelta(days=2))
+
+    assert series.totaux(date(2026, 3, 1), date(2026, 4, 30), date(2026, 4, 1)) == {
+        'emprunts': 2, 'retours': 1, 'retards': 0}
+    assert series.totaux(date(2026, 3, 1), date(2026, 4, 30), date(2026, 4, 14)) == {
+        'emprunts': 2, 'retours': 1, 'retards': 1}
+    jours = series.periode(date(2026, 3, 31), date(2026, 4, 1), date_reference=date(2026, 5, 1))
+    assert jours == [(date(2026, 3, 31), 0, 0, 0), (date(2026, 4, 1), 0, 1, 0)]
+
+    relues = SeriesEmprunts.depuis_lignes(series.lignes_csv())
+    assert list(relues.lignes_csv()) == list(series.lignes_csv())
@@ -0,0 +1,131 @@
+"""
+Tests du service HTTP
+"""
+
+import asyncio
+import json
+
+from classes.adherent import Adherent
+from classes.bibliotheque import Bibliotheque
+from classes.document import Livre
+from services.serveur_http import ServiceBibliotheque
+from utils.file_manager import FileManager
+
+
+def _bibliotheque():
+    bibliotheque = Bibliotheque()
+    bibliotheque.ajouter_adherent(Adherent("Dupont", "Marie"))
+    bibliotheque.ajouter_document(Livre("1984", "George Orwell"))
+    return bibliotheque
+
+
+async def _envoyer(port, brut):
+    """Envoie une requête brute et retourne (statut, réponse JSON)"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(brut)
+    await writer.drain()
+    entete = await reader.readuntil(b"\r\n\r\n")
+    lignes = entete.decode("latin-1").split("\r\n")
+    longueur = next(int(ligne.split(":", 1)[1]) for ligne in lignes
+                    if ligne.lower().startswith("content-length"))
+    corps = await reader.readexactly(longueur)
+    writer.close()
+    return int(lignes[0].split(" ")[1]), json.loads(corps)
+
+
+def _executer(service, *requetes):
+    async def scenario():
+        await service.demarrer()
+        try:
+            return [await _envoyer(service.port, brut) for brut in requetes]
+        finally:
+            await service.arreter()
+    return asyncio.run(scenario())
+
+
+def _post(chemin, donnees):
+    corps = json.dumps(donnees).encode("utf-8")
+    return (f"POST {chemin} HTTP/1.1\r\nContent-Length: {len(corps)}\r\n"
+            f"Connection: close\r\n\r\n").encode("latin-1") + corps
+
+
+def test_echec_de_sauvegarde_non_confirme(dossier_data, monkeypatch):
+    sauvegarder = FileManager.sauvegarder_bibliotheque
+    monkeypatch.setattr(FileManager, "sauvegarder_bibliotheque", lambda bibliotheque: False)
+    bibliotheque = _bibliotheque()
+    service = ServiceBibliotheque(bibliotheque, port=0)
+    emprunt = _post("/emprunts", {"nom": "Dupont", "prenom": "Marie", "titre": "1984"})
+    [(statut, reponse)] = _executer(service, emprunt)
+    assert statut == 503
+    assert reponse["succes"] is False
+
+    # Le lot est annulé : rien n'a été prêté
+    livre = bibliotheque.rechercher_document("1984")
+    assert livre.disponibles == 1
+    assert bibliotheque.compter_emprunts() == 0
+    assert bibliotheque.get_emprunts_actifs() == []
+    assert bibliotheque.rechercher_livres_disponibles("1984") == [livre]
+
+    # Une nouvelle tentative aboutit une fois le disque revenu
+    monkeypatch.setattr(FileManager, "sauvegarder_bibliotheque", sauvegarder)
+    [(statut, reponse)] = _executer(service, emprunt)
+    assert statut == 200 and reponse["succes"]
+    assert livre.disponibles == 0
+
+
+def test_echec_de_sauvegarde_annule_un_retour(dossier_data, monkeypatch):
+    bibliotheque = _bibliotheque()
+    adherent = bibliotheque.rechercher_adherent("Dupont", "Marie")
+    livre = bibliotheque.rechercher_document("1984")
+    bibliotheque.ajouter_emprunt(adherent, livre)
+    monkeypatch.setattr(FileManager, "sauvegarder_bibliotheque", lambda bibliotheque: False)
+    service = ServiceBibliotheque(bibliotheque, port=0)
+    [(statut, _)] = _executer(
+        service, _post("/retours", {"nom": "Dupont", "prenom": "Marie", "titre": "1984"}))
+    assert statut == 503
+    [emprunt] = bibliotheque.get_emprunts_actifs()
+    assert emprunt.date_retour is None
+    assert livre.disponibles == 0
+    assert bibliotheque.get_statistiques()["emprunts_actifs"] == 1
+
+
+def test_emprunt_sauvegarde(dossier_data):
+    service = ServiceBibliotheque(_bibliotheque(), port=0)
+    [(statut, reponse)] = _executer(
+        service, _post("/emprunts", {"nom": "Dupont", "prenom": "Marie", "titre": "1984"}))
+    assert statut == 200 and reponse["succes"]
+    assert len(FileManager._lire_lignes(FileManager.EMPRUNTS_FILE)) == 1
+
+
+def test_content_length_invalide(dossier_data):
+    service = ServiceBibliotheque(_bibliotheque(), port=0, persister=False)
+    resultats = _executer(
+        service,
+        b"POST /emprunts HTTP/1.1\r\nContent-Length: abc\r\nConnection: close\r\n\r\n",
+        b"POST /emprunts HTTP/1.1\r\nContent-Length: -3\r\nConnection: close\r\n\r\n")
+    assert [statut for statut, _ in resultats] == [400, 400]
+
+
+def test_corps_trop_volumineux_ferme_la_connexion(dossier_data):
+    service = ServiceBibliotheque(_bibliotheque(), port=0, persister=False)
+    # Le corps non lu ne doit pas être traité comme une seconde requête
+    cache = b"GET /statistiques HTTP/1.1\r\n\r\n"
+    brut = (f"POST /emprunts HTTP/1.1\r\nContent-Length: {ServiceBibliotheque.TAILLE_MAX + 1}"
+            f"\r\n\r\n").encode("latin-1") + cache
+
+    async def scenario():
+        await service.demarrer()
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", service.port)
+            writer.write(brut)
+            await writer.drain()
+            reponse = await asyncio.wait_for(reader.read(), timeout=5)
+            writer.close()
+            return reponse
+        finally:
+            await service.arreter()
+
+    reponse = asyncio.run(scenario())
+    assert reponse.startswith(b"HTTP/1.1 413")
+    assert b"Connection: close" in reponse
+    assert reponse.count(b"HTTP/1.1") == 1
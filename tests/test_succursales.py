@@ -0,0 +1,92 @@
+"""
+Tests du réseau de succursales
+"""
+
+import threading
+import time
+
+import pytest
+
+from classes.adherent import Adherent
+from classes.bibliotheque import Bibliotheque
+from classes.document import Livre
+from services.succursales import ErreurSuccursale, Succursales
+from utils.file_manager import FileManager
+
+
+@pytest.fixture
+def reseau(tmp_path):
+    """Deux succursales, A et B, avec un livre chacune"""
+    ancien = FileManager.DATA_DIR
+    dossiers = {}
+    for nom, titre in (("A", "1984"), ("B", "Dune")):
+        dossier = str(tmp_path / nom)
+        FileManager.definir_dossier_data(dossier)
+        bibliotheque = Bibliotheque()
+        bibliotheque.ajouter_adherent(Adherent("Dupont", "Marie"))
+        bibliotheque.ajouter_document(Livre(titre, "Auteur"))
+        FileManager.sauvegarder_bibliotheque(bibliotheque)
+        dossiers[nom] = dossier
+    FileManager.definir_dossier_data(ancien)
+    with Succursales(dossiers) as succursales:
+        yield succursales
+
+
+def test_diffusion_en_erreur_ne_decale_pas_les_reponses(reseau):
+    with pytest.raises(ErreurSuccursale):
+        reseau.rechercher_adherents(None, 5)
+
+    # Chaque succursale répond de nouveau à sa propre commande
+    assert reseau._succursales["B"].appeler("titres") == ["Dune"]
+    assert reseau._succursales["A"].appeler("titres") == ["1984"]
+    assert reseau.get_statistiques()['total_documents'] == 2
+    assert reseau.emprunter("Dupont", "Marie", "Dune")[0]
+
+
+class _VerrouLent:
+    """Verrou qui fait attendre chaque prise après la première"""
+
+    def __init__(self, verrou):
+        self._verrou = verrou
+        self._prises = 0
+
+    def acquire(self):
+        self._prises += 1
+        if self._prises > 1:
+            time.sleep(0.2)
+        return self._verrou.acquire()
+
+    def release(self):
+        self._verrou.release()
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def test_desinscription_sans_emprunt_intercale(reseau):
+    a, b = reseau._succursales["A"], reseau._succursales["B"]
+    envoyer = b.envoyer
+    resultats = []
+    postes = []
+
+    def envoyer_et_emprunter(commande, arguments):
+        if commande == "compter_emprunts_actifs":
+            # Un autre poste emprunte pendant la désinscription
+            poste = threading.Thread(
+                target=lambda: resultats.append(reseau.emprunter("Dupont", "Marie", "Dune")))
+            poste.start()
+            postes.append(poste)
+        envoyer(commande, arguments)
+
+    b.envoyer = envoyer_et_emprunter
+    # Une reprise des verrous entre vérification et désinscription laisserait passer l'emprunt
+    a.verrou = _VerrouLent(a.verrou)
+    assert reseau.enlever_adherent("Dupont", "Marie")
+    postes[0].join(timeout=5)
+
+    [(succes, message)] = resultats
+    assert not succes and "introuvable" in message
+    assert reseau.get_statistiques()['emprunts_actifs'] == 0
@@ -3,11 +3,23 @@ Module de gestion des fichiers CSV pour la bibliothèque
 """
 
 import os
+from collections import Counter
+from contextlib import contextmanager
 from classes.document import Livre, BD, Dictionnaire, Journal
 from classes.adherent import Adherent
 from classes.emprunt import Emprunt
+from classes.reservation import Reservation
+from classes.instantane import Instantane
+from classes.recommandations import IndexRecommandations
+from classes.series import SeriesEmprunts
 from datetime import date
 
+try:
+    import fcntl
+except ImportError:     # Windows
+    fcntl = None
+    import msvcrt
+
 
 class FileManager:
     """Gestionnaire de fichiers CSV pour la persistance des données"""
@@ -16,7 +28,25 @@ class FileManager:
     DATA_DIR = "data"
     ADHERENTS_FILE = os.path.join(DATA_DIR, "Adherents.txt")
     EMPRUNTS_FILE = os.path.join(DATA_DIR, "Emprunts.txt")
+    RESERVATIONS_FILE = os.path.join(DATA_DIR, "Reservations.txt")
+    AGREGATS_FILE = os.path.join(DATA_DIR, "Agregats.txt")
     BIBLIO_FILE = os.path.join(DATA_DIR, "Biblio.txt")
+    VERSIONS_FILE = os.path.join(DATA_DIR, "Versions.txt")
+    VERROU_FILE = os.path.join(DATA_DIR, ".verrou")
+
+    @staticmethod
+    def definir_dossier_data(dossier):
+        """
+        Change le dossier des fichiers de données
+        """
+        FileManager.DATA_DIR = dossier
+        FileManager.ADHERENTS_FILE = os.path.join(dossier, "Adherents.txt")
+        FileManager.EMPRUNTS_FILE = os.path.join(dossier, "Emprunts.txt")
+        FileManager.RESERVATIONS_FILE = os.path.join(dossier, "Reservations.txt")
+        FileManager.AGREGATS_FILE = os.path.join(dossier, "Agregats.txt")
+        FileManager.BIBLIO_FILE = os.path.join(dossier, "Biblio.txt")
+        FileManager.VERSIONS_FILE = os.path.join(dossier, "Versions.txt")
+        FileManager.VERROU_FILE = os.path.join(dossier, ".verrou")
 
     @staticmethod
     def initialiser_dossier_data():
@@ -31,23 +61,170 @@ class FileManager:
 
         for filepath in [FileManager.ADHERENTS_FILE,
                          FileManager.EMPRUNTS_FILE,
+                         FileManager.RESERVATIONS_FILE,
                          FileManager.BIBLIO_FILE]:
             if not os.path.exists(filepath):
                 with open(filepath, 'w', encoding='utf-8') as f:
                     pass  # Crée un fichier vide
 
+    # ========== Accès partagé au dossier ==========
+
+    @staticmethod
+    @contextmanager
+    def verrouiller_dossier():
+        """
+        Verrou consultatif exclusif sur le dossier de données, partagé entre
+        les processus (plusieurs instances de l'application sur le même dossier)
+        """
+        FileManager.initialiser_dossier_data()
+        with open(FileManager.VERROU_FILE, 'a+') as f:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    @staticmethod
+    def lire_versions():
+        """
+        Lit le numéro de version de chaque fichier de données
+        (incrémenté à chaque écriture ; 0 si le fichier n'a jamais été versionné)
+        """
+        versions = {}
+        try:
+            if os.path.exists(FileManager.VERSIONS_FILE):
+                with open(FileManager.VERSIONS_FILE, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        nom, _, version = line.strip().partition(',')
+                        if version:
+                            versions[nom] = int(version)
+        except Exception as e:
+            print(f"Erreur lors de la lecture des versions: {e}")
+        return versions
+
+    @staticmethod
+    def _lire_lignes(filepath):
+        """Lit les lignes non vides d'un fichier"""
+        if not os.path.exists(filepath):
+            return []
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return [line.strip() for line in f if line.strip()]
+
+    @staticmethod
+    def _empreinte(lignes):
+        """Compte les lignes par empreinte (sans garder leur texte)"""
+        return Counter(hash(ligne) for ligne in lignes)
+
+    @staticmethod
+    def fusionner_lignes(base, nos_lignes, leurs_lignes):
+        """
+        Fusion à trois voies de fichiers vus comme des multiensembles de lignes
+        Args:
+            base: empreinte (voir _empreinte) de la version commune
+            nos_lignes: lignes à écrire par cette instance
+            leurs_lignes: lignes écrites entre-temps par une autre instance
+        Returns:
+            list: leurs lignes, moins celles que nous avons retirées, plus
+                  celles que nous avons ajoutées (une modification faite des
+                  deux côtés n'est appliquée qu'une fois)
+        """
+        nous = FileManager._empreinte(nos_lignes)
+        eux = FileManager._empreinte(leurs_lignes)
+        restantes = {}
+        for empreinte in nous.keys() | eux.keys():
+            b = base[empreinte]
+            ecart_nous, ecart_eux = nous[empreinte] - b, eux[empreinte] - b
+            if ecart_nous * ecart_eux > 0:
+                # Même changement des deux côtés
+                ecart = max(ecart_nous, ecart_eux) if ecart_nous > 0 else min(ecart_nous, ecart_eux)
+                restantes[empreinte] = b + ecart
+            else:
+                restantes[empreinte] = b + ecart_nous + ecart_eux
+
+        # Leur ordre d'abord, puis nos ajouts dans notre ordre
+        fusion = []
+        for ligne in leurs_lignes + nos_lignes:
+            empreinte = hash(ligne)
+            if restantes.get(empreinte, 0) > 0:
+                fusion.append(ligne)
+                restantes[empreinte] -= 1
+        return fusion
+
+    @staticmethod
+    def recompter_lignes_livres(lignes_documents, lignes_emprunts):
+        """
+        Recalcule les exemplaires disponibles des lignes de livres d'après les
+        emprunts en cours. Un compteur ne se fusionne pas ligne à ligne : deux
+        instances qui prêtent chacune un exemplaire écrivent deux lignes
+        différentes, et la fusion n'en garde qu'une.
+        Returns:
+            list: lignes des documents, livres corrigés
+        """
+        en_cours = Counter(ligne.split(',')[1] for ligne in lignes_emprunts
+                           if ligne.endswith(",None"))
+        resultat = []
+        for ligne in lignes_documents:
+            if ligne.startswith("Livre,") and ligne.count(',') >= 5:
+                livre = Livre.from_csv(ligne)
+                # Un emprunt ne désigne son livre que par le titre : comme au
+                # chargement, il revient au premier livre de ce titre, et un
+                # homonyme d'un autre auteur garde ses propres exemplaires
+                livre.recompter_disponibles(en_cours.pop(livre.titre, 0))
+                ligne = livre.to_csv()
+            resultat.append(ligne)
+        return resultat
+
+    @staticmethod
+    def _memoriser_chargement(bibliotheque, versions):
+        """
+        Mémorise les versions et le contenu des fichiers qui viennent d'être chargés
+        """
+        etat = bibliotheque.etat_fichiers
+        contenus = {
+            FileManager.ADHERENTS_FILE: bibliotheque.get_adherents(),
+            FileManager.BIBLIO_FILE: bibliotheque.get_documents(),
+            FileManager.EMPRUNTS_FILE: bibliotheque.get_emprunts(),
+            FileManager.RESERVATIONS_FILE: bibliotheque.get_reservations(),
+        }
+        for filepath, objets in contenus.items():
+            nom = os.path.basename(filepath)
+            etat[nom] = (versions.get(nom, 0),
+                         FileManager._empreinte(o.to_csv() for o in objets))
+        etat['fusion'] = False
+
     # ========== Sauvegarde ==========
 
+    @staticmethod
+    def _ecrire_lignes(filepath, lignes):
+        """
+        Écrit des lignes CSV dans un fichier temporaire puis le met en place :
+        une sauvegarde interrompue ne laisse jamais de fichier tronqué
+        """
+        FileManager.initialiser_dossier_data()
+        tmp_path = filepath + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for ligne in lignes:
+                f.write(ligne + '\n')
+        os.replace(tmp_path, filepath)
+
     @staticmethod
     def sauvegarder_adherents(adherents):
         """
         Sauvegarde les adhérents dans le fichier CSV
+        Args:
+            adherents: adhérents, ou directement leurs lignes CSV
         """
         try:
-            FileManager.initialiser_dossier_data()
-            with open(FileManager.ADHERENTS_FILE, 'w', encoding='utf-8') as f:
-                for adherent in adherents:
-                    f.write(adherent.to_csv() + '\n')
+            lignes = (a if isinstance(a, str) else a.to_csv() for a in adherents)
+            FileManager._ecrire_lignes(FileManager.ADHERENTS_FILE, lignes)
             return True
         except Exception as e:
             print(f"Erreur lors de la sauvegarde des adhérents: {e}")
@@ -57,12 +234,12 @@ class FileManager:
     def sauvegarder_documents(documents):
         """
         Sauvegarde les documents dans le fichier CSV
+        Args:
+            documents: documents, ou directement leurs lignes CSV
         """
         try:
-            FileManager.initialiser_dossier_data()
-            with open(FileManager.BIBLIO_FILE, 'w', encoding='utf-8') as f:
-                for document in documents:
-                    f.write(document.to_csv() + '\n')
+            lignes = (d if isinstance(d, str) else d.to_csv() for d in documents)
+            FileManager._ecrire_lignes(FileManager.BIBLIO_FILE, lignes)
             return True
         except Exception as e:
             print(f"Erreur lors de la sauvegarde des documents: {e}")
@@ -72,12 +249,12 @@ class FileManager:
     def sauvegarder_emprunts(emprunts):
         """
         Sauvegarde les emprunts dans le fichier CSV
+        Args:
+            emprunts: emprunts, ou directement leurs lignes CSV
         """
         try:
-            FileManager.initialiser_dossier_data()
-            with open(FileManager.EMPRUNTS_FILE, 'w', encoding='utf-8') as f:
-                for emprunt in emprunts:
-                    f.write(emprunt.to_csv() + '\n')
+            lignes = (e if isinstance(e, str) else e.to_csv() for e in emprunts)
+            FileManager._ecrire_lignes(FileManager.EMPRUNTS_FILE, lignes)
             return True
         except Exception as e:
             print(f"Erreur lors de la sauvegarde des emprunts: {e}")
@@ -87,12 +264,106 @@ class FileManager:
     def sauvegarder_bibliotheque(bibliotheque):
         """
         Sauvegarde toutes les données de la bibliothèque
+        Args:
+            bibliotheque: Bibliotheque ou Instantane (vue figée, cohérente
+                          même si la bibliothèque est modifiée pendant l'écriture,
+                          ce qui permet de sauvegarder depuis un autre thread)
+
+        Si une autre instance a écrit un fichier depuis notre dernier chargement
+        (version différente), ses modifications sont fusionnées avec les nôtres
+        au lieu d'être écrasées, et etat_fichiers['fusion'] passe à True : la
+        bibliothèque doit alors être rechargée pour les voir. Les fichiers
+        inchangés des deux côtés ne sont ni relus ni réécrits.
+        """
+        if isinstance(bibliotheque, Instantane):
+            contenus = [
+                (FileManager.ADHERENTS_FILE, bibliotheque.lignes_csv_adherents()),
+                (FileManager.BIBLIO_FILE, bibliotheque.lignes_csv_documents()),
+                (FileManager.EMPRUNTS_FILE, bibliotheque.lignes_csv_emprunts()),
+                (FileManager.RESERVATIONS_FILE, bibliotheque.lignes_csv_reservations()),
+            ]
+        else:
+            contenus = [
+                (FileManager.ADHERENTS_FILE, (a.to_csv() for a in bibliotheque.get_adherents())),
+                (FileManager.BIBLIO_FILE, (d.to_csv() for d in bibliotheque.get_documents())),
+                (FileManager.EMPRUNTS_FILE, (e.to_csv() for e in bibliotheque.get_emprunts())),
+                (FileManager.RESERVATIONS_FILE,
+                 (r.to_csv() for r in bibliotheque.get_reservations())),
+            ]
+        agregats = bibliotheque.lignes_csv_agregats()
+        nombre_emprunts = bibliotheque.compter_emprunts()
+        etat = bibliotheque.etat_fichiers
+        nom_emprunts = os.path.basename(FileManager.EMPRUNTS_FILE)
+        nom_biblio = os.path.basename(FileManager.BIBLIO_FILE)
+
+        try:
+            with FileManager.verrouiller_dossier():
+                versions = FileManager.lire_versions()
+                versions_initiales = dict(versions)
+                a_ecrire = {}
+                fusionnes = set()
+                for filepath, lignes in contenus:
+                    nom = os.path.basename(filepath)
+                    lignes = list(lignes)
+                    version_base, base = etat.get(nom, (None, None))
+
+                    if base is not None and versions.get(nom, 0) != version_base:
+                        # Fichier modifié par une autre instance : fusion
+                        lignes = FileManager.fusionner_lignes(
+                            base, lignes, FileManager._lire_lignes(filepath))
+                        etat['fusion'] = True
+                        fusionnes.add(nom)
+                        if nom == nom_emprunts:
+                            nombre_emprunts = None  # agrégats à reconstruire
+                    a_ecrire[filepath] = lignes
+
+                if fusionnes & {nom_biblio, nom_emprunts}:
+                    a_ecrire[FileManager.BIBLIO_FILE] = FileManager.recompter_lignes_livres(
+                        a_ecrire[FileManager.BIBLIO_FILE], a_ecrire[FileManager.EMPRUNTS_FILE])
+
+                for filepath, lignes in a_ecrire.items():
+                    nom = os.path.basename(filepath)
+                    version_disque = versions.get(nom, 0)
+                    version_base, base = etat.get(nom, (None, None))
+                    empreinte = FileManager._empreinte(lignes)
+
+                    if base is not None and version_disque == version_base and empreinte == base:
+                        continue    # rien de nouveau à écrire
+                    FileManager._ecrire_lignes(filepath, lignes)
+                    versions[nom] = version_disque + 1
+                    etat[nom] = (versions[nom], empreinte)
+
+                FileManager._sauvegarder_agregats(agregats, versions.get(nom_emprunts, 0),
+                                                  nombre_emprunts, etat)
+
+                if versions != versions_initiales:
+                    FileManager._ecrire_lignes(
+                        FileManager.VERSIONS_FILE,
+                        (f"{nom},{version}" for nom, version in sorted(versions.items())))
+            return True
+        except Exception as e:
+            print(f"Erreur lors de la sauvegarde de la bibliothèque: {e}")
+            return False
+
+    @staticmethod
+    def _sauvegarder_agregats(agregats, version_emprunts, nombre_emprunts, etat):
+        """
+        Écrit les agrégats chronologiques s'ils ont changé. Dérivés des
+        emprunts, ils ne sont jamais fusionnés : l'en-tête indique la version
+        et la taille d'Emprunts.txt dont ils proviennent, et ils sont
+        reconstruits au chargement si elles ne correspondent plus
+        Args:
+            nombre_emprunts: None si les emprunts viennent d'être fusionnés
         """
-        success = True
-        success &= FileManager.sauvegarder_adherents(bibliotheque.get_adherents())
-        success &= FileManager.sauvegarder_documents(bibliotheque.get_documents())
-        success &= FileManager.sauvegarder_emprunts(bibliotheque.get_emprunts())
-        return success
+        if nombre_emprunts is None:
+            version_emprunts, nombre_emprunts = -1, -1
+        lignes = [f"version,{version_emprunts},{nombre_emprunts}"]
+        lignes.extend(agregats)
+        nom = os.path.basename(FileManager.AGREGATS_FILE)
+        empreinte = FileManager._empreinte(lignes)
+        if etat.get(nom) != empreinte:
+            FileManager._ecrire_lignes(FileManager.AGREGATS_FILE, lignes)
+            etat[nom] = empreinte
 
     # ========== Chargement ==========
 
@@ -126,7 +397,8 @@ class FileManager:
         """
         documents = []
         documents_dict = {}
-        livres_dict = {}
+        livres_dict = {}        # titre -> premier livre de ce titre (emprunts, réservations)
+        livres_par_cle = {}     # (titre, auteur) -> livre
 
         try:
             if os.path.exists(FileManager.BIBLIO_FILE):
@@ -142,8 +414,16 @@ class FileManager:
 
                                 if doc_type == "Livre":
                                     document = Livre.from_csv(line)
-                                    if document:
-                                        livres_dict[document.titre] = document
+                                    cle = (document.titre, document.auteur) if document else None
+                                    existant = livres_par_cle.get(cle)
+                                    if existant:
+                                        # Ancien format : une ligne par exemplaire
+                                        existant.ajouter_exemplaires(document.exemplaires,
+                                                                     document.disponibles)
+                                        document = None
+                                    elif document:
+                                        livres_par_cle[cle] = document
+                                        livres_dict.setdefault(document.titre, document)
                                 elif doc_type == "BD":
                                     document = BD.from_csv(line)
                                 elif doc_type == "Dictionnaire":
@@ -181,31 +461,113 @@ class FileManager:
         return emprunts
 
     @staticmethod
-    def charger_bibliotheque():
+    def charger_reservations(adherents_dict, livres_dict):
+        """
+        Charge les réservations depuis le fichier CSV (dans l'ordre des files)
+        """
+        reservations = []
+
+        try:
+            if os.path.exists(FileManager.RESERVATIONS_FILE):
+                with open(FileManager.RESERVATIONS_FILE, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        line = line.strip()
+                        if line:
+                            reservation = Reservation.from_csv(line, adherents_dict, livres_dict)
+                            if reservation:
+                                reservations.append(reservation)
+        except Exception as e:
+            print(f"Erreur lors du chargement des réservations: {e}")
+
+        return reservations
+
+    @staticmethod
+    def charger_agregats(version_emprunts, nombre_emprunts):
+        """
+        Charge les agrégats chronologiques s'ils correspondent aux emprunts
+        chargés (même version et même nombre de lignes d'Emprunts.txt)
+        Returns:
+            tuple: (SeriesEmprunts ou None si à reconstruire, lignes lues)
+        """
+        try:
+            lignes = FileManager._lire_lignes(FileManager.AGREGATS_FILE)
+            if lignes and lignes[0] == f"version,{version_emprunts},{nombre_emprunts}":
+                return SeriesEmprunts.depuis_lignes(lignes[1:]), lignes
+        except Exception as e:
+            print(f"Erreur lors du chargement des agrégats: {e}")
+        return None, []
+
+    @staticmethod
+    def charger_bibliotheque(progression=None, recommandations=False):
         """
         Charge toutes les données de la bibliothèque
+        Args:
+            progression: fonction optionnelle appelée avec (pourcentage, message)
+                         à chaque étape du chargement
+            recommandations: construit aussi l'index des recommandations (le
+                             plus long : quelques secondes par 100 000 emprunts),
+                             pour qu'il soit prêt avant la première recherche
         """
         from classes.bibliotheque import Bibliotheque
 
+        def signaler(pourcentage, message):
+            if progression:
+                progression(pourcentage, message)
+
         FileManager.initialiser_fichiers()
 
         bibliotheque = Bibliotheque()
 
-        # Charger les adhérents
-        adherents, adherents_dict = FileManager.charger_adherents()
+        # Lecture sous verrou : jamais au milieu de la sauvegarde d'une autre instance
+        with FileManager.verrouiller_dossier():
+            versions = FileManager.lire_versions()
+
+            # Charger les adhérents
+            signaler(0, "Chargement des adhérents...")
+            adherents, adherents_dict = FileManager.charger_adherents()
+
+            # Charger les documents
+            signaler(30, "Chargement des documents...")
+            documents, documents_dict, livres_dict = FileManager.charger_documents()
+
+            # Charger les emprunts
+            signaler(60, "Chargement des emprunts...")
+            emprunts = FileManager.charger_emprunts(adherents_dict, livres_dict)
+
+            # Charger les réservations
+            signaler(80, "Chargement des réservations...")
+            reservations = FileManager.charger_reservations(adherents_dict, livres_dict)
+
+            series, lignes_agregats = FileManager.charger_agregats(
+                versions.get(os.path.basename(FileManager.EMPRUNTS_FILE), 0), len(emprunts))
+
+        # Les exemplaires disponibles se déduisent des emprunts en cours : le
+        # compteur écrit dans Biblio.txt peut venir d'une fusion
+        en_cours = Counter(e.livre for e in emprunts if e.est_actif())
+        for livre in livres_dict.values():
+            livre.recompter_disponibles(en_cours[livre])
+
         for adherent in adherents:
             bibliotheque.ajouter_adherent(adherent)
-
-        # Charger les documents
-        documents, documents_dict, livres_dict = FileManager.charger_documents()
         for document in documents:
             bibliotheque.ajouter_document(document)
-
-        # Charger les emprunts
-        emprunts = FileManager.charger_emprunts(adherents_dict, livres_dict)
         for emprunt in emprunts:
-            bibliotheque._emprunts.append(emprunt)
-
+            bibliotheque.restaurer_emprunt(emprunt)
+        for reservation in reservations:
+            bibliotheque.restaurer_reservation(reservation)
+        if series is None:
+            signaler(85, "Calcul des agrégats...")
+            series = SeriesEmprunts.depuis_emprunts(emprunts)
+        bibliotheque.definir_series(series)
+        if recommandations:
+            signaler(90, "Calcul des recommandations...")
+            bibliotheque.definir_recommandations(IndexRecommandations.depuis_emprunts(emprunts))
+        FileManager._memoriser_chargement(bibliotheque, versions)
+        if lignes_agregats:
+            bibliotheque.etat_fichiers[os.path.basename(FileManager.AGREGATS_FILE)] = \
+                FileManager._empreinte(lignes_agregats)
+
+        signaler(100, "Chargement terminé")
         return bibliotheque
 
     # ========== Données de test ==========
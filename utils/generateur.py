@@ -0,0 +1,210 @@
+"""
+Générateur de jeux de données synthétiques, à l'échelle d'une vraie
+bibliothèque : N adhérents, M documents des quatre types et K emprunts
+étalés sur plusieurs années, avec dates de retour, retards et popularité
+inégale (loi de Zipf : quelques livres et quelques lecteurs concentrent
+l'essentiel des emprunts).
+
+Le résultat ne dépend que des paramètres et de la graine. Les fichiers de
+données sont écrits directement, ligne à ligne, sans créer d'objets : dix
+millions d'emprunts s'écrivent en quelques minutes.
+
+Les données respectent les règles de la bibliothèque : seuls les livres
+sont empruntés, un livre n'a jamais plus d'emprunts en cours que
+d'exemplaires, et un adhérent n'a jamais deux exemplaires du même livre.
+"""
+
+import itertools
+import math
+import os
+import random
+from datetime import date, timedelta
+
+from classes.emprunt import Emprunt
+from utils.file_manager import FileManager
+
+
+# Part de chaque type parmi les documents
+REPARTITION = {"Livre": 0.70, "BD": 0.15, "Dictionnaire": 0.05, "Journal": 0.10}
+
+NOMS = ["Martin", "Bernard", "Thomas", "Petit", "Robert", "Richard", "Durand", "Dubois",
+        "Moreau", "Laurent", "Simon", "Michel", "Lefebvre", "Leroy", "Roux", "David",
+        "Bertrand", "Morel", "Fournier", "Girard", "Bonnet", "Dupont", "Lambert", "Fontaine",
+        "Rousseau", "Vincent", "Muller", "Lefevre", "Faure", "Andre", "Mercier", "Blanc"]
+PRENOMS = ["Marie", "Jean", "Pierre", "Sophie", "Louis", "Camille", "Lucas", "Emma",
+           "Hugo", "Chloe", "Jules", "Lea", "Nathan", "Manon", "Paul", "Alice",
+           "Arthur", "Ines", "Gabriel", "Lina", "Adam", "Jade", "Raphael", "Louise"]
+MOTS = ["Jardin", "Ombre", "Voyage", "Silence", "Mer", "Nuit", "Maison", "Secret",
+        "Chemin", "Hiver", "Lumiere", "Miroir", "Foret", "Ville", "Memoire", "Orage",
+        "Ile", "Promesse", "Royaume", "Horizon", "Etoile", "Riviere", "Masque", "Printemps"]
+JOURNAUX = ["Le Quotidien", "La Gazette", "Le Courrier", "L'Echo", "Le Journal du Soir"]
+
+# Emprunts écrits par paquet
+TAILLE_PAQUET = 100_000
+
+
+def _zipf_cumule(nombre, exposant, hasard):
+    """
+    Poids cumulés d'une loi de Zipf sur `nombre` éléments, rangs mélangés
+    (les plus populaires ne sont pas les premiers créés)
+    Returns:
+        tuple: (poids cumulés, probabilité de chaque élément)
+    """
+    rangs = list(range(1, nombre + 1))
+    hasard.shuffle(rangs)
+    poids = [1.0 / rang ** exposant for rang in rangs]
+    total = math.fsum(poids)
+    return list(itertools.accumulate(poids)), [p / total for p in poids]
+
+
+def _ecrire(filepath, lignes):
+    """Écrit un fichier de données via un fichier temporaire"""
+    tmp_path = filepath + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for paquet in lignes:
+            f.writelines(paquet)
+    os.replace(tmp_path, filepath)
+
+
+def generer_donnees(nb_adherents, nb_documents, nb_emprunts, graine=0, annees=3,
+                    date_fin=None, zipf_livres=1.0, zipf_adherents=0.6, taux_retard=0.08,
+                    repartition=None, exemplaires_max=20, progression=None):
+    """
+    Génère un jeu de données et l'écrit dans le dossier de données courant
+    (remplace les fichiers existants)
+    Args:
+        graine: graine du générateur (même graine, mêmes fichiers)
+        annees: durée de l'historique, qui se termine à date_fin (aujourd'hui par défaut)
+        zipf_livres: exposant de la popularité des livres (0 : uniforme)
+        zipf_adherents: exposant de l'activité des adhérents
+        taux_retard: part des emprunts rendus après la date prévue
+        repartition: dict type -> part des documents (REPARTITION par défaut)
+        exemplaires_max: exemplaires au plus par livre (les plus demandés en ont
+                         assez pour leurs emprunts en cours)
+        progression: fonction optionnelle appelée avec (emprunts écrits, total)
+    Returns:
+        dict: compteurs du jeu généré
+    """
+    hasard = random.Random(graine)
+    repartition = repartition or REPARTITION
+    date_fin = date_fin or date.today()
+    fin = date_fin.toordinal()
+    debut = (date_fin - timedelta(days=round(365.25 * annees))).toordinal()
+    nb_jours = fin - debut + 1
+    duree = Emprunt.DUREE_EMPRUNT_JOURS
+
+    # Adhérents (environ un sur dix sans email)
+    identifiants = []
+    lignes_adherents = []
+    for i in range(nb_adherents):
+        nom, prenom = NOMS[i % len(NOMS)], f"{PRENOMS[(i // len(NOMS)) % len(PRENOMS)]}{i}"
+        email = "" if hasard.random() < 0.1 else f"{prenom.lower()}.{nom.lower()}@exemple.fr"
+        identifiants.append(f"{nom}_{prenom}")
+        lignes_adherents.append(f"{nom},{prenom},{email}\n")
+
+    # Documents : les types sont tirés selon la répartition, les titres
+    # sont uniques (numérotés)
+    types = hasard.choices(list(repartition), weights=list(repartition.values()), k=nb_documents)
+    titres_livres = []
+    auteurs_livres = []
+    autres = []
+    compteurs = dict.fromkeys(repartition, 0)
+    for i, nom_type in enumerate(types):
+        compteurs[nom_type] += 1
+        auteur = f"{hasard.choice(PRENOMS)} {hasard.choice(NOMS)}"
+        titre = f"{hasard.choice(MOTS)} {hasard.choice(MOTS).lower()} {i}"
+        if nom_type == "Livre":
+            titres_livres.append(titre)
+            auteurs_livres.append(auteur)
+        elif nom_type == "BD":
+            autres.append(f"BD,{titre},{auteur},{hasard.choice(PRENOMS)} {hasard.choice(NOMS)}\n")
+        elif nom_type == "Dictionnaire":
+            autres.append(f"Dictionnaire,Dictionnaire {titre},Editions {hasard.choice(NOMS)}\n")
+        else:
+            parution = date.fromordinal(hasard.randint(debut, fin)).isoformat()
+            autres.append(f"Journal,{hasard.choice(JOURNAUX)} {i},{parution}\n")
+    nb_livres = len(titres_livres)
+    if nb_emprunts and (not nb_livres or not nb_adherents):
+        raise ValueError("Des emprunts demandent au moins un livre et un adhérent")
+
+    # Popularité, et exemplaires selon la demande : de quoi couvrir les
+    # emprunts en cours attendus d'un livre, dans la limite exemplaires_max
+    cumul_livres, probabilites = _zipf_cumule(nb_livres, zipf_livres, hasard)
+    cumul_adherents, _ = _zipf_cumule(nb_adherents, zipf_adherents, hasard)
+    exemplaires = [min(exemplaires_max, 1 + int(p * nb_emprunts / nb_jours * duree))
+                   for p in probabilites]
+    en_cours = [0] * nb_livres
+    actifs = set()          # (adhérent, livre) des emprunts en cours
+
+    # Dates en texte, calculées une fois par jour
+    textes_jours = [date.fromordinal(debut + j).isoformat() for j in range(nb_jours)]
+
+    bilan = {'adherents': nb_adherents, 'documents': nb_documents, 'emprunts': nb_emprunts,
+             'emprunts_actifs': 0, 'emprunts_retard': 0, 'rendus_en_retard': 0}
+    bilan.update({f"documents_{nom_type}": nombre for nom_type, nombre in compteurs.items()})
+
+    def emprunts():
+        """Génère les lignes d'emprunts par paquets, dans l'ordre chronologique"""
+        aleatoire = hasard.random
+        expo = hasard.expovariate
+        for depart in range(0, nb_emprunts, TAILLE_PAQUET):
+            taille = min(TAILLE_PAQUET, nb_emprunts - depart)
+            livres = hasard.choices(range(nb_livres), cum_weights=cumul_livres, k=taille)
+            lecteurs = hasard.choices(range(nb_adherents), cum_weights=cumul_adherents, k=taille)
+            paquet = []
+            for n in range(taille):
+                jour = ((depart + n) * nb_jours) // nb_emprunts
+                if aleatoire() < taux_retard:
+                    retour = jour + duree + 1 + int(expo(1 / 15))
+                else:
+                    retour = jour + 1 + int(aleatoire() * duree)
+                livre, lecteur = livres[n], lecteurs[n]
+                if retour >= nb_jours:
+                    # Encore en cours, si le livre et l'adhérent le permettent ;
+                    # sinon rendu entre-temps
+                    cle = (lecteur, livre)
+                    if en_cours[livre] < exemplaires[livre] and cle not in actifs:
+                        en_cours[livre] += 1
+                        actifs.add(cle)
+                        bilan['emprunts_actifs'] += 1
+                        if nb_jours - 1 > jour + duree:
+                            bilan['emprunts_retard'] += 1
+                        paquet.append(f"{identifiants[lecteur]},{titres_livres[livre]},"
+                                      f"{textes_jours[jour]},None\n")
+                        continue
+                    retour = jour + 1 + int(aleatoire() * (nb_jours - 1 - jour)) \
+                        if jour < nb_jours - 1 else jour
+                if retour > jour + duree:
+                    bilan['rendus_en_retard'] += 1
+                paquet.append(f"{identifiants[lecteur]},{titres_livres[livre]},"
+                              f"{textes_jours[jour]},{textes_jours[retour]}\n")
+            yield paquet
+            if progression:
+                progression(depart + taille, nb_emprunts)
+
+    FileManager.initialiser_dossier_data()
+    with FileManager.verrouiller_dossier():
+        versions = FileManager.lire_versions()
+        _ecrire(FileManager.ADHERENTS_FILE, [lignes_adherents])
+        # Les emprunts d'abord : les exemplaires disponibles en dépendent
+        _ecrire(FileManager.EMPRUNTS_FILE, emprunts())
+        lignes_livres = [f"Livre,{titre},{auteur},{en_cours[i] < exemplaires[i]},"
+                         f"{exemplaires[i]},{exemplaires[i] - en_cours[i]}\n"
+                         for i, (titre, auteur) in enumerate(zip(titres_livres, auteurs_livres))]
+        _ecrire(FileManager.BIBLIO_FILE, [lignes_livres, autres])
+        _ecrire(FileManager.RESERVATIONS_FILE, [])
+        if os.path.exists(FileManager.AGREGATS_FILE):
+            os.remove(FileManager.AGREGATS_FILE)    # reconstruits au chargement
+
+        # Nouvelles versions : une instance déjà ouverte sur ce dossier voit
+        # que les fichiers ont changé
+        for filepath in (FileManager.ADHERENTS_FILE, FileManager.BIBLIO_FILE,
+                         FileManager.EMPRUNTS_FILE, FileManager.RESERVATIONS_FILE):
+            nom = os.path.basename(filepath)
+            versions[nom] = versions.get(nom, 0) + 1
+        FileManager._ecrire_lignes(
+            FileManager.VERSIONS_FILE,
+            (f"{nom},{version}" for nom, version in sorted(versions.items())))
+
+    bilan['exemplaires'] = sum(exemplaires)
+    return bilan
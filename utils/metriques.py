@@ -0,0 +1,279 @@
+"""
+Module des métriques d'exploitation : nombre d'appels, histogramme des
+durées, erreurs et refus de chaque méthode publique de Bibliotheque et de
+FileManager, gardés dans un registre en mémoire et exportables au format
+texte de Prometheus ou en JSON.
+
+L'instrumentation est facultative : instrumenter() remplace les méthodes
+par des versions chronométrées, desinstrumenter() remet les originales.
+Désactivée, elle ne coûte donc rien.
+
+    from utils import metriques
+    metriques.instrumenter()
+    ...
+    metriques.REGISTRE.ecrire_prometheus("bibliotheque.prom")
+"""
+
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+
+
+# Bornes des seaux de durée (secondes), de 50 µs à 1 minute
+BORNES = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+          0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Méthodes publiques non chronométrées (gestionnaires de contexte)
+IGNOREES = frozenset({"lot", "verrouiller_dossier"})
+
+PREFIXE = "bibliotheque_operation"
+
+
+class Histogramme:
+    """Durées d'une opération, comptées par seau"""
+
+    def __init__(self, bornes=BORNES):
+        """
+        Initialise un histogramme vide
+        """
+        self._bornes = bornes
+        self._seaux = [0] * (len(bornes) + 1)   # le dernier : au-delà de la dernière borne
+        self._total = 0.0
+        self._maximum = 0.0
+        self._appels = 0
+        self._erreurs = 0
+        self._refus = 0
+
+    @property
+    def bornes(self):
+        """Retourne les bornes des seaux"""
+        return self._bornes
+
+    @property
+    def appels(self):
+        """Retourne le nombre d'appels"""
+        return self._appels
+
+    @property
+    def erreurs(self):
+        """Retourne le nombre d'appels terminés par une exception"""
+        return self._erreurs
+
+    @property
+    def refus(self):
+        """Retourne le nombre d'appels refusés"""
+        return self._refus
+
+    @property
+    def total(self):
+        """Retourne la somme des durées"""
+        return self._total
+
+    @property
+    def maximum(self):
+        """Retourne la plus longue durée observée"""
+        return self._maximum
+
+    def observer(self, duree, erreur=False, refus=False):
+        """Compte un appel et sa durée"""
+        self._seaux[bisect.bisect_left(self._bornes, duree)] += 1
+        self._total += duree
+        if duree > self._maximum:
+            self._maximum = duree
+        self._appels += 1
+        if erreur:
+            self._erreurs += 1
+        if refus:
+            self._refus += 1
+
+    def cumuls(self):
+        """
+        Retourne les comptes cumulés par borne (format Prometheus)
+        Returns:
+            list: couples (borne, nombre de durées inférieures ou égales)
+        """
+        cumul = 0
+        resultat = []
+        for borne, nombre in zip(self._bornes, self._seaux):
+            cumul += nombre
+            resultat.append((borne, cumul))
+        return resultat
+
+    def quantile(self, q):
+        """
+        Estime un quantile par interpolation dans son seau
+        """
+        if not self._appels:
+            return 0.0
+        rang = q * self._appels
+        cumul = 0
+        bas = 0.0
+        for i, nombre in enumerate(self._seaux):
+            haut = self._bornes[i] if i < len(self._bornes) else self._maximum
+            if nombre and cumul + nombre >= rang:
+                return min(bas + (haut - bas) * (rang - cumul) / nombre, self._maximum)
+            cumul += nombre
+            bas = haut
+        return self._maximum
+
+
+class Registre:
+    """Métriques de toutes les opérations, par (classe, opération)"""
+
+    def __init__(self, bornes=BORNES):
+        """Initialise un registre vide"""
+        self._bornes = bornes
+        self._histogrammes = {}
+        self._verrou = threading.Lock()
+
+    def observer(self, classe, operation, duree, erreur=False, refus=False):
+        """
+        Enregistre un appel
+        Args:
+            erreur: l'appel a levé une exception
+            refus: l'appel a retourné False ou (False, message)
+        """
+        with self._verrou:
+            histogramme = self._histogrammes.get((classe, operation))
+            if histogramme is None:
+                histogramme = self._histogrammes[(classe, operation)] = Histogramme(self._bornes)
+            histogramme.observer(duree, erreur, refus)
+
+    def reinitialiser(self):
+        """Oublie toutes les mesures"""
+        with self._verrou:
+            self._histogrammes.clear()
+
+    def histogramme(self, classe, operation):
+        """Retourne l'histogramme d'une opération, ou None"""
+        return self._histogrammes.get((classe, operation))
+
+    def _trier(self):
+        """Retourne les histogrammes triés par classe et opération"""
+        with self._verrou:
+            return sorted(self._histogrammes.items())
+
+    def exporter_prometheus(self):
+        """
+        Retourne les métriques au format texte de Prometheus
+        """
+        lignes = [f"# HELP {PREFIXE}_duree_secondes Durée des appels",
+                  f"# TYPE {PREFIXE}_duree_secondes histogram"]
+        histogrammes = self._trier()
+        for (classe, operation), h in histogrammes:
+            etiquettes = f'classe="{classe}",operation="{operation}"'
+            for borne, cumul in h.cumuls():
+                lignes.append(f'{PREFIXE}_duree_secondes_bucket{{{etiquettes},le="{borne}"}} {cumul}')
+            lignes.append(f'{PREFIXE}_duree_secondes_bucket{{{etiquettes},le="+Inf"}} {h.appels}')
+            lignes.append(f"{PREFIXE}_duree_secondes_sum{{{etiquettes}}} {h.total!r}")
+            lignes.append(f"{PREFIXE}_duree_secondes_count{{{etiquettes}}} {h.appels}")
+        for nom, aide, attribut in (("erreurs", "Appels terminés par une exception", "erreurs"),
+                                    ("refus", "Appels refusés (résultat False)", "refus")):
+            lignes.append(f"# HELP {PREFIXE}_{nom}_total {aide}")
+            lignes.append(f"# TYPE {PREFIXE}_{nom}_total counter")
+            for (classe, operation), h in histogrammes:
+                lignes.append(f'{PREFIXE}_{nom}_total{{classe="{classe}",'
+                              f'operation="{operation}"}} {getattr(h, attribut)}')
+        return "\n".join(lignes) + "\n"
+
+    def resume(self):
+        """
+        Retourne un résumé des métriques (pour un export JSON)
+        Returns:
+            dict: "Classe.operation" -> compteurs et durées (secondes)
+        """
+        resume = {}
+        for (classe, operation), h in self._trier():
+            resume[f"{classe}.{operation}"] = {
+                'appels': h.appels, 'erreurs': h.erreurs, 'refus': h.refus,
+                'total': h.total, 'moyenne': h.total / h.appels if h.appels else 0.0,
+                'p50': h.quantile(0.5), 'p95': h.quantile(0.95), 'p99': h.quantile(0.99),
+                'max': h.maximum,
+            }
+        return resume
+
+    def ecrire_prometheus(self, chemin):
+        """
+        Écrit les métriques dans un fichier (collecteur de fichiers texte de
+        node_exporter), remplacé d'un coup pour ne jamais être lu à moitié
+        """
+        _ecrire(chemin, self.exporter_prometheus())
+
+    def ecrire_json(self, chemin):
+        """Écrit le résumé des métriques en JSON"""
+        _ecrire(chemin, json.dumps(self.resume(), indent=2, ensure_ascii=False) + "\n")
+
+
+def _ecrire(chemin, texte):
+    """Écrit un fichier via un fichier temporaire"""
+    with open(chemin + ".tmp", 'w', encoding='utf-8') as f:
+        f.write(texte)
+    os.replace(chemin + ".tmp", chemin)
+
+
+REGISTRE = Registre()
+
+
+# ========== Instrumentation ==========
+
+# (classe, nom) -> attribut d'origine, pour desinstrumenter()
+_originaux = {}
+
+
+def _chronometrer(fonction, classe, operation, registre):
+    """Retourne une version chronométrée d'une fonction"""
+    horloge = time.perf_counter
+
+    @functools.wraps(fonction)
+    def chronometree(*args, **kwargs):
+        debut = horloge()
+        try:
+            resultat = fonction(*args, **kwargs)
+        except BaseException:
+            registre.observer(classe, operation, horloge() - debut, erreur=True)
+            raise
+        refus = resultat is False or (type(resultat) is tuple and resultat
+                                      and resultat[0] is False)
+        registre.observer(classe, operation, horloge() - debut, refus=refus)
+        return resultat
+
+    return chronometree
+
+
+def instrumenter(classes=None, registre=REGISTRE):
+    """
+    Chronomètre les méthodes publiques des classes (Bibliotheque et
+    FileManager par défaut) ; sans effet si c'est déjà fait
+    """
+    if classes is None:
+        from classes.bibliotheque import Bibliotheque
+        from utils.file_manager import FileManager
+        classes = (Bibliotheque, FileManager)
+    for cls in classes:
+        for nom, attribut in list(vars(cls).items()):
+            if nom.startswith("_") or nom in IGNOREES or (cls, nom) in _originaux:
+                continue
+            if isinstance(attribut, staticmethod):
+                remplacement = staticmethod(
+                    _chronometrer(attribut.__func__, cls.__name__, nom, registre))
+            elif callable(attribut) and not isinstance(attribut, type):
+                remplacement = _chronometrer(attribut, cls.__name__, nom, registre)
+            else:
+                continue    # propriétés, constantes
+            _originaux[(cls, nom)] = attribut
+            setattr(cls, nom, remplacement)
+
+
+def desinstrumenter():
+    """Remet les méthodes d'origine"""
+    for (cls, nom), attribut in _originaux.items():
+        setattr(cls, nom, attribut)
+    _originaux.clear()
+
+
+def est_instrumente():
+    """Vérifie si l'instrumentation est active"""
+    return bool(_originaux)
@@ -0,0 +1,261 @@
+"""
+Module de calcul des pénalités de retard.
+
+Les emprunts sont d'abord rangés en colonnes d'entiers (dates en jours
+ordinaux, adhérent et type de document codés), puis les pénalités de tout
+l'historique sont calculées en un seul passage sur ces colonnes et sommées
+par adhérent. numpy est utilisé s'il est installé ; sinon le même calcul
+est fait en Python pur sur les colonnes.
+
+Les montants sont en centimes. Un emprunt rendu en retard reste facturé ;
+un emprunt postérieur à la date de calcul est ignoré.
+"""
+
+from array import array
+from datetime import date
+
+from classes.emprunt import Emprunt
+
+try:
+    import numpy
+except ImportError:     # numpy est facultatif
+    numpy = None
+
+
+class Tarif:
+    """Règle de pénalité d'un type de document"""
+
+    def __init__(self, par_jour, jours_grace=0, plafond=None):
+        """
+        Initialise un tarif
+        Args:
+            par_jour: montant par jour de retard facturé (centimes)
+            jours_grace: jours de retard tolérés avant facturation
+            plafond: montant maximal par emprunt (centimes, None : sans plafond)
+        """
+        self._par_jour = par_jour
+        self._jours_grace = jours_grace
+        self._plafond = plafond
+
+    @property
+    def par_jour(self):
+        """Retourne le montant par jour de retard"""
+        return self._par_jour
+
+    @property
+    def jours_grace(self):
+        """Retourne le nombre de jours de grâce"""
+        return self._jours_grace
+
+    @property
+    def plafond(self):
+        """Retourne le plafond par emprunt (None : sans plafond)"""
+        return self._plafond
+
+    def calculer(self, jours_retard):
+        """
+        Retourne la pénalité d'un emprunt (calcul unitaire, pour référence)
+        """
+        montant = max(jours_retard - self._jours_grace, 0) * self._par_jour
+        return montant if self._plafond is None else min(montant, self._plafond)
+
+
+# Tarifs par défaut, par nom de classe du document emprunté
+TARIFS = {"Livre": Tarif(20, jours_grace=3, plafond=1000)}
+
+
+class ColonnesEmprunts:
+    """
+    Emprunts rangés en colonnes d'entiers, construites une fois et
+    réutilisables pour plusieurs calculs (dates, tarifs)
+    """
+
+    # Date de retour d'un emprunt en cours
+    EN_COURS = 0
+
+    def __init__(self):
+        """Initialise des colonnes vides"""
+        self._adherents = []            # code -> identifiant
+        self._codes_adherents = {}      # identifiant -> code
+        self._types = []                # code -> nom du type
+        self._codes_types = {}
+        self._adherent = array('l')
+        self._type = array('l')
+        self._debut = array('l')        # date d'emprunt (ordinal)
+        self._echeance = array('l')     # date de retour prévue (ordinal)
+        self._retour = array('l')       # date de retour (ordinal) ou EN_COURS
+
+    @property
+    def adherent(self):
+        """Retourne la colonne des codes d'adhérent"""
+        return self._adherent
+
+    @property
+    def type(self):
+        """Retourne la colonne des codes de type de document"""
+        return self._type
+
+    @property
+    def debut(self):
+        """Retourne la colonne des dates d'emprunt"""
+        return self._debut
+
+    @property
+    def echeance(self):
+        """Retourne la colonne des dates de retour prévues"""
+        return self._echeance
+
+    @property
+    def retour(self):
+        """Retourne la colonne des dates de retour (EN_COURS si non rendu)"""
+        return self._retour
+
+    @property
+    def adherents(self):
+        """Retourne les identifiants des adhérents, par code"""
+        return self._adherents
+
+    @property
+    def types(self):
+        """Retourne les noms des types de document, par code"""
+        return self._types
+
+    def __len__(self):
+        return len(self._debut)
+
+    def _coder(self, valeur, valeurs, codes):
+        """Retourne le code d'une valeur, en l'enregistrant au besoin"""
+        code = codes.get(valeur)
+        if code is None:
+            code = codes[valeur] = len(valeurs)
+            valeurs.append(valeur)
+        return code
+
+    def ajouter(self, identifiant, nom_type, date_emprunt, date_retour=None):
+        """
+        Ajoute un emprunt aux colonnes
+        """
+        debut = date_emprunt.toordinal()
+        self._adherent.append(self._coder(identifiant, self._adherents, self._codes_adherents))
+        self._type.append(self._coder(nom_type, self._types, self._codes_types))
+        self._debut.append(debut)
+        self._echeance.append(debut + Emprunt.DUREE_EMPRUNT_JOURS)
+        self._retour.append(date_retour.toordinal() if date_retour else self.EN_COURS)
+
+    @staticmethod
+    def depuis_emprunts(emprunts):
+        """
+        Construit les colonnes à partir d'objets Emprunt (un seul passage)
+        """
+        colonnes = ColonnesEmprunts()
+        for emprunt in emprunts:
+            colonnes.ajouter(emprunt.adherent.get_identifiant(), type(emprunt.livre).__name__,
+                             emprunt.date_emprunt, emprunt.date_retour)
+        return colonnes
+
+
+class MoteurPenalites:
+    """Calcule les pénalités de tous les emprunts en un passage par lot"""
+
+    def __init__(self, tarifs=None, tarif_defaut=None):
+        """
+        Initialise le moteur
+        Args:
+            tarifs: dict nom du type -> Tarif (TARIFS par défaut)
+            tarif_defaut: tarif des types absents de `tarifs` (None : gratuit)
+        """
+        self._tarifs = TARIFS if tarifs is None else tarifs
+        self._tarif_defaut = tarif_defaut
+
+    def _regles(self, colonnes):
+        """
+        Retourne les règles par code de type : (par jour, grâce, plafond ou -1)
+        """
+        regles = []
+        for nom_type in colonnes.types:
+            tarif = self._tarifs.get(nom_type, self._tarif_defaut)
+            if tarif is None:
+                regles.append((0, 0, -1))
+            else:
+                plafond = -1 if tarif.plafond is None else tarif.plafond
+                regles.append((tarif.par_jour, tarif.jours_grace, plafond))
+        return regles
+
+    def calculer(self, colonnes, date_reference=None):
+        """
+        Calcule les pénalités à une date et les totalise par adhérent
+        Args:
+            colonnes: ColonnesEmprunts
+            date_reference: date du calcul (aujourd'hui par défaut)
+        Returns:
+            dict: identifiant de l'adhérent -> total (centimes), pour les
+                  adhérents ayant une pénalité
+        """
+        if date_reference is None:
+            date_reference = date.today()
+        if not len(colonnes):
+            return {}
+        regles = self._regles(colonnes)
+        if numpy is not None:
+            totaux = self._calculer_numpy(colonnes, regles, date_reference.toordinal())
+        else:
+            totaux = self._calculer_python(colonnes, regles, date_reference.toordinal())
+        adherents = colonnes.adherents
+        return {adherents[code]: total for code, total in enumerate(totaux) if total}
+
+    def _calculer_python(self, colonnes, regles, reference):
+        """Calcul sur les colonnes en Python pur"""
+        totaux = [0] * len(colonnes.adherents)
+        for adherent, code_type, debut, echeance, retour in zip(
+                colonnes.adherent, colonnes.type, colonnes.debut,
+                colonnes.echeance, colonnes.retour):
+            if debut > reference:
+                continue
+            fin = reference if retour == 0 or retour > reference else retour
+            par_jour, grace, plafond = regles[code_type]
+            jours = fin - echeance - grace
+            if jours > 0 and par_jour:
+                montant = jours * par_jour
+                if 0 <= plafond < montant:
+                    montant = plafond
+                totaux[adherent] += montant
+        return totaux
+
+    def _calculer_numpy(self, colonnes, regles, reference):
+        """Calcul vectorisé avec numpy"""
+        # Vues sans copie sur les tableaux array('l') (entiers C long)
+        code_type = numpy.frombuffer(colonnes.type, dtype='l')
+        debut = numpy.frombuffer(colonnes.debut, dtype='l')
+        echeance = numpy.frombuffer(colonnes.echeance, dtype='l')
+        retour = numpy.frombuffer(colonnes.retour, dtype='l')
+        adherent = numpy.frombuffer(colonnes.adherent, dtype='l')
+
+        par_jour, grace, plafond = (numpy.array(r, dtype=numpy.int64) for r in zip(*regles))
+        plafond = numpy.where(plafond < 0, numpy.iinfo(numpy.int64).max, plafond)
+
+        fin = numpy.where((retour == 0) | (retour > reference), reference, retour)
+        jours = numpy.clip(fin - echeance - grace[code_type], 0, None)
+        montants = numpy.minimum(jours * par_jour[code_type], plafond[code_type])
+        montants[debut > reference] = 0
+
+        # Sommes exactes en float64 tant que le total reste sous 2**53 centimes
+        totaux = numpy.bincount(adherent, weights=montants, minlength=len(colonnes.adherents))
+        return numpy.rint(totaux).astype(numpy.int64).tolist()
+
+
+def calculer_penalites(bibliotheque, date_reference=None, tarifs=None):
+    """
+    Calcule les pénalités de tout l'historique d'une bibliothèque (ou d'un
+    instantané) et les totalise par adhérent
+    Returns:
+        dict: identifiant de l'adhérent -> total (centimes)
+    """
+    if date_reference is None:
+        date_reference = bibliotheque.aujourd_hui()
+    colonnes = ColonnesEmprunts.depuis_emprunts(bibliotheque.get_emprunts())
+    return MoteurPenalites(tarifs).calculer(colonnes, date_reference)
+
+
+def formater_montant(centimes):
+    """Retourne un montant en centimes sous la forme « 12,34 € »"""
+    return f"{centimes // 100},{centimes % 100:02d} €"
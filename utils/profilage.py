@@ -0,0 +1,214 @@
+"""
+Module du mode profilage : chaque section mesurée (démarrage, chargement de
+la bibliothèque, rafraîchissements actualiser_* de l'interface) est exécutée
+sous cProfile et tracemalloc, et laisse dans un dossier local deux fichiers
+horodatés pour une analyse hors ligne :
+
+    AAAAMMJJ-HHMMSS_NNN_section.prof   profil brut (pstats, snakeviz...)
+    AAAAMMJJ-HHMMSS_NNN_section.txt    fonctions les plus coûteuses et
+                                       plus grosses allocations
+
+Une section appelée pendant une autre section du même thread n'a pas ses
+propres fichiers : elle figure dans le profil de la section englobante.
+tracemalloc étant global, les allocations d'une section incluent celles
+des autres threads pendant la même période.
+
+    from utils.profilage import Profileur
+    profileur = Profileur("profils")
+    profileur.envelopper(FileManager, "charger_bibliotheque")
+    with profileur.section("demarrage"):
+        ...
+"""
+
+import cProfile
+import functools
+import inspect
+import io
+import itertools
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+
+
+# Lignes des rapports texte
+FONCTIONS_RAPPORT = 40
+ALLOCATIONS_RAPPORT = 25
+
+
+class Profileur:
+    """Profile des sections nommées et écrit un rapport par exécution"""
+
+    def __init__(self, dossier="profils", cadres=1):
+        """
+        Initialise le profileur et démarre tracemalloc
+        Args:
+            dossier: dossier des profils (créé au besoin)
+            cadres: profondeur des piles gardées par tracemalloc (1 : la
+                    ligne d'allocation seule, le moins coûteux)
+        """
+        self._dossier = dossier
+        os.makedirs(dossier, exist_ok=True)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(cadres)
+        self._numeros = itertools.count(1)
+        self._verrou = threading.Lock()
+        self._local = threading.local()     # section en cours dans chaque thread
+        self._ouvertes = {}                 # (thread, nom) -> section démarrée par commencer()
+        self._fichiers = []
+        self._originaux = []
+
+    @property
+    def dossier(self):
+        """Retourne le dossier des profils"""
+        return self._dossier
+
+    @property
+    def fichiers(self):
+        """Retourne les fichiers écrits jusqu'ici"""
+        return list(self._fichiers)
+
+    # ========== Sections ==========
+
+    def commencer(self, nom):
+        """
+        Démarre une section, terminée par terminer(nom) dans le même thread
+        Returns:
+            bool: False si une section est déjà en cours dans ce thread
+        """
+        if getattr(self._local, "en_cours", None):
+            return False
+        profil = cProfile.Profile()
+        self._local.en_cours = nom
+        self._ouvertes[(threading.get_ident(), nom)] = (
+            profil, tracemalloc.take_snapshot(), time.perf_counter(),
+            threading.current_thread().name)
+        tracemalloc.reset_peak()
+        profil.enable()
+        return True
+
+    def terminer(self, nom):
+        """
+        Termine une section et écrit ses fichiers
+        Returns:
+            list: chemins écrits (vide si la section n'était pas démarrée)
+        """
+        ouverte = self._ouvertes.pop((threading.get_ident(), nom), None)
+        if ouverte is None:
+            return []
+        profil, avant, debut, thread = ouverte
+        profil.disable()
+        duree = time.perf_counter() - debut
+        self._local.en_cours = None
+        _, pic = tracemalloc.get_traced_memory()
+        apres = tracemalloc.take_snapshot()
+        try:
+            return self._ecrire(nom, profil, avant, apres, duree, pic, thread)
+        except OSError as e:
+            print(f"Erreur lors de l'écriture du profil {nom}: {e}")
+            return []
+
+    def section(self, nom):
+        """Gestionnaire de contexte : profile le bloc sous le nom donné"""
+        return _Section(self, nom)
+
+    # ========== Méthodes profilées ==========
+
+    def envelopper(self, cls, *noms, prefixe=None):
+        """
+        Profile chaque appel des méthodes données d'une classe
+        Args:
+            noms: noms des méthodes
+            prefixe: profile aussi toutes les méthodes dont le nom commence ainsi
+        """
+        if prefixe:
+            noms += tuple(nom for nom in vars(cls) if nom.startswith(prefixe))
+        for nom in noms:
+            attribut = vars(cls)[nom]
+            if isinstance(attribut, staticmethod):
+                remplacement = staticmethod(self._profilee(attribut.__func__, nom))
+            else:
+                remplacement = self._profilee(attribut, nom)
+            self._originaux.append((cls, nom, attribut))
+            setattr(cls, nom, remplacement)
+
+    def _profilee(self, fonction, nom):
+        """Retourne une version de la fonction profilée à chaque appel"""
+        code = fonction.__code__
+        # Les signaux Qt passent des arguments que la méthode n'attend pas
+        # (checked d'un bouton) : comme PyQt, on les ignore
+        nb_arguments = None if code.co_flags & inspect.CO_VARARGS else code.co_argcount
+
+        @functools.wraps(fonction)
+        def profilee(*args, **kwargs):
+            if nb_arguments is not None:
+                args = args[:nb_arguments]
+            with self.section(nom):
+                return fonction(*args, **kwargs)
+        return profilee
+
+    def fermer(self):
+        """Remet les méthodes d'origine et arrête tracemalloc"""
+        for cls, nom, attribut in reversed(self._originaux):
+            setattr(cls, nom, attribut)
+        self._originaux.clear()
+        tracemalloc.stop()
+
+    # ========== Rapports ==========
+
+    def _ecrire(self, nom, profil, avant, apres, duree, pic, thread):
+        """
+        Écrit le profil brut et le rapport texte d'une section
+        Returns:
+            list: chemins des deux fichiers
+        """
+        with self._verrou:
+            numero = next(self._numeros)
+        base = os.path.join(self._dossier,
+                            f"{time.strftime('%Y%m%d-%H%M%S')}_{numero:03d}_{nom}")
+        profil.dump_stats(base + ".prof")
+
+        tampon = io.StringIO()
+        statistiques = pstats.Stats(profil, stream=tampon)
+        statistiques.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(FONCTIONS_RAPPORT)
+        differences = apres.compare_to(avant, 'lineno')
+        variation = sum(d.size_diff for d in differences)
+
+        lignes = [f"Section: {nom}",
+                  f"Thread: {thread}",
+                  f"Durée: {duree * 1000:.1f} ms",
+                  f"Mémoire: {variation / 1024:+.1f} Kio, pic {pic / 1024:.1f} Kio",
+                  "",
+                  f"========== Fonctions ({FONCTIONS_RAPPORT} plus coûteuses, "
+                  f"temps cumulé) ==========",
+                  tampon.getvalue().strip(),
+                  "",
+                  f"========== Allocations ({ALLOCATIONS_RAPPORT} plus grosses "
+                  f"variations) =========="]
+        for difference in differences[:ALLOCATIONS_RAPPORT]:
+            lignes.append(str(difference))
+
+        with open(base + ".txt", 'w', encoding='utf-8') as f:
+            f.write("\n".join(lignes) + "\n")
+        chemins = [base + ".prof", base + ".txt"]
+        self._fichiers += chemins
+        return chemins
+
+
+class _Section:
+    """Section profilée par un bloc with"""
+
+    def __init__(self, profileur, nom):
+        self._profileur = profileur
+        self._nom = nom
+        self._active = False
+
+    def __enter__(self):
+        self._active = self._profileur.commencer(self._nom)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._active:
+            self._profileur.terminer(self._nom)
+        return False
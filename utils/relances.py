@@ -0,0 +1,245 @@
+"""
+Module des relances de retard : un avis par adhérent pour l'ensemble de ses
+emprunts en retard, déposé dans une boîte d'envoi locale ou remis à un
+serveur SMTP.
+
+Le traitement est prévu pour tourner sans surveillance (tâche de nuit) :
+chaque avis envoyé est inscrit dans un journal, et une exécution relancée
+après une interruption reprend là où la précédente s'était arrêtée.
+"""
+
+import os
+import re
+import smtplib
+import time
+from email.mime.text import MIMEText
+
+
+EXPEDITEUR = "bibliotheque@localhost"
+
+
+def grouper_par_adherent(emprunts):
+    """
+    Regroupe des emprunts par adhérent, en un seul passage
+    Returns:
+        générateur de (adhérent, liste de ses emprunts), dans l'ordre
+        de première apparition
+    """
+    groupes = {}
+    for emprunt in emprunts:
+        identifiant = emprunt.adherent.get_identifiant()
+        groupe = groupes.get(identifiant)
+        if groupe is None:
+            groupes[identifiant] = groupe = (emprunt.adherent, [])
+        groupe[1].append(emprunt)
+    yield from groupes.values()
+
+
+def rediger_avis(adherent, emprunts, date_reference, expediteur=EXPEDITEUR):
+    """
+    Rédige l'avis de retard d'un adhérent
+    Returns:
+        MIMEText: message prêt à être envoyé ou enregistré
+    """
+    lignes = [f"Bonjour {adherent.prenom} {adherent.nom},", "",
+              "Sauf erreur de notre part, les livres suivants auraient dû être rendus :"]
+    for emprunt in sorted(emprunts, key=lambda e: e.date_emprunt):
+        lignes.append(f"  • {emprunt.livre.titre} - emprunté le "
+                      f"{emprunt.date_emprunt.strftime('%d/%m/%Y')}, retour prévu le "
+                      f"{emprunt.calculer_date_retour_prevue().strftime('%d/%m/%Y')} "
+                      f"({emprunt.jours_retard(date_reference)} jour(s) de retard)")
+    lignes += ["", "Merci de les rapporter dès que possible.", "", "La bibliothèque"]
+
+    # MIMEText plutôt qu'EmailMessage : cinq fois plus rapide à produire
+    message = MIMEText("\n".join(lignes) + "\n", "plain", "utf-8")
+    message["From"] = expediteur
+    message["To"] = adherent.email
+    message["Subject"] = f"Rappel : {len(emprunts)} livre(s) en retard"
+    return message
+
+
+# ========== Modes d'envoi ==========
+
+class BoiteEnvoi:
+    """Dépose les avis dans un dossier, un fichier .eml par avis"""
+
+    def __init__(self, dossier):
+        """
+        Initialise la boîte d'envoi (le dossier est créé au besoin)
+        """
+        self._dossier = dossier
+        os.makedirs(dossier, exist_ok=True)
+
+    @property
+    def dossier(self):
+        """Retourne le dossier de la boîte d'envoi"""
+        return self._dossier
+
+    def envoyer(self, cle, message):
+        """
+        Enregistre un avis ; un avis déjà présent sous la même clé est
+        remplacé, si bien qu'un nouvel essai ne crée pas de doublon
+        """
+        nom = re.sub(r"[^\w.-]", "_", cle) + ".eml"
+        chemin = os.path.join(self._dossier, nom)
+        with open(chemin + ".tmp", "wb") as f:
+            f.write(message.as_bytes())
+        os.replace(chemin + ".tmp", chemin)
+
+    def fermer(self):
+        """Rien à libérer"""
+
+
+class EnvoiSMTP:
+    """
+    Remet les avis à un serveur SMTP (par défaut un serveur local de test,
+    par exemple `python -m aiosmtpd -n -l localhost:1025`) sur une seule
+    connexion
+    """
+
+    def __init__(self, hote="localhost", port=1025):
+        """
+        Initialise l'envoi (la connexion est ouverte au premier avis)
+        """
+        self._hote = hote
+        self._port = port
+        self._connexion = None
+
+    def envoyer(self, cle, message):
+        """
+        Remet un avis au serveur
+        """
+        if self._connexion is None:
+            self._connexion = smtplib.SMTP(self._hote, self._port)
+        self._connexion.send_message(message)
+
+    def fermer(self):
+        """Ferme la connexion au serveur"""
+        if self._connexion is not None:
+            try:
+                self._connexion.quit()
+            except smtplib.SMTPException:
+                pass
+            self._connexion = None
+
+
+# ========== Débit et reprise ==========
+
+class LimiteurDebit:
+    """Espace les envois pour ne pas dépasser un nombre d'avis par seconde"""
+
+    def __init__(self, par_seconde=0, horloge=time.monotonic, dormir=time.sleep):
+        """
+        Initialise le limiteur
+        Args:
+            par_seconde: débit maximal (0 : pas de limite)
+        """
+        self._intervalle = 1.0 / par_seconde if par_seconde else 0.0
+        self._horloge = horloge
+        self._dormir = dormir
+        self._prochain = None
+
+    def attendre(self):
+        """
+        Attend, si nécessaire, le moment du prochain envoi
+        """
+        if not self._intervalle:
+            return
+        maintenant = self._horloge()
+        if self._prochain is None or self._prochain < maintenant:
+            self._prochain = maintenant
+        elif self._prochain > maintenant:
+            self._dormir(self._prochain - maintenant)
+        self._prochain += self._intervalle
+
+
+class JournalRelances:
+    """
+    Journal des avis envoyés (une clé par ligne, ajoutée après chaque envoi)
+    """
+
+    def __init__(self, chemin):
+        """
+        Ouvre le journal et relit les clés des avis déjà envoyés
+        """
+        self._chemin = chemin
+        self._envoyes = set()
+        coupee = False
+        if os.path.exists(chemin):
+            with open(chemin, "r", encoding="utf-8") as f:
+                for ligne in f:
+                    if ligne.endswith("\n"):
+                        self._envoyes.add(ligne.rstrip("\n"))
+                    else:
+                        coupee = True   # arrêt en pleine écriture : clé ignorée
+        self._fichier = open(chemin, "a", encoding="utf-8")
+        if coupee:
+            # La clé suivante ne doit pas prolonger la ligne coupée
+            self._fichier.write("\n")
+            self._fichier.flush()
+
+    @property
+    def chemin(self):
+        """Retourne le chemin du journal"""
+        return self._chemin
+
+    def deja_envoye(self, cle):
+        """Vérifie si un avis figure dans le journal"""
+        return cle in self._envoyes
+
+    def noter(self, cle):
+        """
+        Inscrit un avis envoyé (écrit aussitôt : survit à l'arrêt du processus)
+        """
+        self._envoyes.add(cle)
+        self._fichier.write(cle + "\n")
+        self._fichier.flush()
+
+    def fermer(self):
+        """Ferme le journal en forçant son écriture sur disque"""
+        if not self._fichier.closed:
+            self._fichier.flush()
+            os.fsync(self._fichier.fileno())
+            self._fichier.close()
+
+
+# ========== Traitement ==========
+
+def envoyer_relances(bibliotheque, envoi, journal, date_reference=None, debit=0,
+                     expediteur=EXPEDITEUR, progression=None):
+    """
+    Envoie un avis à chaque adhérent ayant au moins un emprunt en retard
+    Args:
+        envoi: BoiteEnvoi ou EnvoiSMTP
+        journal: JournalRelances des avis déjà envoyés (pour la reprise)
+        date_reference: date d'évaluation des retards (date de la bibliothèque par défaut)
+        debit: nombre maximal d'avis par seconde (0 : pas de limite)
+        progression: fonction optionnelle appelée avec (avis traités, total)
+    Returns:
+        dict: compteurs du traitement
+    """
+    if date_reference is None:
+        date_reference = bibliotheque.aujourd_hui()
+    limiteur = LimiteurDebit(debit)
+    bilan = {'emprunts_retard': 0, 'adherents': 0, 'envoyes': 0,
+             'deja_envoyes': 0, 'sans_email': 0}
+
+    groupes = list(grouper_par_adherent(bibliotheque.get_emprunts_en_retard(date_reference)))
+    for position, (adherent, emprunts) in enumerate(groupes, 1):
+        bilan['emprunts_retard'] += len(emprunts)
+        bilan['adherents'] += 1
+        # Une clé par adhérent et par jour : relancer le traitement le même
+        # jour n'envoie pas deux fois le même avis
+        cle = f"{date_reference.isoformat()}_{adherent.get_identifiant()}"
+        if journal.deja_envoye(cle):
+            bilan['deja_envoyes'] += 1
+        elif not adherent.email:
+            bilan['sans_email'] += 1
+        else:
+            limiteur.attendre()
+            envoi.envoyer(cle, rediger_avis(adherent, emprunts, date_reference, expediteur))
+            journal.noter(cle)
+            bilan['envoyes'] += 1
+        if progression and (position % 1000 == 0 or position == len(groupes)):
+            progression(position, len(groupes))
+    return bilan